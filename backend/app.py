@@ -1,14 +1,23 @@
 from flask import Flask, request, jsonify, send_from_directory, Response, redirect, stream_with_context
+from werkzeug.http import parse_content_range_header, quote_etag, unquote_etag
+from werkzeug.wsgi import wrap_file
 import dropbox
-from bs4 import BeautifulSoup
-from urllib.parse import urlparse, urljoin, unquote, parse_qs, quote, urlencode
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+from bs4 import Tag
+from urllib.parse import urlparse, urljoin, urldefrag, unquote, parse_qs, quote, urlencode
 import os
 import time
-import requests
 import base64
+import hashlib
 import json
 import re
 import mimetypes
+import threading
+from collections import OrderedDict
+from datetime import timezone
+from email.utils import parsedate_to_datetime
+from concurrent.futures import ThreadPoolExecutor
 from uuid import uuid4
 
 # .env 파일 로드 함수
@@ -31,18 +40,222 @@ load_env_file()
 
 from auth_utils import login_required, verify_supabase_jwt
 from crypto_utils import encrypt_token, decrypt_token
+from local_db_utils import get_local_db
+from browser_pool_utils import submit_render
+from save_jobs_utils import (
+    enqueue_save_job,
+    ensure_save_job_workers,
+    update_save_job_progress,
+    finish_save_job,
+    fail_save_job,
+    get_save_job,
+    record_save_job_checkpoint,
+    get_save_job_checkpoint,
+)
+from capture_store_utils import create_capture_store, put_captured_response, get_captured_response, close_capture_store
+from http_utils import get_http_session, format_http_pool_stats
+from cache_utils import create_lru_cache, cache_get, cache_peek_meta, cache_put, cache_update_meta, cache_stats
+from html_parser_utils import parse_html, extract_title_and_text
+from compression_utils import (
+    ENCODING_SUFFIXES,
+    resolve_storage_compression,
+    iter_compressed_chunks,
+    compress_bytes,
+    decompress_bytes,
+    decompress_prefix,
+)
+from media_cache_utils import (
+    create_media_cache,
+    get_media_cache_entry,
+    get_media_cache_data_path,
+    open_media_cache_entry,
+    is_range_filled,
+    is_fully_filled,
+    record_media_cache_lookup,
+    touch_media_cache_entry,
+    iter_media_cache_fill,
+    iter_file_range,
+)
 
 app = Flask(__name__, static_folder="../frontend/dist", static_url_path="/_static")
 
+# 로컬 파일 본문 전송을 프런트 서버에 넘기는 설정 (둘 다 없으면 앱이 file_wrapper로 직접 보냅니다)
+USE_X_SENDFILE = os.getenv("USE_X_SENDFILE", "false").lower() == "true"
+# nginx X-Accel-Redirect: "로컬 디렉터리=내부 location" 쌍을 쉼표로 구분 (예: /var/cache/media=/_media_cache/)
+X_ACCEL_REDIRECT_MAP = [
+    (os.path.realpath(local_dir.strip()), location.strip())
+    for local_dir, _, location in (
+        pair.partition("=") for pair in os.getenv("X_ACCEL_REDIRECT_MAP", "").split(",") if "=" in pair
+    )
+]
+app.config["USE_X_SENDFILE"] = USE_X_SENDFILE
+
 DROPBOX_REFRESH_TOKEN = os.getenv("DROPBOX_REFRESH_TOKEN")
 APP_KEY = os.getenv("DROPBOX_APP_KEY")
 APP_SECRET = os.getenv("DROPBOX_APP_SECRET")
 RAINDROP_ACCESS_TOKEN = os.getenv("RAINDROP_ACCESS_TOKEN")
 USE_PLAYWRIGHT_CAPTURE = os.getenv("USE_PLAYWRIGHT_CAPTURE", "true").lower() != "false"
 DEFAULT_SHARED_COLLECTION_TITLE = os.getenv("DEFAULT_SHARED_COLLECTION_TITLE", "축구")
-DROPBOX_TEMP_LINK_TTL_SECONDS = 60 * 60 * 3
-DROPBOX_TEMP_LINK_CACHE = {}
 DROPBOX_UPLOAD_CHUNK_SIZE = 8 * 1024 * 1024
+# 저장 시 뷰어용 후처리까지 끝낸 아카이브에 찍는 변환 파이프라인 버전.
+# 이 버전이 찍힌 아카이브는 조회 시 다시 파싱하지 않고 그대로 내려보냅니다.
+# 뷰어용 후처리를 바꾸면 올리세요. 더 낮은 버전의 아카이브는 조회 시 다시 변환해 저장합니다.
+ARCHIVE_PIPELINE_VERSION = 1
+# 아카이브 HTML을 조각으로 직렬화할 때 여는/닫는 태그로 나눠 내려갈 최대 깊이
+ARCHIVE_STREAM_MAX_DEPTH = 8
+ARCHIVE_PIPELINE_META_NAME = "archive-saver-pipeline"
+# BeautifulSoup은 속성을 이름순으로 직렬화하므로 stamp_archive_pipeline 결과는 항상 이 형태입니다.
+ARCHIVE_PIPELINE_STAMP_PATTERN = re.compile(
+    rb'<meta content="(\d+)" name="archive-saver-pipeline"/?>'
+)
+# 버전 표시는 head 맨 앞에 넣으므로 본문 앞부분만 확인합니다.
+ARCHIVE_PIPELINE_STAMP_WINDOW = 64 * 1024
+# 표시 없는 예전 아카이브를 처음 조회할 때 변환 결과로 덮어쓸지 여부
+ARCHIVE_LAZY_MIGRATION = os.getenv("ARCHIVE_LAZY_MIGRATION", "true").lower() != "false"
+ARCHIVE_MIGRATIONS_IN_PROGRESS = set()
+ARCHIVE_MIGRATIONS_LOCK = threading.Lock()
+# 저장 시 미디어 다운로드/업로드 동시성 (배포 환경별로 조정)
+MEDIA_FETCH_CONCURRENCY = max(1, int(os.getenv("MEDIA_FETCH_CONCURRENCY", "8")))
+MEDIA_FETCH_PER_HOST_LIMIT = max(1, int(os.getenv("MEDIA_FETCH_PER_HOST_LIMIT", "4")))
+MEDIA_HOST_SEMAPHORES = {}
+MEDIA_HOST_SEMAPHORES_LOCK = threading.Lock()
+LAZY_MEDIA_ATTRS = ["data-src", "data-lazy-src", "data-original", "data-url"]
+# 저장 시 절대 URL로 바꿀 태그별 URL 속성
+ABSOLUTE_URL_ATTRS = {
+    "img": "src",
+    "script": "src",
+    "link": "href",
+    "source": "src",
+    "video": "src",
+    "audio": "src",
+    "iframe": "src",
+}
+# 이 크기를 넘는 미디어는 base64로 HTML에 넣지 않고 스토리지에 업로드합니다.
+MEDIA_MAX_INLINE_BYTES = int(os.getenv("MEDIA_MAX_INLINE_BYTES", str(8 * 1024 * 1024)))
+# 아카이브 하나에 base64로 넣을 수 있는 원본 바이트 총량. 넘치는 이미지는 업로드합니다.
+ARCHIVE_INLINE_BUDGET_BYTES = int(os.getenv("ARCHIVE_INLINE_BUDGET_BYTES", str(32 * 1024 * 1024)))
+# 미디어를 바이트 해시로 저장해 아카이브 간 중복 업로드를 없애는 모드
+MEDIA_CONTENT_ADDRESSED = os.getenv("MEDIA_CONTENT_ADDRESSED", "false").lower() == "true"
+MEDIA_INDEX_DB = "media_index.sqlite3"
+MEDIA_INDEX_SCHEMA = """
+CREATE TABLE IF NOT EXISTS media_index (
+    scope TEXT NOT NULL,
+    media_type TEXT NOT NULL,
+    digest TEXT NOT NULL,
+    url TEXT NOT NULL,
+    size INTEGER,
+    created_at REAL NOT NULL,
+    PRIMARY KEY (scope, media_type, digest)
+);
+"""
+SERVER_ARCHIVE_MEDIA_SCOPE = "dropbox:server:archive-media"
+# Google Drive 폴더 ID 캐시 (scope: 부모 폴더 ID 또는 사용자별 루트)
+GOOGLE_FOLDER_DB = "google_folders.sqlite3"
+GOOGLE_FOLDER_SCHEMA = """
+CREATE TABLE IF NOT EXISTS google_folders (
+    scope TEXT NOT NULL,
+    name TEXT NOT NULL,
+    folder_id TEXT NOT NULL,
+    updated_at REAL NOT NULL,
+    PRIMARY KEY (scope, name)
+);
+"""
+GOOGLE_FOLDER_LOCKS = {}
+# Dropbox 경로 -> 공유 링크 캐시 (account: storage_config["account_key"])
+DROPBOX_SHARED_LINK_DB = "dropbox_shared_links.sqlite3"
+DROPBOX_SHARED_LINK_SCHEMA = """
+CREATE TABLE IF NOT EXISTS dropbox_shared_links (
+    account TEXT NOT NULL,
+    path TEXT NOT NULL,
+    url TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    PRIMARY KEY (account, path)
+);
+"""
+# 아카이브 저장 중 작은 미디어를 업로드 세션으로 모아 한 번에 커밋합니다.
+DROPBOX_BATCH_UPLOAD = os.getenv("DROPBOX_BATCH_UPLOAD", "true").lower() != "false"
+DROPBOX_BATCH_MAX_ENTRIES = 1000
+DROPBOX_BATCH_POLL_SECONDS = 0.5
+DROPBOX_BATCH_POLL_TIMEOUT_SECONDS = 120
+DROPBOX_BATCH_PENDING_PREFIX = "dropbox-batch-pending:"
+DROPBOX_SHARED_LINK_CONCURRENCY = max(1, int(os.getenv("DROPBOX_SHARED_LINK_CONCURRENCY", "8")))
+GOOGLE_FOLDER_LOCKS_LOCK = threading.Lock()
+# 스타일시트와 CSS url() 자산용 프로세스 공용 HTTP 캐시 (ASSET_CACHE_DIR 지정 시 디스크 계층 사용)
+ASSET_CACHE_MAX_BYTES = int(os.getenv("ASSET_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+ASSET_CACHE_DIR = os.getenv("ASSET_CACHE_DIR", "")
+ASSET_CACHE_DISK_MAX_BYTES = int(os.getenv("ASSET_CACHE_DISK_MAX_BYTES", str(512 * 1024 * 1024)))
+ASSET_CACHE_DEFAULT_TTL_SECONDS = int(os.getenv("ASSET_CACHE_DEFAULT_TTL_SECONDS", "600"))
+# 조회용 아카이브 HTML 캐시 (Dropbox rev로 검증, ARCHIVE_CACHE_DIR 지정 시 디스크 계층 사용)
+ARCHIVE_CACHE_MAX_BYTES = int(os.getenv("ARCHIVE_CACHE_MAX_BYTES", str(128 * 1024 * 1024)))
+ARCHIVE_CACHE_DIR = os.getenv("ARCHIVE_CACHE_DIR", "")
+ARCHIVE_CACHE_DISK_MAX_BYTES = int(os.getenv("ARCHIVE_CACHE_DISK_MAX_BYTES", str(1024 * 1024 * 1024)))
+# 이 시간 안에는 Dropbox에 rev를 다시 묻지 않고 캐시를 그대로 사용합니다.
+ARCHIVE_CACHE_REVALIDATE_SECONDS = int(os.getenv("ARCHIVE_CACHE_REVALIDATE_SECONDS", "60"))
+# 렌더링 캡처 중 차단할 광고/트래커 도메인과 리소스 타입
+PLAYWRIGHT_BLOCKED_DOMAINS = {
+    "doubleclick.net",
+    "googlesyndication.com",
+    "googleadservices.com",
+    "google-analytics.com",
+    "googletagmanager.com",
+    "googletagservices.com",
+    "adservice.google.com",
+    "amazon-adsystem.com",
+    "adnxs.com",
+    "criteo.com",
+    "criteo.net",
+    "taboola.com",
+    "outbrain.com",
+    "scorecardresearch.com",
+    "facebook.net",
+    "dable.io",
+    "mobon.net",
+    "adop.cc",
+    "wcs.naver.net",
+}
+PLAYWRIGHT_BLOCKED_DOMAINS.update(
+    domain.strip().lower()
+    for domain in os.getenv("PLAYWRIGHT_BLOCKED_DOMAINS", "").split(",")
+    if domain.strip()
+)
+# media: 영상/오디오 스트림 본문, font: CSS 인라인 단계에서 서버가 따로 받습니다.
+PLAYWRIGHT_BLOCKED_RESOURCE_TYPES = {
+    resource_type.strip()
+    for resource_type in os.getenv("PLAYWRIGHT_BLOCKED_RESOURCE_TYPES", "media,font").split(",")
+    if resource_type.strip()
+}
+# 브라우저가 받은 CSS/이미지 응답을 기록해 인라인 단계에서 재사용합니다.
+# 차단한 유형은 응답이 생기지 않으므로 기록 대상에서 뺍니다 (기본값에서는 font가 빠집니다).
+PLAYWRIGHT_RECORD_RESPONSES = os.getenv("PLAYWRIGHT_RECORD_RESPONSES", "true").lower() != "false"
+PLAYWRIGHT_RECORD_RESOURCE_TYPES = {"stylesheet", "image", "font"} - PLAYWRIGHT_BLOCKED_RESOURCE_TYPES
+PLAYWRIGHT_RECORD_MAX_BYTES = int(os.getenv("PLAYWRIGHT_RECORD_MAX_BYTES", str(256 * 1024 * 1024)))
+
+# 렌더링 캡처의 스크롤/안정화 대기 프로필 (도메인 접미사 -> 설정)
+# PLAYWRIGHT_SCROLL_PROFILES 환경 변수(JSON)로 도메인별 값을 덮어쓸 수 있습니다.
+PLAYWRIGHT_SCROLL_PROFILES = {
+    "default": {
+        "max_steps": 24,
+        "quiet_ms": 300,
+        "initial_timeout_ms": 5000,
+        "step_timeout_ms": 2500,
+        "max_total_ms": 12000,
+    },
+    "fmkorea.com": {
+        "max_steps": 40,
+        "quiet_ms": 400,
+        "initial_timeout_ms": 6000,
+        "step_timeout_ms": 3000,
+        "max_total_ms": 20000,
+    },
+}
+for _domain, _overrides in json.loads(os.getenv("PLAYWRIGHT_SCROLL_PROFILES", "{}")).items():
+    PLAYWRIGHT_SCROLL_PROFILES.setdefault(_domain, {}).update(_overrides)
+ASSET_CACHE = create_lru_cache(ASSET_CACHE_MAX_BYTES, ASSET_CACHE_DIR, ASSET_CACHE_DISK_MAX_BYTES)
+ARCHIVE_CACHE = create_lru_cache(ARCHIVE_CACHE_MAX_BYTES, ARCHIVE_CACHE_DIR, ARCHIVE_CACHE_DISK_MAX_BYTES)
+# /archive-media 프록시 응답용 디스크 캐시 (MEDIA_EDGE_CACHE_DIR 지정 시 사용)
+MEDIA_EDGE_CACHE = create_media_cache()
+# 새 아카이브 HTML을 저장할 때 쓸 Content-Encoding (ARCHIVE_STORAGE_COMPRESSION, None이면 압축 안 함)
+ARCHIVE_STORAGE_ENCODING = resolve_storage_compression()
 CLIPPER_ALLOWED_ORIGINS = {
     "https://archive-saver-web.onrender.com",
     "http://127.0.0.1:5000",
@@ -58,11 +271,60 @@ print("APP_KEY:", "set" if APP_KEY else "missing")
 print("APP_SECRET:", "set" if APP_SECRET else "missing")
 print("RAINDROP_ACCESS_TOKEN:", "set" if RAINDROP_ACCESS_TOKEN else "missing")
 print("USE_PLAYWRIGHT_CAPTURE:", USE_PLAYWRIGHT_CAPTURE)
+print("MEDIA_CONTENT_ADDRESSED:", MEDIA_CONTENT_ADDRESSED)
+print("MEDIA_FETCH_CONCURRENCY:", MEDIA_FETCH_CONCURRENCY, "/ per host:", MEDIA_FETCH_PER_HOST_LIMIT)
 print("=======================")
 
 SUPABASE_URL = os.getenv("SUPABASE_URL")
 SUPABASE_SERVICE_ROLE_KEY = os.getenv("SUPABASE_SERVICE_ROLE_KEY")
 
+# refresh token별로 재사용할 Dropbox 클라이언트/Google 액세스 토큰 수 (프로세스당)
+STORAGE_CLIENT_CACHE_SIZE = max(1, int(os.getenv("STORAGE_CLIENT_CACHE_SIZE", "64")))
+# 만료 이 시간 전부터는 캐시된 Google 액세스 토큰을 쓰지 않고 새로 받습니다.
+GOOGLE_TOKEN_EXPIRY_MARGIN_SECONDS = 300
+# Dropbox 임시 링크는 발급 후 4시간 동안 유효합니다.
+DROPBOX_TEMP_LINK_LIFETIME_SECONDS = 60 * 60 * 4
+# 남은 유효 시간이 이보다 짧아지면 요청은 캐시된 링크로 응답하고 백그라운드에서 새 링크를 받습니다.
+DROPBOX_TEMP_LINK_REFRESH_MARGIN_SECONDS = int(os.getenv("DROPBOX_TEMP_LINK_REFRESH_MARGIN_SECONDS", "3600"))
+# 리다이렉트 응답이 캐시되는 동안(max-age=60) 링크가 만료되지 않도록 이보다 짧게 남은 링크는 쓰지 않습니다.
+DROPBOX_TEMP_LINK_MIN_REMAINING_SECONDS = 300
+DROPBOX_TEMP_LINK_CACHE_SIZE = max(1, int(os.getenv("DROPBOX_TEMP_LINK_CACHE_SIZE", "4096")))
+# 워커 프로세스 간 임시 링크 공유 (LOCAL_DB_DIR의 SQLite)
+DROPBOX_TEMP_LINK_SHARED_CACHE = os.getenv("DROPBOX_TEMP_LINK_SHARED_CACHE", "true").lower() != "false"
+DROPBOX_TEMP_LINK_DB = "dropbox_temp_links.sqlite3"
+DROPBOX_TEMP_LINK_SCHEMA = """
+CREATE TABLE IF NOT EXISTS dropbox_temp_links (
+    path TEXT PRIMARY KEY,
+    link TEXT NOT NULL,
+    expires_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS dropbox_temp_links_expires_at ON dropbox_temp_links (expires_at);
+"""
+DROPBOX_TEMP_LINK_CACHE = OrderedDict()
+DROPBOX_TEMP_LINK_CACHE_LOCK = threading.Lock()
+DROPBOX_TEMP_LINK_STATS = {"hits": 0, "shared_hits": 0, "misses": 0, "refreshes": 0}
+DROPBOX_CLIENT_CACHE = OrderedDict()
+DROPBOX_CLIENT_CACHE_LOCK = threading.Lock()
+GOOGLE_ACCESS_TOKEN_CACHE = OrderedDict()
+GOOGLE_ACCESS_TOKEN_CACHE_LOCK = threading.Lock()
+
+def get_refresh_token_cache_key(refresh_token):
+    # 캐시 키에 토큰 원문을 두지 않습니다.
+    return hashlib.sha256((refresh_token or "").encode("utf-8")).hexdigest()
+
+def get_cached_storage_entry(cache, lock, refresh_token, create_entry):
+    key = get_refresh_token_cache_key(refresh_token)
+    with lock:
+        entry = cache.get(key)
+        if entry is None:
+            entry = create_entry()
+            cache[key] = entry
+            while len(cache) > STORAGE_CLIENT_CACHE_SIZE:
+                cache.popitem(last=False)
+        else:
+            cache.move_to_end(key)
+        return entry
+
 def get_supabase_admin_client():
     from supabase import create_client
     if not SUPABASE_URL or not SUPABASE_SERVICE_ROLE_KEY:
@@ -80,64 +342,163 @@ def save_user_storage_token(user_id, provider, encrypted_token):
     client.table("user_storage_tokens").upsert(data).execute()
 
 def get_user_dropbox_client(refresh_token):
-    return dropbox.Dropbox(
-        app_key=APP_KEY,
-        app_secret=APP_SECRET,
-        oauth2_refresh_token=refresh_token
+    """
+    refresh token별 Dropbox 클라이언트를 재사용합니다.
+    SDK가 액세스 토큰 만료 시점에만 갱신하므로 요청마다 토큰 교환이 일어나지 않습니다.
+    """
+    return get_cached_storage_entry(
+        DROPBOX_CLIENT_CACHE,
+        DROPBOX_CLIENT_CACHE_LOCK,
+        refresh_token,
+        lambda: dropbox.Dropbox(
+            app_key=APP_KEY,
+            app_secret=APP_SECRET,
+            oauth2_refresh_token=refresh_token
+        )
     )
 
 def get_google_access_token(refresh_token):
-    client_id = os.getenv("GOOGLE_CLIENT_ID")
-    client_secret = os.getenv("GOOGLE_CLIENT_SECRET")
-    url = "https://oauth2.googleapis.com/token"
-    data = {
-        "client_id": client_id,
-        "client_secret": client_secret,
-        "refresh_token": refresh_token,
-        "grant_type": "refresh_token"
-    }
-    res = requests.post(url, data=data, timeout=10)
-    res.raise_for_status()
-    return res.json().get("access_token")
+    """만료 전까지 캐시된 Google 액세스 토큰을 반환하고, 필요할 때만 refresh token을 교환합니다."""
+    entry = get_cached_storage_entry(
+        GOOGLE_ACCESS_TOKEN_CACHE,
+        GOOGLE_ACCESS_TOKEN_CACHE_LOCK,
+        refresh_token,
+        lambda: {"access_token": None, "expires_at": 0, "lock": threading.Lock()}
+    )
+
+    # 같은 토큰을 동시에 갱신하지 않도록 토큰별 잠금 안에서 확인합니다.
+    with entry["lock"]:
+        if entry["access_token"] and entry["expires_at"] - GOOGLE_TOKEN_EXPIRY_MARGIN_SECONDS > time.time():
+            return entry["access_token"]
+
+        client_id = os.getenv("GOOGLE_CLIENT_ID")
+        client_secret = os.getenv("GOOGLE_CLIENT_SECRET")
+        url = "https://oauth2.googleapis.com/token"
+        data = {
+            "client_id": client_id,
+            "client_secret": client_secret,
+            "refresh_token": refresh_token,
+            "grant_type": "refresh_token"
+        }
+        res = get_http_session().post(url, data=data, timeout=10)
+        res.raise_for_status()
+        token_data = res.json()
+        entry["access_token"] = token_data.get("access_token")
+        entry["expires_at"] = time.time() + int(token_data.get("expires_in", 3600))
+        return entry["access_token"]
+
+def get_google_folder_scope(parent_id=None, account_key=None):
+    # 폴더 ID는 Drive 전체에서 유일하므로 하위 폴더는 부모 ID만으로 사용자를 구분할 수 있습니다.
+    if parent_id:
+        return f"parent:{parent_id}"
+    if account_key:
+        return f"root:{account_key}"
+    return None
+
+def get_google_folder_lock(scope, folder_name):
+    with GOOGLE_FOLDER_LOCKS_LOCK:
+        return GOOGLE_FOLDER_LOCKS.setdefault((scope, folder_name), threading.Lock())
+
+def lookup_google_folder(scope, folder_name):
+    row = get_local_db(GOOGLE_FOLDER_DB, GOOGLE_FOLDER_SCHEMA).execute(
+        "SELECT folder_id FROM google_folders WHERE scope = ? AND name = ?",
+        (scope, folder_name)
+    ).fetchone()
+    return row["folder_id"] if row else None
+
+def record_google_folder(scope, folder_name, folder_id):
+    get_local_db(GOOGLE_FOLDER_DB, GOOGLE_FOLDER_SCHEMA).execute(
+        "INSERT OR REPLACE INTO google_folders (scope, name, folder_id, updated_at) VALUES (?, ?, ?, ?)",
+        (scope, folder_name, folder_id, time.time())
+    )
+
+def invalidate_google_folder(folder_name, parent_id=None, account_key=None):
+    scope = get_google_folder_scope(parent_id, account_key)
+    if scope:
+        get_local_db(GOOGLE_FOLDER_DB, GOOGLE_FOLDER_SCHEMA).execute(
+            "DELETE FROM google_folders WHERE scope = ? AND name = ?",
+            (scope, folder_name)
+        )
 
-def get_or_create_google_folder(access_token, folder_name="ArchiveSaver"):
+def find_or_create_google_folder(access_token, folder_name, parent_id=None):
     headers = {"Authorization": f"Bearer {access_token}"}
     q = f"name = '{folder_name}' and mimeType = 'application/vnd.google-apps.folder' and trashed = false"
-    search_url = f"https://www.googleapis.com/drive/v3/files?q={quote(q)}&fields=files(id)"
-    res = requests.get(search_url, headers=headers, timeout=10)
-    res.raise_for_status()
-    files = res.json().get("files", [])
-    if files:
-        return files[0].get("id")
-    
+    if parent_id:
+        q = f"name = '{folder_name}' and '{parent_id}' in parents and mimeType = 'application/vnd.google-apps.folder' and trashed = false"
+    # 같은 이름의 폴더가 여럿이면 항상 가장 먼저 만들어진 폴더를 사용합니다.
+    search_url = f"https://www.googleapis.com/drive/v3/files?q={quote(q)}&fields=files(id)&orderBy=createdTime"
+
+    def search_folder_ids():
+        res = get_http_session().get(search_url, headers=headers, timeout=10)
+        res.raise_for_status()
+        return [file.get("id") for file in res.json().get("files", [])]
+
+    folder_ids = search_folder_ids()
+    if folder_ids:
+        return folder_ids[0]
+
     create_url = "https://www.googleapis.com/drive/v3/files"
     body = {
         "name": folder_name,
         "mimeType": "application/vnd.google-apps.folder"
     }
-    res = requests.post(create_url, headers=headers, json=body, timeout=10)
+    if parent_id:
+        body["parents"] = [parent_id]
+    res = get_http_session().post(create_url, headers=headers, json=body, timeout=10)
     res.raise_for_status()
-    return res.json().get("id")
+    created_id = res.json().get("id")
+
+    # 다른 워커 프로세스가 동시에 같은 폴더를 만들었으면 먼저 만들어진 쪽으로 모으고 방금 만든 빈 폴더는 지웁니다.
+    folder_ids = search_folder_ids()
+    if folder_ids and folder_ids[0] != created_id:
+        try:
+            get_http_session().delete(f"{create_url}/{created_id}", headers=headers, timeout=10)
+        except Exception as e:
+            print(f"⚠️ 중복 Google Drive 폴더 삭제 실패: {created_id}, {e}")
+        return folder_ids[0]
+    return created_id
+
+def resolve_google_folder(access_token, folder_name, parent_id=None, account_key=None):
+    """
+    Google Drive 폴더 ID를 로컬 캐시에서 찾고, 없을 때만 Drive에서 검색/생성합니다.
+    캐시는 SQLite에 저장되어 재시작 후에도 유지됩니다.
+    """
+    scope = get_google_folder_scope(parent_id, account_key)
+    if not scope:
+        return find_or_create_google_folder(access_token, folder_name, parent_id)
+
+    folder_id = lookup_google_folder(scope, folder_name)
+    if folder_id:
+        return folder_id
+
+    with get_google_folder_lock(scope, folder_name):
+        folder_id = lookup_google_folder(scope, folder_name)
+        if not folder_id:
+            folder_id = find_or_create_google_folder(access_token, folder_name, parent_id)
+            record_google_folder(scope, folder_name, folder_id)
+    return folder_id
+
+def get_or_create_google_folder(access_token, folder_name="ArchiveSaver", account_key=None):
+    return resolve_google_folder(access_token, folder_name, account_key=account_key)
 
 def get_google_subfolder_id(access_token, parent_id, subfolder_name):
-    headers = {"Authorization": f"Bearer {access_token}"}
-    q = f"name = '{subfolder_name}' and '{parent_id}' in parents and mimeType = 'application/vnd.google-apps.folder' and trashed = false"
-    search_url = f"https://www.googleapis.com/drive/v3/files?q={quote(q)}&fields=files(id)"
-    res = requests.get(search_url, headers=headers, timeout=10)
-    res.raise_for_status()
-    files = res.json().get("files", [])
-    if files:
-        return files[0].get("id")
-    
-    create_url = "https://www.googleapis.com/drive/v3/files"
-    body = {
-        "name": subfolder_name,
-        "mimeType": "application/vnd.google-apps.folder",
-        "parents": [parent_id]
-    }
-    res = requests.post(create_url, headers=headers, json=body, timeout=10)
-    res.raise_for_status()
-    return res.json().get("id")
+    return resolve_google_folder(access_token, subfolder_name, parent_id=parent_id)
+
+def is_http_not_found(error):
+    response = getattr(error, "response", None)
+    return response is not None and getattr(response, "status_code", None) == 404
+
+def upload_to_google_subfolder(access_token, parent_id, subfolder_name, filename, file_bytes, content_type, make_public=True):
+    """캐시된 하위 폴더가 Drive에서 지워졌으면 캐시를 버리고 한 번 더 시도합니다."""
+    for attempt in range(2):
+        folder_id = get_google_subfolder_id(access_token, parent_id, subfolder_name)
+        try:
+            return upload_to_google_drive(access_token, folder_id, filename, file_bytes, content_type, make_public)
+        except Exception as e:
+            if attempt or not is_http_not_found(e):
+                raise
+            print(f"ℹ️ Google Drive 폴더를 찾을 수 없어 다시 확인합니다: {subfolder_name}")
+            invalidate_google_folder(subfolder_name, parent_id=parent_id)
 
 def upload_to_google_drive(access_token, folder_id, filename, file_bytes, content_type, make_public=True):
     headers = {"Authorization": f"Bearer {access_token}"}
@@ -150,7 +511,7 @@ def upload_to_google_drive(access_token, folder_id, filename, file_bytes, conten
         "file": (filename, file_bytes, content_type)
     }
     url = "https://www.googleapis.com/upload/drive/v3/files?uploadType=multipart&fields=id,webViewLink"
-    res = requests.post(url, headers=headers, files=files, timeout=30)
+    res = get_http_session().post(url, headers=headers, files=files, timeout=30)
     res.raise_for_status()
     res_data = res.json()
     
@@ -165,7 +526,7 @@ def upload_to_google_drive(access_token, folder_id, filename, file_bytes, conten
                 "role": "reader",
                 "type": "anyone"
             }
-            requests.post(perm_url, headers=headers, json=perm_body, timeout=10)
+            get_http_session().post(perm_url, headers=headers, json=perm_body, timeout=10)
         except Exception as e:
             print(f"Warning: Google Drive 파일 권한 설정 실패: {e}")
         
@@ -174,7 +535,7 @@ def upload_to_google_drive(access_token, folder_id, filename, file_bytes, conten
 def download_from_google_drive(access_token, file_id):
     headers = {"Authorization": f"Bearer {access_token}"}
     url = f"https://www.googleapis.com/drive/v3/files/{file_id}?alt=media"
-    res = requests.get(url, headers=headers, timeout=30)
+    res = get_http_session().get(url, headers=headers, timeout=30)
     res.raise_for_status()
     return res.content
 
@@ -183,30 +544,308 @@ def upload_file_to_user_storage(file_bytes, media_type, filename, content_type,
     if provider == "dropbox":
         dbx = storage_config["dbx_client"]
         dropbox_path = f"/web-archives/{media_type}/{filename}"
+        # 배치 모드에서는 세션만 올려 두고 커밋과 링크 생성은 finalize_dropbox_upload_batch에서 합니다.
+        batch = storage_config.get("upload_batch")
+        if batch is not None and len(file_bytes) <= DROPBOX_UPLOAD_CHUNK_SIZE:
+            pending_link = stage_dropbox_batch_upload(batch, file_bytes, dropbox_path)
+            if pending_link:
+                return pending_link
+
         dbx.files_upload(
             file_bytes,
             dropbox_path,
             mode=dropbox.files.WriteMode.overwrite
         )
-        
-        # 공유 링크 조회 혹은 생성
-        links = dbx.sharing_list_shared_links(path=dropbox_path).links
-        if links:
-            base_url = links[0].url.split("?")[0]
-            return f"{base_url}?raw=1"
-        
-        settings = dropbox.sharing.SharedLinkSettings(requested_visibility=dropbox.sharing.RequestedVisibility.public)
-        base_url = dbx.sharing_create_shared_link_with_settings(dropbox_path, settings).url.split("?")[0]
-        return f"{base_url}?raw=1"
+        return get_dropbox_raw_shared_link(dbx, dropbox_path, storage_config.get("account_key"), fresh=True)
         
     elif provider == "google":
         access_token = storage_config["access_token"]
         root_folder_id = storage_config["root_folder_id"]
         
-        subfolder_id = get_google_subfolder_id(access_token, root_folder_id, media_type)
-        file_id, _ = upload_to_google_drive(access_token, subfolder_id, filename, file_bytes, content_type)
+        file_id, _ = upload_to_google_subfolder(
+            access_token, root_folder_id, media_type, filename, file_bytes, content_type
+        )
         return f"https://drive.google.com/uc?export=download&id={file_id}"
 
+def create_dropbox_upload_batch(dbx, account_key=None):
+    """
+    아카이브 한 개의 작은 미디어 업로드를 모았다가 한 번에 커밋하는 배치를 만듭니다.
+    파일 내용은 업로드 세션으로 바로 올리고(동시 실행), 커밋만 finalize_dropbox_upload_batch에서 묶어 처리합니다.
+    """
+    return {
+        "dbx": dbx,
+        "account_key": account_key,
+        "entries": OrderedDict(),
+        "lock": threading.Lock(),
+    }
+
+def get_pending_batch_path(link):
+    """배치 커밋을 기다리는 자리표시 링크면 Dropbox 경로를, 아니면 None을 반환합니다."""
+    if isinstance(link, str) and link.startswith(DROPBOX_BATCH_PENDING_PREFIX):
+        return link[len(DROPBOX_BATCH_PENDING_PREFIX):]
+    return None
+
+def stage_dropbox_batch_upload(batch, file_bytes, dropbox_path):
+    """
+    파일을 닫힌 업로드 세션으로 올려 두고 자리표시 링크를 반환합니다.
+    세션 시작에 실패하면 None을 반환하므로 호출자가 단일 업로드로 넘어가야 합니다.
+    """
+    pending_link = f"{DROPBOX_BATCH_PENDING_PREFIX}{dropbox_path}"
+    with batch["lock"]:
+        entry = batch["entries"].get(dropbox_path)
+        if entry is None:
+            if len(batch["entries"]) >= DROPBOX_BATCH_MAX_ENTRIES:
+                return None
+            entry = {"cursor": None, "commit": None, "index": None, "started": threading.Event(), "failed": False}
+            batch["entries"][dropbox_path] = entry
+            owner = True
+        else:
+            owner = False
+
+    if not owner:
+        # 같은 경로를 먼저 올리는 요청의 세션 시작을 기다리고, 실패했으면 단일 업로드로 넘어갑니다.
+        entry["started"].wait()
+        return None if entry["failed"] else pending_link
+
+    try:
+        session = batch["dbx"].files_upload_session_start(file_bytes, close=True)
+    except Exception as e:
+        print(f"⚠️ 배치 업로드 세션 시작 실패, 단일 업로드로 전환합니다: {dropbox_path}, {e}")
+        with batch["lock"]:
+            batch["entries"].pop(dropbox_path, None)
+        entry["failed"] = True
+        entry["started"].set()
+        return None
+
+    entry["cursor"] = dropbox.files.UploadSessionCursor(session_id=session.session_id, offset=len(file_bytes))
+    entry["commit"] = dropbox.files.CommitInfo(path=dropbox_path, mode=dropbox.files.WriteMode.overwrite)
+    entry["started"].set()
+    return pending_link
+
+def defer_media_index(batch, dropbox_path, scope, media_type, digest, size):
+    """배치 커밋 후 링크가 정해지면 미디어 인덱스에 기록하도록 예약합니다."""
+    with batch["lock"]:
+        entry = batch["entries"].get(dropbox_path)
+        if entry is not None:
+            entry["index"] = (scope, media_type, digest, size)
+
+def finish_dropbox_upload_batch(dbx, finish_args):
+    """
+    업로드 세션 묶음을 커밋하고 finish_args 순서대로 성공 여부 목록을 반환합니다.
+    finish_batch_v2는 동기 API이고, 없으면 v1 비동기 작업을 폴링합니다.
+    """
+    if hasattr(dbx, "files_upload_session_finish_batch_v2"):
+        result = dbx.files_upload_session_finish_batch_v2(finish_args)
+    else:
+        launch = dbx.files_upload_session_finish_batch(finish_args)
+        if launch.is_complete():
+            result = launch.get_complete()
+        else:
+            async_job_id = launch.get_async_job_id()
+            deadline = time.time() + DROPBOX_BATCH_POLL_TIMEOUT_SECONDS
+            while True:
+                status = dbx.files_upload_session_finish_batch_check(async_job_id)
+                if status.is_complete():
+                    result = status.get_complete()
+                    break
+                if time.time() > deadline:
+                    raise TimeoutError("Dropbox 배치 커밋이 제한 시간 안에 끝나지 않았습니다.")
+                time.sleep(DROPBOX_BATCH_POLL_SECONDS)
+
+    return [entry.is_success() for entry in result.entries]
+
+def finalize_dropbox_upload_batch(batch):
+    """
+    모아 둔 업로드를 커밋하고 공유 링크를 한 번에 만듭니다.
+    배치 커밋이 실패한 항목은 세션별 단일 커밋으로 다시 시도합니다.
+
+    Returns:
+        {dropbox_path: ?raw=1 공유 링크 또는 None(실패)} 딕셔너리
+    """
+    dbx = batch["dbx"]
+    with batch["lock"]:
+        entries = [
+            (dropbox_path, entry)
+            for dropbox_path, entry in batch["entries"].items()
+            if entry["cursor"] is not None
+        ]
+        batch["entries"].clear()
+    if not entries:
+        return {}
+
+    committed = []
+    for start in range(0, len(entries), DROPBOX_BATCH_MAX_ENTRIES):
+        group = entries[start:start + DROPBOX_BATCH_MAX_ENTRIES]
+        finish_args = [
+            dropbox.files.UploadSessionFinishArg(cursor=entry["cursor"], commit=entry["commit"])
+            for _, entry in group
+        ]
+        try:
+            successes = finish_dropbox_upload_batch(dbx, finish_args)
+        except Exception as e:
+            print(f"⚠️ Dropbox 배치 커밋 실패, 단일 커밋으로 전환합니다: {e}")
+            successes = [False] * len(group)
+
+        for (dropbox_path, entry), success in zip(group, successes):
+            if not success:
+                try:
+                    dbx.files_upload_session_finish(b"", entry["cursor"], entry["commit"])
+                    success = True
+                except Exception as e:
+                    print(f"❌ Dropbox 업로드 커밋 실패: {dropbox_path}, {e}")
+            if success:
+                committed.append((dropbox_path, entry))
+
+    links = resolve_dropbox_shared_links(
+        dbx, [dropbox_path for dropbox_path, _ in committed], batch["account_key"], fresh=True
+    )
+    raw_links = {}
+    for dropbox_path, entry in committed:
+        base_url = links.get(dropbox_path)
+        raw_links[dropbox_path] = f"{base_url}?raw=1" if base_url else None
+        if base_url and entry["index"]:
+            scope, media_type, digest, size = entry["index"]
+            record_media_index(scope, media_type, digest, raw_links[dropbox_path], size)
+    print(f"ℹ️ Dropbox 배치 업로드: 커밋 {len(committed)}/{len(entries)}개")
+    return raw_links
+
+def lookup_dropbox_shared_link(account_key, dropbox_path):
+    row = get_local_db(DROPBOX_SHARED_LINK_DB, DROPBOX_SHARED_LINK_SCHEMA).execute(
+        "SELECT url FROM dropbox_shared_links WHERE account = ? AND path = ?",
+        (account_key, dropbox_path.lower())
+    ).fetchone()
+    return row["url"] if row else None
+
+def record_dropbox_shared_link(account_key, dropbox_path, url):
+    get_local_db(DROPBOX_SHARED_LINK_DB, DROPBOX_SHARED_LINK_SCHEMA).execute(
+        "INSERT OR REPLACE INTO dropbox_shared_links (account, path, url, created_at) VALUES (?, ?, ?, ?)",
+        (account_key, dropbox_path.lower(), url, time.time())
+    )
+
+def create_dropbox_shared_link(dbx, dropbox_path):
+    """공유 링크를 만들고, 이미 있으면 오류에 담긴 기존 링크를 반환합니다. 알 수 없으면 None."""
+    settings = dropbox.sharing.SharedLinkSettings(requested_visibility=dropbox.sharing.RequestedVisibility.public)
+    try:
+        return dbx.sharing_create_shared_link_with_settings(dropbox_path, settings).url
+    except dropbox.exceptions.ApiError as e:
+        error = e.error
+        if not (hasattr(error, "is_shared_link_already_exists") and error.is_shared_link_already_exists()):
+            raise
+        existing = error.get_shared_link_already_exists()
+        if existing is not None and existing.is_metadata():
+            return existing.get_metadata().url
+        return None
+
+def list_dropbox_shared_link(dbx, dropbox_path):
+    # direct_only가 없으면 상위 폴더 공유 링크도 함께 돌아옵니다.
+    links = dbx.sharing_list_shared_links(path=dropbox_path, direct_only=True).links
+    return links[0].url if links else None
+
+def resolve_dropbox_shared_link(dbx, dropbox_path, account_key=None, fresh=False):
+    """
+    Dropbox 파일의 공유 링크(쿼리 파라미터 제외)를 반환합니다.
+
+    Args:
+        dbx: Dropbox 클라이언트
+        dropbox_path: Dropbox 파일 경로
+        account_key: 링크 캐시를 구분할 계정 키. 없으면 캐시를 사용하지 않습니다.
+        fresh: 방금 새로 업로드한 경로면 True. 링크가 있을 리 없으므로 목록 조회 없이 바로 생성합니다.
+    """
+    if account_key:
+        cached_url = lookup_dropbox_shared_link(account_key, dropbox_path)
+        if cached_url:
+            return cached_url
+
+    if fresh:
+        url = create_dropbox_shared_link(dbx, dropbox_path) or list_dropbox_shared_link(dbx, dropbox_path)
+    else:
+        url = list_dropbox_shared_link(dbx, dropbox_path) or create_dropbox_shared_link(dbx, dropbox_path)
+    if not url:
+        # 목록 조회와 생성 사이에 다른 요청이 링크를 만든 경우
+        url = list_dropbox_shared_link(dbx, dropbox_path)
+    if not url:
+        raise RuntimeError(f"Dropbox 공유 링크를 만들 수 없습니다: {dropbox_path}")
+
+    base_url = url.split("?")[0]
+    if account_key:
+        record_dropbox_shared_link(account_key, dropbox_path, base_url)
+    return base_url
+
+def resolve_dropbox_shared_links(dbx, dropbox_paths, account_key=None, fresh=False):
+    """
+    여러 경로의 공유 링크를 동시에 확인합니다. 일괄 업로드 직후 링크를 한 번에 만들 때 사용합니다.
+
+    Returns:
+        {dropbox_path: 공유 링크 또는 None(실패)} 딕셔너리
+    """
+    def resolve(dropbox_path):
+        try:
+            return resolve_dropbox_shared_link(dbx, dropbox_path, account_key, fresh)
+        except Exception as e:
+            print(f"⚠️ Dropbox 공유 링크 확인 실패: {dropbox_path}, {e}")
+            return None
+
+    dropbox_paths = list(dict.fromkeys(dropbox_paths))
+    if not dropbox_paths:
+        return {}
+
+    with ThreadPoolExecutor(max_workers=min(DROPBOX_SHARED_LINK_CONCURRENCY, len(dropbox_paths))) as executor:
+        return dict(zip(dropbox_paths, executor.map(resolve, dropbox_paths)))
+
+def get_dropbox_raw_shared_link(dbx, dropbox_path, account_key=None, fresh=False):
+    return f"{resolve_dropbox_shared_link(dbx, dropbox_path, account_key, fresh)}?raw=1"
+
+def dropbox_file_exists(dbx, dropbox_path):
+    try:
+        dbx.files_get_metadata(dropbox_path)
+        return True
+    except dropbox.exceptions.ApiError:
+        return False
+
+def lookup_media_index(scope, media_type, digest):
+    row = get_local_db(MEDIA_INDEX_DB, MEDIA_INDEX_SCHEMA).execute(
+        "SELECT url FROM media_index WHERE scope = ? AND media_type = ? AND digest = ?",
+        (scope, media_type, digest)
+    ).fetchone()
+    return row["url"] if row else None
+
+def record_media_index(scope, media_type, digest, url, size=None):
+    get_local_db(MEDIA_INDEX_DB, MEDIA_INDEX_SCHEMA).execute(
+        "INSERT OR REPLACE INTO media_index (scope, media_type, digest, url, size, created_at) "
+        "VALUES (?, ?, ?, ?, ?, ?)",
+        (scope, media_type, digest, url, size, time.time())
+    )
+
+def store_content_addressed_media(file_bytes, digest, media_type, filename, content_type, storage_config):
+    """
+    바이트 해시로 이름 붙인 미디어를 저장합니다.
+    인덱스나 Dropbox 메타데이터 조회로 이미 저장된 파일이 확인되면 업로드를 건너뜁니다.
+
+    storage_config["account_key"]가 없으면 사용자 간 링크가 섞이지 않도록 인덱스를 사용하지 않습니다.
+    """
+    scope = storage_config.get("account_key")
+    if scope:
+        indexed_url = lookup_media_index(scope, media_type, digest)
+        if indexed_url:
+            return indexed_url
+
+    shared_link = None
+    if storage_config["provider"] == "dropbox":
+        dbx = storage_config["dbx_client"]
+        dropbox_path = f"/web-archives/{media_type}/{filename}"
+        if dropbox_file_exists(dbx, dropbox_path):
+            shared_link = get_dropbox_raw_shared_link(dbx, dropbox_path, scope)
+
+    if not shared_link:
+        shared_link = upload_file_to_user_storage(file_bytes, media_type, filename, content_type, storage_config)
+
+    pending_path = get_pending_batch_path(shared_link)
+    if pending_path:
+        defer_media_index(storage_config["upload_batch"], pending_path, scope, media_type, digest, len(file_bytes))
+    elif scope and shared_link:
+        record_media_index(scope, media_type, digest, shared_link, len(file_bytes))
+    return shared_link
+
 def is_allowed_cors_origin(origin):
     if not origin:
         return False
@@ -219,14 +858,15 @@ def is_allowed_cors_origin(origin):
 
 @app.after_request
 def add_api_cors_headers(response):
-    if request.path not in ["/api/save-html", "/api/upload-media", "/api/media-upload-link"]:
+    is_save_job_status = request.path.startswith("/api/save-jobs/")
+    if request.path not in ["/api/save-html", "/api/upload-media", "/api/media-upload-link"] and not is_save_job_status:
         return response
 
     origin = request.headers.get("Origin")
     if is_allowed_cors_origin(origin):
         response.headers["Access-Control-Allow-Origin"] = origin
         response.headers["Vary"] = "Origin"
-        response.headers["Access-Control-Allow-Methods"] = "POST, OPTIONS"
+        response.headers["Access-Control-Allow-Methods"] = "GET, OPTIONS" if is_save_job_status else "POST, OPTIONS"
         response.headers["Access-Control-Allow-Headers"] = "Content-Type"
 
     return response
@@ -249,15 +889,11 @@ def get_request_origin():
     return f"{scheme}://{host}"
 
 def get_dropbox_client():
-    return dropbox.Dropbox(
-        app_key=APP_KEY,
-        app_secret=APP_SECRET,
-        oauth2_refresh_token=DROPBOX_REFRESH_TOKEN
-    )
+    return get_user_dropbox_client(DROPBOX_REFRESH_TOKEN)
 
 def find_collection_id_by_title(title):
     headers = {"Authorization": f"Bearer {RAINDROP_ACCESS_TOKEN}"}
-    res = requests.get("https://api.raindrop.io/rest/v1/collections", headers=headers, timeout=30)
+    res = get_http_session().get("https://api.raindrop.io/rest/v1/collections", headers=headers, timeout=30)
     res.raise_for_status()
 
     for collection in res.json().get("items", []):
@@ -277,18 +913,7 @@ def get_shared_link(dropbox_path, use_raw=False):
     Returns:
         공유 링크 URL
     """
-    dbx = get_dropbox_client()
-    links = dbx.sharing_list_shared_links(path=dropbox_path).links
-    if links:
-        # 기존 링크가 있으면 사용
-        base_url = links[0].url.split("?")[0]  # 쿼리 파라미터 제거
-        if use_raw:
-            return f"{base_url}?raw=1"
-        else:
-            return base_url
-    # 새 공유 링크 생성
-    settings = dropbox.sharing.SharedLinkSettings(requested_visibility=dropbox.sharing.RequestedVisibility.public)
-    base_url = dbx.sharing_create_shared_link_with_settings(dropbox_path, settings).url.split("?")[0]
+    base_url = resolve_dropbox_shared_link(get_dropbox_client(), dropbox_path, "dropbox:server")
     if use_raw:
         return f"{base_url}?raw=1"
     else:
@@ -306,9 +931,9 @@ def generate_filename(parsed):
 def get_archive_id(filename):
     return filename[:-5] if filename.endswith(".html") else filename
 
-def get_archive_url(filename):
+def get_archive_url(filename, origin=None):
     archive_id = quote(get_archive_id(filename), safe="")
-    return f"{get_request_origin()}/archive/{archive_id}"
+    return f"{origin or get_request_origin()}/archive/{archive_id}"
 
 def normalize_archive_filename(archive_id):
     decoded_id = unquote(archive_id).strip()
@@ -334,19 +959,131 @@ def normalize_media_filename(filename):
 def get_archive_media_url(media_type, filename):
     return f"/archive-media/{media_type}/{quote(filename, safe='')}"
 
-def get_dropbox_temporary_link(dropbox_path):
-    now = time.time()
-    cached = DROPBOX_TEMP_LINK_CACHE.get(dropbox_path)
-    if cached and cached["expires_at"] > now:
-        return cached["link"]
+def count_dropbox_temp_link(stat):
+    with DROPBOX_TEMP_LINK_CACHE_LOCK:
+        DROPBOX_TEMP_LINK_STATS[stat] += 1
+
+def get_dropbox_temp_link_stats():
+    with DROPBOX_TEMP_LINK_CACHE_LOCK:
+        return dict(DROPBOX_TEMP_LINK_STATS, entries=len(DROPBOX_TEMP_LINK_CACHE))
+
+def get_dropbox_temp_link_entry(dropbox_path):
+    with DROPBOX_TEMP_LINK_CACHE_LOCK:
+        entry = DROPBOX_TEMP_LINK_CACHE.get(dropbox_path)
+        if entry is None:
+            # value: (link, expires_at) 튜플을 통째로 바꿔 읽는 쪽이 잠금 없이도 짝이 맞는 값을 보게 합니다.
+            entry = {"value": (None, 0), "lock": threading.Lock(), "refreshing": False}
+            DROPBOX_TEMP_LINK_CACHE[dropbox_path] = entry
+            while len(DROPBOX_TEMP_LINK_CACHE) > DROPBOX_TEMP_LINK_CACHE_SIZE:
+                DROPBOX_TEMP_LINK_CACHE.popitem(last=False)
+        else:
+            DROPBOX_TEMP_LINK_CACHE.move_to_end(dropbox_path)
+        return entry
+
+def lookup_shared_dropbox_temp_link(dropbox_path):
+    if not DROPBOX_TEMP_LINK_SHARED_CACHE:
+        return None
+
+    try:
+        row = get_local_db(DROPBOX_TEMP_LINK_DB, DROPBOX_TEMP_LINK_SCHEMA).execute(
+            "SELECT link, expires_at FROM dropbox_temp_links WHERE path = ?",
+            (dropbox_path,)
+        ).fetchone()
+    except Exception as e:
+        print(f"⚠️ 임시 링크 공유 캐시 조회 실패: {e}")
+        return None
+    return (row["link"], row["expires_at"]) if row else None
+
+def record_shared_dropbox_temp_link(dropbox_path, link, expires_at):
+    if not DROPBOX_TEMP_LINK_SHARED_CACHE:
+        return
 
+    try:
+        db = get_local_db(DROPBOX_TEMP_LINK_DB, DROPBOX_TEMP_LINK_SCHEMA)
+        db.execute(
+            "INSERT OR REPLACE INTO dropbox_temp_links (path, link, expires_at) VALUES (?, ?, ?)",
+            (dropbox_path, link, expires_at)
+        )
+        db.execute("DELETE FROM dropbox_temp_links WHERE expires_at < ?", (time.time(),))
+    except Exception as e:
+        print(f"⚠️ 임시 링크 공유 캐시 저장 실패: {e}")
+
+def fetch_dropbox_temporary_link(dropbox_path, entry):
+    """Dropbox API로 새 임시 링크를 받아 프로세스 캐시와 공유 캐시에 기록합니다. entry["lock"] 안에서 호출해야 합니다."""
+    # 만료 시각은 응답에 없으므로 요청 직전 시각 기준으로 보수적으로 잡습니다.
+    expires_at = time.time() + DROPBOX_TEMP_LINK_LIFETIME_SECONDS
     result = get_dropbox_client().files_get_temporary_link(dropbox_path)
-    DROPBOX_TEMP_LINK_CACHE[dropbox_path] = {
-        "link": result.link,
-        "expires_at": now + DROPBOX_TEMP_LINK_TTL_SECONDS,
-    }
+    entry["value"] = (result.link, expires_at)
+    record_shared_dropbox_temp_link(dropbox_path, result.link, expires_at)
     return result.link
 
+def refresh_dropbox_temporary_link(dropbox_path, entry):
+    try:
+        with entry["lock"]:
+            # 다른 워커가 이미 새 링크를 받아 두었으면 그것을 씁니다.
+            shared = lookup_shared_dropbox_temp_link(dropbox_path)
+            if shared and shared[1] - time.time() > DROPBOX_TEMP_LINK_REFRESH_MARGIN_SECONDS:
+                entry["value"] = shared
+            else:
+                fetch_dropbox_temporary_link(dropbox_path, entry)
+                count_dropbox_temp_link("refreshes")
+        stats = get_dropbox_temp_link_stats()
+        print(
+            f"ℹ️ 임시 링크 캐시: hit {stats['hits']}, 공유 hit {stats['shared_hits']}, "
+            f"miss {stats['misses']}, 미리 갱신 {stats['refreshes']}, {stats['entries']}개"
+        )
+    except Exception as e:
+        print(f"⚠️ 임시 링크 미리 갱신 실패: {dropbox_path}, {e}")
+    finally:
+        entry["refreshing"] = False
+
+def schedule_dropbox_temp_link_refresh(dropbox_path, entry):
+    with DROPBOX_TEMP_LINK_CACHE_LOCK:
+        if entry["refreshing"]:
+            return
+        entry["refreshing"] = True
+
+    threading.Thread(
+        target=refresh_dropbox_temporary_link,
+        args=(dropbox_path, entry),
+        name="dropbox-temp-link-refresh",
+        daemon=True,
+    ).start()
+
+def get_dropbox_temporary_link(dropbox_path):
+    """
+    미디어 파일의 Dropbox 임시 링크를 반환합니다.
+    프로세스 LRU -> 워커 간 공유 캐시 -> Dropbox API 순으로 찾고,
+    같은 경로를 동시에 요청해도 API는 한 번만 호출합니다.
+    만료가 가까운 링크는 그대로 내보내면서 백그라운드에서 새로 받습니다.
+    """
+    entry = get_dropbox_temp_link_entry(dropbox_path)
+    link, expires_at = entry["value"]
+    remaining = expires_at - time.time()
+    if link and remaining > DROPBOX_TEMP_LINK_MIN_REMAINING_SECONDS:
+        count_dropbox_temp_link("hits")
+        if remaining < DROPBOX_TEMP_LINK_REFRESH_MARGIN_SECONDS:
+            schedule_dropbox_temp_link_refresh(dropbox_path, entry)
+        return link
+
+    with entry["lock"]:
+        # 잠금을 기다리는 동안 다른 요청이 링크를 받아 두었을 수 있습니다.
+        link, expires_at = entry["value"]
+        if link and expires_at - time.time() > DROPBOX_TEMP_LINK_MIN_REMAINING_SECONDS:
+            count_dropbox_temp_link("hits")
+            return link
+
+        shared = lookup_shared_dropbox_temp_link(dropbox_path)
+        if shared and shared[1] - time.time() > DROPBOX_TEMP_LINK_MIN_REMAINING_SECONDS:
+            entry["value"] = shared
+            count_dropbox_temp_link("shared_hits")
+            if shared[1] - time.time() < DROPBOX_TEMP_LINK_REFRESH_MARGIN_SECONDS:
+                schedule_dropbox_temp_link_refresh(dropbox_path, entry)
+            return shared[0]
+
+        count_dropbox_temp_link("misses")
+        return fetch_dropbox_temporary_link(dropbox_path, entry)
+
 def iter_upstream_content(upstream_response, chunk_size=1024 * 256):
     try:
         for chunk in upstream_response.iter_content(chunk_size=chunk_size):
@@ -355,6 +1092,143 @@ def iter_upstream_content(upstream_response, chunk_size=1024 * 256):
     finally:
         upstream_response.close()
 
+def resolve_request_range(size, etag=None):
+    """
+    요청의 Range/If-Range 헤더를 파일 크기에 맞춰 해석합니다.
+    여러 구간 요청과 ETag가 맞지 않는 If-Range는 전체 응답으로 처리합니다.
+
+    Returns:
+        (start, end, status) 튜플. status는 200, 206 또는 만족할 수 없는 범위면 416
+    """
+    byte_range = request.range
+    if not byte_range or len(byte_range.ranges) != 1:
+        return 0, size, 200
+
+    if request.headers.get("If-Range") and (not etag or request.if_range.etag != etag):
+        return 0, size, 200
+
+    span = byte_range.range_for_length(size)
+    if span is None:
+        return 0, 0, 416
+    return span[0], span[1], 206
+
+def is_length_aware_file_wrapper(environ):
+    """gunicorn의 file_wrapper는 현재 오프셋부터 Content-Length만큼만 os.sendfile로 보냅니다."""
+    file_wrapper = environ.get("wsgi.file_wrapper")
+    return getattr(file_wrapper, "__module__", "").startswith("gunicorn.")
+
+def get_x_accel_redirect_path(path):
+    real_path = os.path.realpath(path)
+    for local_dir, location in X_ACCEL_REDIRECT_MAP:
+        if real_path.startswith(local_dir + os.sep):
+            return f"{location.rstrip('/')}/{quote(os.path.relpath(real_path, local_dir))}"
+    return None
+
+def serve_local_file(path, content_type, etag=None, headers=None, complete=True):
+    """
+    로컬 파일을 Range/If-Range/If-None-Match를 처리해 응답합니다.
+    완성된 파일은 설정에 따라 프런트 서버(X-Accel-Redirect, X-Sendfile)에 전송을 넘기고,
+    그 외에는 WSGI file_wrapper로 보내 gunicorn에서는 파이썬 복사 없이 os.sendfile로 나갑니다.
+
+    Args:
+        etag: 따옴표 없는 강한 ETag
+        complete: False면 일부 구간만 유효한 희소 파일이라 프런트 서버에 넘기지 않습니다.
+    """
+    size = os.path.getsize(path)
+    response_headers = {"Accept-Ranges": "bytes", **(headers or {})}
+    if etag:
+        response_headers["ETag"] = quote_etag(etag)
+
+    if etag and request.if_none_match.contains_weak(etag):
+        return Response(status=304, headers=response_headers)
+
+    if complete:
+        # 프런트 서버가 Range 처리와 본문 전송을 맡습니다.
+        accel_path = get_x_accel_redirect_path(path)
+        if accel_path:
+            return Response(content_type=content_type, headers={**response_headers, "X-Accel-Redirect": accel_path})
+        if USE_X_SENDFILE:
+            return Response(content_type=content_type, headers={**response_headers, "X-Sendfile": path})
+
+    start, end, status = resolve_request_range(size, etag)
+    if status == 416:
+        return Response(status=416, headers={**response_headers, "Content-Range": f"bytes */{size}"})
+    if status == 206:
+        response_headers["Content-Range"] = f"bytes {start}-{end - 1}/{size}"
+    response_headers["Content-Length"] = str(end - start)
+
+    # 일반 file_wrapper는 파일 끝까지 읽으므로 중간에서 끝나는 구간은 gunicorn에서만 넘깁니다.
+    if end == size or is_length_aware_file_wrapper(request.environ):
+        f = open(path, "rb")
+        f.seek(start)
+        body = wrap_file(request.environ, f)
+    else:
+        body = iter_file_range(path, start, end)
+
+    return Response(body, status=status, content_type=content_type, headers=response_headers, direct_passthrough=True)
+
+def serve_cached_archive_media(dropbox_path, content_type):
+    """
+    요청한 구간이 미디어 캐시에 모두 채워져 있으면 로컬 파일로 응답합니다.
+    없거나 일부만 있으면 None을 반환하므로 호출자가 원본에서 받아야 합니다.
+    """
+    meta = get_media_cache_entry(MEDIA_EDGE_CACHE, dropbox_path)
+    if meta is None:
+        record_media_cache_lookup(MEDIA_EDGE_CACHE, "misses")
+        return None
+
+    etag = unquote_etag(meta["etag"])[0] if meta.get("etag") else None
+    start, end, status = resolve_request_range(meta["size"], etag)
+    if status == 416:
+        return None
+    if not is_range_filled(meta, start, end):
+        record_media_cache_lookup(MEDIA_EDGE_CACHE, "misses")
+        return None
+
+    complete = is_fully_filled(meta)
+    record_media_cache_lookup(MEDIA_EDGE_CACHE, "hits" if complete else "partial_hits")
+    touch_media_cache_entry(MEDIA_EDGE_CACHE, dropbox_path, meta)
+    try:
+        return serve_local_file(
+            get_media_cache_data_path(MEDIA_EDGE_CACHE, meta),
+            meta.get("content_type") or content_type,
+            etag=etag,
+            headers={"Cache-Control": "private, max-age=86400"},
+            complete=complete
+        )
+    except OSError:
+        # 조회 직후 항목이 밀려나거나 교체되면 원본에서 받습니다.
+        return None
+
+def open_archive_media_cache_fill(dropbox_path, upstream_response, content_type):
+    """
+    원본 응답을 미디어 캐시에 채울 수 있으면 (메타데이터, 기록을 시작할 오프셋)을, 아니면 None을 반환합니다.
+    """
+    if not MEDIA_EDGE_CACHE["dir"] or upstream_response.headers.get("Content-Encoding"):
+        return None
+
+    if upstream_response.status_code == 206:
+        content_range = parse_content_range_header(upstream_response.headers.get("Content-Range"))
+        if content_range is None or content_range.length is None:
+            return None
+        offset, size = content_range.start, content_range.length
+    elif upstream_response.status_code == 200:
+        content_length = upstream_response.headers.get("Content-Length")
+        if not content_length or not content_length.isdigit():
+            return None
+        offset, size = 0, int(content_length)
+    else:
+        return None
+
+    meta = open_media_cache_entry(
+        MEDIA_EDGE_CACHE,
+        dropbox_path,
+        size,
+        content_type=content_type,
+        etag=upstream_response.headers.get("ETag")
+    )
+    return (meta, offset) if meta else None
+
 def infer_extension(filename, content_type, media_type):
     if filename:
         ext = os.path.splitext(filename)[1].lower()
@@ -373,39 +1247,108 @@ def infer_extension(filename, content_type, media_type):
     }
     return fallback_extensions.get(media_type, ".bin")
 
-def build_media_filename(media_type, source_url="", original_filename="", content_type=""):
+def build_media_filename(media_type, source_url="", original_filename="", content_type="", content_hash=None):
     parsed_source = urlparse(source_url or "")
     source_name = os.path.basename(parsed_source.path)
+    ext = infer_extension(original_filename or source_name, content_type, media_type)
+    if content_hash:
+        # 같은 바이트는 항상 같은 경로에 저장되어 아카이브 간에 재사용됩니다.
+        return f"{content_hash[:32]}{ext}"
+
     base_name = os.path.splitext(original_filename or source_name)[0]
     safe_base = re.sub(r"[^A-Za-z0-9._-]+", "_", base_name).strip("._-")
     if not safe_base:
         safe_base = media_type.rstrip("s") or "media"
 
-    ext = infer_extension(original_filename or source_name, content_type, media_type)
     return f"{safe_base}_{uuid4().hex[:12]}{ext}"
 
+def hash_media_stream(file_stream, chunk_size=1024 * 1024):
+    digest = hashlib.sha256()
+    for chunk in iter(lambda: file_stream.read(chunk_size), b""):
+        digest.update(chunk)
+    file_stream.seek(0)
+    return digest.hexdigest()
+
+def find_content_addressed_archive_media(dbx, media_type, filename, digest):
+    indexed_url = lookup_media_index(SERVER_ARCHIVE_MEDIA_SCOPE, media_type, digest)
+    if indexed_url:
+        return indexed_url
+
+    if dropbox_file_exists(dbx, f"/web-archives/{media_type}/{filename}"):
+        archive_url = get_archive_media_url(media_type, filename)
+        record_media_index(SERVER_ARCHIVE_MEDIA_SCOPE, media_type, digest, archive_url)
+        return archive_url
+    return None
+
 def upload_media_bytes(media_bytes, media_type, filename):
+    dbx = get_dropbox_client()
+    digest = None
+    if MEDIA_CONTENT_ADDRESSED:
+        digest = hashlib.sha256(media_bytes).hexdigest()
+        filename = build_media_filename(media_type, original_filename=filename, content_hash=digest)
+        existing_url = find_content_addressed_archive_media(dbx, media_type, filename, digest)
+        if existing_url:
+            return existing_url
+
     dropbox_path = f"/web-archives/{media_type}/{filename}"
-    get_dropbox_client().files_upload(
+    dbx.files_upload(
         media_bytes,
         dropbox_path,
         mode=dropbox.files.WriteMode.overwrite
     )
-    return get_archive_media_url(media_type, filename)
+    archive_url = get_archive_media_url(media_type, filename)
+    if digest:
+        record_media_index(SERVER_ARCHIVE_MEDIA_SCOPE, media_type, digest, archive_url, len(media_bytes))
+    return archive_url
 
 def upload_media_stream(file_stream, media_type, filename):
-    dropbox_path = f"/web-archives/{media_type}/{filename}"
     dbx = get_dropbox_client()
-    first_chunk = file_stream.read(DROPBOX_UPLOAD_CHUNK_SIZE)
+    if MEDIA_CONTENT_ADDRESSED and file_stream.seekable():
+        digest = hash_media_stream(file_stream)
+        filename = build_media_filename(media_type, original_filename=filename, content_hash=digest)
+        existing_url = find_content_addressed_archive_media(dbx, media_type, filename, digest)
+        if existing_url:
+            return existing_url
+        archive_url = upload_media_stream_to_path(dbx, file_stream, media_type, filename)
+        record_media_index(SERVER_ARCHIVE_MEDIA_SCOPE, media_type, digest, archive_url)
+        return archive_url
+
+    return upload_media_stream_to_path(dbx, file_stream, media_type, filename)
+
+def upload_media_stream_to_path(dbx, file_stream, media_type, filename):
+    dropbox_path = f"/web-archives/{media_type}/{filename}"
+    upload_chunks_to_dropbox(
+        dbx,
+        iter(lambda: file_stream.read(DROPBOX_UPLOAD_CHUNK_SIZE), b""),
+        dropbox_path
+    )
+    return get_archive_media_url(media_type, filename)
 
-    if not first_chunk:
-        dbx.files_upload(b"", dropbox_path, mode=dropbox.files.WriteMode.overwrite)
-        return get_archive_media_url(media_type, filename)
+def iter_fixed_size_chunks(chunks, chunk_size):
+    buffer = bytearray()
+    for chunk in chunks:
+        buffer += chunk
+        while len(buffer) >= chunk_size:
+            yield bytes(buffer[:chunk_size])
+            del buffer[:chunk_size]
+    if buffer:
+        yield bytes(buffer)
+
+def upload_chunks_to_dropbox(dbx, chunks, dropbox_path, mode=None):
+    """
+    바이트 조각 이터레이터를 Dropbox에 업로드합니다.
+    DROPBOX_UPLOAD_CHUNK_SIZE 하나에 들어가면 한 번에, 넘치면 업로드 세션으로 나눠 보내므로
+    메모리에는 청크 두 개까지만 올라갑니다.
 
-    next_chunk = file_stream.read(DROPBOX_UPLOAD_CHUNK_SIZE)
-    if not next_chunk:
-        dbx.files_upload(first_chunk, dropbox_path, mode=dropbox.files.WriteMode.overwrite)
-        return get_archive_media_url(media_type, filename)
+    Returns:
+        업로드된 파일의 FileMetadata
+    """
+    mode = mode or dropbox.files.WriteMode.overwrite
+    chunks = iter_fixed_size_chunks(chunks, DROPBOX_UPLOAD_CHUNK_SIZE)
+    first_chunk = next(chunks, b"")
+    next_chunk = next(chunks, None)
+    if next_chunk is None:
+        return dbx.files_upload(first_chunk, dropbox_path, mode=mode)
 
     session = dbx.files_upload_session_start(first_chunk)
     cursor = dropbox.files.UploadSessionCursor(
@@ -414,21 +1357,15 @@ def upload_media_stream(file_stream, media_type, filename):
     )
     commit = dropbox.files.CommitInfo(
         path=dropbox_path,
-        mode=dropbox.files.WriteMode.overwrite
+        mode=mode
     )
 
     chunk = next_chunk
-    while True:
-        next_chunk = file_stream.read(DROPBOX_UPLOAD_CHUNK_SIZE)
-        if next_chunk:
-            dbx.files_upload_session_append_v2(chunk, cursor)
-            cursor.offset += len(chunk)
-            chunk = next_chunk
-        else:
-            dbx.files_upload_session_finish(chunk, cursor, commit)
-            break
-
-    return get_archive_media_url(media_type, filename)
+    for next_chunk in chunks:
+        dbx.files_upload_session_append_v2(chunk, cursor)
+        cursor.offset += len(chunk)
+        chunk = next_chunk
+    return dbx.files_upload_session_finish(chunk, cursor, commit)
 
 def fetch_page_html(url):
     headers = {
@@ -440,7 +1377,7 @@ def fetch_page_html(url):
         "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
         "Accept-Language": "ko-KR,ko;q=0.9,en-US;q=0.8,en;q=0.7",
     }
-    response = requests.get(url, headers=headers, timeout=30)
+    response = get_http_session().get(url, headers=headers, timeout=30)
     response.raise_for_status()
     return response.text
 
@@ -449,9 +1386,7 @@ def is_security_challenge_html(html):
         return False
 
     try:
-        soup = BeautifulSoup(html, "html.parser")
-        title_text = soup.title.get_text(" ", strip=True) if soup.title else ""
-        body_text = soup.body.get_text(" ", strip=True) if soup.body else soup.get_text(" ", strip=True)
+        title_text, body_text = extract_title_and_text(html)
         condensed_text = " ".join(body_text.split())
         normalized_title = " ".join(title_text.lower().split())
         normalized_html = html.lower()
@@ -508,84 +1443,229 @@ def is_security_challenge_html(html):
     except Exception:
         return False
 
-def security_challenge_response():
-    return jsonify({
-        "error": (
-            "사이트가 서버의 자동 접속에 보안 확인을 요구했습니다. "
-            "실제 본문 대신 보안 확인 페이지가 감지되어 저장하지 않았습니다. "
-            "이 사이트는 휴대폰 브라우저에서 확인을 완료한 페이지 내용을 "
-            "앱이 직접 캡처하는 방식이 필요합니다."
-        )
-    }), 409
+SECURITY_CHALLENGE_ERROR = (
+    "사이트가 서버의 자동 접속에 보안 확인을 요구했습니다. "
+    "실제 본문 대신 보안 확인 페이지가 감지되어 저장하지 않았습니다. "
+    "이 사이트는 휴대폰 브라우저에서 확인을 완료한 페이지 내용을 "
+    "앱이 직접 캡처하는 방식이 필요합니다."
+)
 
 def render_page_html_with_playwright(url):
-    from playwright.sync_api import sync_playwright
-
+    """
+    Returns:
+        (html, captured_responses) 튜플
+        captured_responses: 브라우저가 받은 응답 저장소 (capture_store_utils).
+            큰 본문은 임시 파일로 내려가므로 사용 후 close_capture_store를 호출해야 합니다.
+    """
     print("🎭 Playwright 렌더링 캡처 시작:", url)
-    with sync_playwright() as p:
-        browser = None
-        context = None
+    html, captured_responses = submit_render(
+        capture_page_with_browser,
+        url,
+        discard_result=lambda result: close_capture_store(result[1])
+    )
+    print(
+        f"✅ Playwright 렌더링 캡처 완료 (재사용 가능한 응답 {len(captured_responses['entries'])}개, "
+        f"{captured_responses['total_bytes'] // 1024}KB)"
+    )
+    return html, captured_responses
 
-        try:
-            browser = p.chromium.launch(
-                headless=True,
-                args=["--no-sandbox", "--disable-dev-shm-usage"]
-            )
-            context = browser.new_context(
-                viewport={"width": 390, "height": 1200},
-                device_scale_factor=2,
-                is_mobile=True,
-                has_touch=True,
-                locale="ko-KR",
-                user_agent=(
-                    "Mozilla/5.0 (Linux; Android 14; Mobile) "
-                    "AppleWebKit/537.36 (KHTML, like Gecko) "
-                    "Chrome/124.0 Mobile Safari/537.36"
-                )
-            )
-            page = context.new_page()
-            page.goto(url, wait_until="domcontentloaded", timeout=30000)
+def is_blocked_capture_host(host):
+    host = host.lower()
+    return any(host == domain or host.endswith(f".{domain}") for domain in PLAYWRIGHT_BLOCKED_DOMAINS)
+
+def block_capture_requests(context):
+    def handle_route(route):
+        request = route.request
+        if (
+            request.resource_type in PLAYWRIGHT_BLOCKED_RESOURCE_TYPES
+            or is_blocked_capture_host(urlparse(request.url).netloc)
+        ):
+            route.abort()
+        else:
+            route.continue_()
+
+    context.route("**/*", handle_route)
+
+def record_capture_responses(page):
+    recorded = []
+
+    def on_response(response):
+        if response.request.resource_type in PLAYWRIGHT_RECORD_RESOURCE_TYPES and response.status == 200:
+            recorded.append(response)
+
+    page.on("response", on_response)
+    return recorded
+
+def get_render_remaining_ms(deadline):
+    """렌더링 마감까지 남은 시간(ms). 이미 지났으면 TimeoutError를 던집니다."""
+    if deadline is None:
+        return float("inf")
+    remaining_ms = (deadline - time.monotonic()) * 1000
+    if remaining_ms <= 0:
+        raise TimeoutError("Playwright 렌더링 시간이 초과되었습니다.")
+    return remaining_ms
+
+def read_recorded_responses(recorded, deadline=None):
+    """기록된 응답 본문을 읽습니다. sync API 이벤트 핸들러 밖에서 호출해야 합니다."""
+    captured_responses = create_capture_store()
+    try:
+        for response in recorded:
+            get_render_remaining_ms(deadline)
             try:
-                page.wait_for_load_state("networkidle", timeout=10000)
+                body = response.body()
             except Exception:
-                print("⚠️ networkidle 대기 시간 초과, 현재 렌더링 상태로 저장을 계속합니다.")
+                continue
 
-            page.wait_for_timeout(1500)
-            auto_scroll_page(page)
-            prepare_lazy_media(page)
-            html = page.content()
-        finally:
-            if context:
-                context.close()
-            if browser:
-                browser.close()
+            # 큰 응답 하나 때문에 뒤에 오는 작은 스타일시트까지 버리지 않도록 건너뛰기만 합니다.
+            if captured_responses["total_bytes"] + len(body) > PLAYWRIGHT_RECORD_MAX_BYTES:
+                continue
+            put_captured_response(captured_responses, response.url, body, response.headers)
+    except Exception:
+        close_capture_store(captured_responses)
+        raise
+    return captured_responses
+
+def capture_page_with_browser(browser, url, deadline=None):
+    """풀에 유지되는 브라우저에서 요청마다 격리된 새 context로 페이지를 캡처합니다."""
+    context = browser.new_context(
+        viewport={"width": 390, "height": 1200},
+        device_scale_factor=2,
+        is_mobile=True,
+        has_touch=True,
+        locale="ko-KR",
+        user_agent=(
+            "Mozilla/5.0 (Linux; Android 14; Mobile) "
+            "AppleWebKit/537.36 (KHTML, like Gecko) "
+            "Chrome/124.0 Mobile Safari/537.36"
+        )
+    )
 
-    print("✅ Playwright 렌더링 캡처 완료")
-    return html
+    try:
+        block_capture_requests(context)
+        profile = get_scroll_profile(url)
+        page = context.new_page()
+        network = track_page_network(page)
+        recorded = record_capture_responses(page) if PLAYWRIGHT_RECORD_RESPONSES else []
+        page.goto(url, wait_until="domcontentloaded", timeout=min(30000, get_render_remaining_ms(deadline)))
+        initial_timeout_ms = min(profile["initial_timeout_ms"], get_render_remaining_ms(deadline))
+        if not wait_for_page_settle(page, network, profile, initial_timeout_ms):
+            print("⚠️ 초기 렌더링 안정화 대기 시간 초과, 현재 렌더링 상태로 저장을 계속합니다.")
+
+        # 스크롤은 마감 시간 안에서만 진행합니다 (안정화 대기 여유분 포함).
+        profile["max_total_ms"] = min(
+            profile["max_total_ms"],
+            get_render_remaining_ms(deadline) - profile["step_timeout_ms"]
+        )
+        auto_scroll_page(page, network, profile)
+        get_render_remaining_ms(deadline)
+        prepare_lazy_media(page)
+        html = page.content()
+        return html, read_recorded_responses(recorded, deadline)
+    finally:
+        context.close()
+
+def get_scroll_profile(url):
+    host = urlparse(url).netloc.lower()
+    profile = dict(PLAYWRIGHT_SCROLL_PROFILES["default"])
+    for domain, overrides in PLAYWRIGHT_SCROLL_PROFILES.items():
+        if domain != "default" and (host == domain or host.endswith(f".{domain}")):
+            profile.update(overrides)
+            break
+    return profile
 
-def auto_scroll_page(page):
-    page.evaluate(
-        """
-        async () => {
-          const delay = ms => new Promise(resolve => setTimeout(resolve, ms));
-          let previousHeight = 0;
+def track_page_network(page):
+    """진행 중인 네트워크 요청 수를 세어 안정화 판단에 사용합니다."""
+    network = {"inflight": 0}
+
+    def on_request(request):
+        network["inflight"] += 1
 
-          for (let i = 0; i < 24; i += 1) {
-            window.scrollTo(0, document.body.scrollHeight);
-            await delay(700);
+    def on_request_done(request):
+        network["inflight"] = max(0, network["inflight"] - 1)
 
-            const currentHeight = document.body.scrollHeight;
-            if (currentHeight === previousHeight) {
-              break;
+    page.on("request", on_request)
+    page.on("requestfinished", on_request_done)
+    page.on("requestfailed", on_request_done)
+    return network
+
+def wait_for_page_settle(page, network, profile, timeout_ms):
+    """
+    DOM 변경이 quiet_ms 동안 없고, 화면 근처 이미지가 모두 로드되고,
+    진행 중인 요청이 없을 때까지 기다립니다. timeout_ms를 넘기면 그대로 진행합니다.
+    """
+    started_at = time.perf_counter()
+    while True:
+        state = page.evaluate(
+            """
+            () => {
+              if (!window.__archiveSettle) {
+                const settle = { lastMutation: performance.now() };
+                new MutationObserver(() => { settle.lastMutation = performance.now(); })
+                  .observe(document.documentElement, {
+                    childList: true,
+                    subtree: true,
+                    attributes: true,
+                    attributeFilter: ['src', 'srcset', 'style', 'class'],
+                  });
+                window.__archiveSettle = settle;
+              }
+
+              const viewportHeight = window.innerHeight;
+              const pendingImages = Array.from(document.images).filter(img => {
+                if (!img.currentSrc && !img.getAttribute('src')) return false;
+                if (img.complete) return false;
+                const rect = img.getBoundingClientRect();
+                return rect.bottom > -viewportHeight && rect.top < viewportHeight * 2;
+              }).length;
+
+              return {
+                quietMs: performance.now() - window.__archiveSettle.lastMutation,
+                pendingImages,
+              };
             }
-            previousHeight = currentHeight;
-          }
+            """
+        )
+        if (
+            state["quietMs"] >= profile["quiet_ms"]
+            and state["pendingImages"] == 0
+            and network["inflight"] == 0
+        ):
+            return True
 
-          window.scrollTo(0, 0);
-          await delay(500);
-        }
-        """
-    )
+        if (time.perf_counter() - started_at) * 1000 >= timeout_ms:
+            return False
+        page.wait_for_timeout(100)
+
+def auto_scroll_page(page, network, profile):
+    """
+    페이지 끝까지 스크롤하며 지연 로딩 콘텐츠를 불러옵니다.
+    고정 대기 대신 스크롤마다 안정화 조건을 확인하고, 높이가 더 늘지 않으면 멈춥니다.
+    """
+    started_at = time.perf_counter()
+    previous_height = 0
+
+    for _ in range(profile["max_steps"]):
+        current_height = page.evaluate(
+            """
+            () => {
+              window.scrollTo(0, document.body.scrollHeight);
+              return document.body.scrollHeight;
+            }
+            """
+        )
+        remaining_ms = profile["max_total_ms"] - (time.perf_counter() - started_at) * 1000
+        if remaining_ms <= 0:
+            print("⚠️ 스크롤 최대 시간 도달, 현재 상태로 저장을 계속합니다.")
+            break
+
+        wait_for_page_settle(page, network, profile, min(profile["step_timeout_ms"], remaining_ms))
+        settled_height = page.evaluate("() => document.body.scrollHeight")
+        if settled_height == current_height == previous_height:
+            break
+        previous_height = settled_height
+
+    page.evaluate("() => window.scrollTo(0, 0)")
+    wait_for_page_settle(page, network, profile, profile["step_timeout_ms"])
 
 def prepare_lazy_media(page):
     page.evaluate(
@@ -615,7 +1695,225 @@ def prepare_lazy_media(page):
         """
     )
 
-def download_and_convert_to_base64(media_url, base_url):
+MEDIA_MIME_TYPES = {
+    '.gif': 'image/gif',
+    '.jpg': 'image/jpeg',
+    '.jpeg': 'image/jpeg',
+    '.png': 'image/png',
+    '.webp': 'image/webp',
+    '.mp4': 'video/mp4',
+    '.webm': 'video/webm',
+    '.mp3': 'audio/mpeg',
+    '.ogg': 'audio/ogg',
+}
+
+class InlineSizeExceeded(Exception):
+    """
+    미디어가 MEDIA_MAX_INLINE_BYTES를 넘어 data URI로 넣을 수 없을 때 발생합니다.
+    consumed는 스트림에서 이미 읽은 원본 바이트, remaining은 읽던 청크 이터레이터입니다.
+    업로드로 전환할 때 둘을 이어 읽으면 같은 응답을 다시 요청하지 않아도 됩니다.
+    (iter_content 제너레이터를 버리고 새로 만들면 chunked 응답은 연결이 닫혀 나머지를 잃습니다.)
+    """
+
+    def __init__(self, message, consumed=b"", remaining=None):
+        super().__init__(message)
+        self.consumed = consumed
+        self.remaining = remaining
+
+
+def guess_media_content_type(content_type, full_url):
+    if content_type:
+        return content_type
+
+    # 확장자로 MIME 타입 추정
+    ext = os.path.splitext(urlparse(full_url).path)[1].lower()
+    return MEDIA_MIME_TYPES.get(ext, 'application/octet-stream')
+
+def build_data_uri(content, content_type, full_url, max_bytes=None):
+    max_bytes = max_bytes or MEDIA_MAX_INLINE_BYTES
+    if len(content) > max_bytes:
+        raise InlineSizeExceeded(f"{len(content)} bytes")
+
+    base64_data = base64.b64encode(content).decode('ascii')
+    return f"data:{guess_media_content_type(content_type, full_url)};base64,{base64_data}"
+
+def stream_response_to_data_uri(response, full_url, max_bytes=None):
+    """
+    응답 본문을 청크 단위로 바로 base64 인코딩해 data URI를 만듭니다.
+    원본 바이트 전체를 따로 모으지 않으며, 3바이트 경계에 맞지 않는 나머지만 다음 청크로 넘깁니다.
+    인코딩 결과는 접두어부터 버퍼 하나에 바로 쓰고 마지막에 한 번만 문자열로 바꿉니다.
+    한도를 넘으면 응답을 닫지 않고, 그때까지 읽은 원본 바이트와 읽던 이터레이터를 InlineSizeExceeded로 넘깁니다.
+
+    Returns:
+        (data_uri, total_bytes) 튜플. total_bytes는 디코딩된 원본 바이트 수
+    """
+    max_bytes = max_bytes or MEDIA_MAX_INLINE_BYTES
+    content_length = response.headers.get("Content-Length")
+    expected_bytes = int(content_length) if content_length and content_length.isdigit() else 0
+    if expected_bytes > max_bytes:
+        raise InlineSizeExceeded(f"Content-Length {content_length}")
+
+    content_type = guess_media_content_type(response.headers.get("Content-Type", ""), full_url)
+    prefix = f"data:{content_type};base64,".encode("ascii")
+    # Content-Length를 알면 최종 크기만큼 미리 잡고, 다르면 슬라이스 대입이 버퍼를 늘립니다.
+    buffer = bytearray(len(prefix) + (expected_bytes + 2) // 3 * 4)
+    buffer[:len(prefix)] = prefix
+    position = len(prefix)
+
+    remainder = b""
+    total_bytes = 0
+    chunks = response.iter_content(chunk_size=64 * 1024)
+    for chunk in chunks:
+        total_bytes += len(chunk)
+        if total_bytes > max_bytes:
+            # 이미 인코딩한 부분만 되돌리면 되므로 평소 경로에서는 원본 바이트를 따로 들고 있지 않습니다.
+            consumed = base64.b64decode(memoryview(buffer)[len(prefix):position]) + remainder + chunk
+            raise InlineSizeExceeded(f"{total_bytes}+ bytes", consumed, chunks)
+
+        data = remainder + chunk if remainder else chunk
+        aligned_length = len(data) - len(data) % 3
+        encoded = base64.b64encode(data[:aligned_length])
+        buffer[position:position + len(encoded)] = encoded
+        position += len(encoded)
+        remainder = data[aligned_length:]
+
+    if remainder:
+        encoded = base64.b64encode(remainder)
+        buffer[position:position + len(encoded)] = encoded
+        position += len(encoded)
+
+    del buffer[position:]
+    return buffer.decode("ascii"), total_bytes
+
+def download_media_as_data_uri(full_url, referer, max_bytes=None):
+    with get_http_session().get(full_url, headers={"Referer": referer}, timeout=30, stream=True) as response:
+        response.raise_for_status()
+        return stream_response_to_data_uri(response, full_url, max_bytes)[0]
+
+def get_asset_cache_ttl(headers):
+    """
+    응답 헤더로 캐시 가능 여부와 신선도(초)를 결정합니다.
+    자산 캐시는 모든 사용자가 공유하므로 no-store와 private는 저장하지 않고, no-cache는 저장하되 매번 재검증합니다.
+    신선도는 s-maxage, max-age, Expires 순으로 따르며 모두 없으면 기본 TTL을 씁니다.
+
+    Args:
+        headers: 응답 헤더 (대소문자 구분 없는 requests 헤더 또는 Playwright의 소문자 dict)
+    """
+    headers = CaseInsensitiveDict(headers)
+    cache_control = headers.get("Cache-Control", "").lower()
+    directives = [directive.strip() for directive in cache_control.split(",") if directive.strip()]
+    if "no-store" in directives or "private" in directives or any(d.startswith("private=") for d in directives):
+        return False, 0
+    if "no-cache" in directives:
+        return True, 0
+
+    for name in ["s-maxage=", "max-age="]:
+        for directive in directives:
+            if directive.startswith(name):
+                try:
+                    return True, max(0, int(directive.split("=", 1)[1].strip('"')))
+                except ValueError:
+                    # 잘못된 max-age는 이미 만료된 것으로 봅니다.
+                    return True, 0
+
+    expires = headers.get("Expires")
+    if expires is not None:
+        try:
+            expires_at = parsedate_to_datetime(expires)
+            date = parsedate_to_datetime(headers["Date"]) if headers.get("Date") else None
+        except (TypeError, ValueError, IndexError):
+            # "0" 같은 잘못된 Expires 값은 이미 만료된 것으로 취급합니다 (RFC 9111 5.3).
+            return True, 0
+        # 시간대 없는 값(-0000)은 UTC로 해석하고, 서버 시계와의 차이를 피하기 위해 Date가 있으면 Date 기준으로 계산합니다.
+        expires_at = expires_at.replace(tzinfo=expires_at.tzinfo or timezone.utc)
+        origin = date.replace(tzinfo=date.tzinfo or timezone.utc).timestamp() if date is not None else time.time()
+        return True, max(0, int(expires_at.timestamp() - origin))
+
+    return True, ASSET_CACHE_DEFAULT_TTL_SECONDS
+
+def store_captured_asset(full_url, body, meta):
+    """
+    캡처된 자산을 캐시에 채웁니다.
+    같은 사이트를 저장할 때마다 같은 CSS/폰트가 다시 캡처되므로,
+    본문 해시나 검증자(ETag/Last-Modified)가 그대로면 본문 쓰기를 건너뛰고
+    만료된 항목의 신선도만 연장합니다.
+    """
+    existing = cache_peek_meta(ASSET_CACHE, full_url)
+    if existing:
+        same_body = existing.get("sha256") == meta["sha256"]
+        same_validator = (
+            (meta["etag"] and existing.get("etag") == meta["etag"])
+            or (not meta["etag"] and meta["last_modified"] and existing.get("last_modified") == meta["last_modified"])
+        )
+        if same_body or same_validator:
+            if existing.get("expires_at", 0) < meta["expires_at"] - 60:
+                cache_update_meta(ASSET_CACHE, full_url, dict(existing, expires_at=meta["expires_at"]))
+            return
+
+    cache_put(ASSET_CACHE, full_url, body, meta)
+
+def fetch_cached_asset(full_url, referer, captured_responses=None):
+    """
+    CSS 및 CSS 하위 자산을 절대 URL 기준으로 캐시에서 가져옵니다.
+    만료된 항목은 ETag/Last-Modified 조건부 요청으로 재검증합니다.
+    Playwright 캡처 중 브라우저가 이미 받은 응답이 있으면 네트워크 요청 없이 사용하고 캐시에도 채웁니다.
+
+    Returns:
+        (본문 바이트, 메타데이터 dict)
+    """
+    now = time.time()
+    captured = get_captured_response(captured_responses, full_url)
+    if captured:
+        body, headers = captured
+        storable, ttl = get_asset_cache_ttl(headers)
+        meta = {
+            "content_type": headers.get("content-type", ""),
+            "encoding": get_encoding_from_headers(headers) or "utf-8",
+            "etag": headers.get("etag"),
+            "last_modified": headers.get("last-modified"),
+            "sha256": hashlib.sha256(body).hexdigest(),
+            "expires_at": now + ttl,
+        }
+        if storable:
+            store_captured_asset(full_url, body, meta)
+        return body, meta
+
+    cached = cache_get(ASSET_CACHE, full_url)
+    if cached and cached[1]["expires_at"] > now:
+        return cached
+
+    headers = {"Referer": referer}
+    if cached:
+        if cached[1].get("etag"):
+            headers["If-None-Match"] = cached[1]["etag"]
+        if cached[1].get("last_modified"):
+            headers["If-Modified-Since"] = cached[1]["last_modified"]
+
+    response = get_http_session().get(full_url, headers=headers, timeout=30)
+    storable, ttl = get_asset_cache_ttl(response.headers)
+
+    if response.status_code == 304 and cached:
+        body, meta = cached
+        meta = dict(meta, expires_at=now + ttl)
+        if storable:
+            cache_update_meta(ASSET_CACHE, full_url, meta)
+        return body, meta
+
+    response.raise_for_status()
+    body = response.content
+    meta = {
+        "content_type": response.headers.get("Content-Type", ""),
+        "encoding": response.encoding or "utf-8",
+        "etag": response.headers.get("ETag"),
+        "last_modified": response.headers.get("Last-Modified"),
+        "sha256": hashlib.sha256(body).hexdigest(),
+        "expires_at": now + ttl,
+    }
+    if storable:
+        cache_put(ASSET_CACHE, full_url, body, meta)
+    return body, meta
+
+def download_and_convert_to_base64(media_url, base_url, use_asset_cache=False, captured_responses=None):
     """
     미디어 파일을 다운로드하고 base64로 인코딩하여 data URI를 반환합니다.
     HTML에 직접 포함시켜 외부 링크 의존성을 제거합니다.
@@ -623,62 +1921,37 @@ def download_and_convert_to_base64(media_url, base_url):
     Args:
         media_url: 미디어 파일의 URL (상대 또는 절대)
         base_url: 기본 URL (상대 URL을 절대 URL로 변환하기 위함)
+        use_asset_cache: True이면 공용 자산 캐시를 사용 (CSS 폰트/배경 등)
+        captured_responses: Playwright 캡처에서 기록한 응답 (use_asset_cache일 때 우선 사용)
     
     Returns:
         data URI 문자열 (예: "data:image/gif;base64,...") 또는 None (실패 시)
     """
     try:
         full_url = urljoin(base_url, media_url)
-        parsed_url = urlparse(full_url)
-        
-        # 파일 다운로드
-        response = requests.get(full_url, headers={"Referer": base_url}, timeout=30, stream=True)
-        response.raise_for_status()
-        
-        # 파일 내용 읽기
-        content = b""
-        for chunk in response.iter_content(chunk_size=8192):
-            content += chunk
-        
-        # MIME 타입 결정
-        content_type = response.headers.get('Content-Type', '')
-        if not content_type:
-            # 확장자로 MIME 타입 추정
-            ext = os.path.splitext(parsed_url.path)[1].lower()
-            mime_types = {
-                '.gif': 'image/gif',
-                '.jpg': 'image/jpeg',
-                '.jpeg': 'image/jpeg',
-                '.png': 'image/png',
-                '.webp': 'image/webp',
-                '.mp4': 'video/mp4',
-                '.webm': 'video/webm',
-                '.mp3': 'audio/mpeg',
-                '.ogg': 'audio/ogg',
-            }
-            content_type = mime_types.get(ext, 'application/octet-stream')
-        
-        # base64 인코딩
-        base64_data = base64.b64encode(content).decode('utf-8')
-        data_uri = f"data:{content_type};base64,{base64_data}"
-        
-        return data_uri
+
+        if use_asset_cache:
+            content, meta = fetch_cached_asset(full_url, base_url, captured_responses)
+            return build_data_uri(content, meta["content_type"], full_url)
+
+        return download_media_as_data_uri(full_url, base_url)
+    except InlineSizeExceeded as e:
+        print(f"ℹ️ 인라인 크기 제한 초과로 원본 링크 유지: {media_url} ({e})")
+        return None
     except Exception as e:
         print(f"❌ 미디어 다운로드 및 변환 실패: {media_url}, {e}")
         return None
 
-def download_text_resource(resource_url, base_url):
+def download_text_resource(resource_url, base_url, captured_responses=None):
     try:
         full_url = urljoin(base_url, resource_url)
-        response = requests.get(full_url, headers={"Referer": base_url}, timeout=30)
-        response.raise_for_status()
-        response.encoding = response.encoding or "utf-8"
-        return response.text, full_url
+        body, meta = fetch_cached_asset(full_url, base_url, captured_responses)
+        return body.decode(meta["encoding"], errors="replace"), full_url
     except Exception as e:
         print(f"❌ 텍스트 리소스 다운로드 실패: {resource_url}, {e}")
         return None, None
 
-def inline_css_url_assets(css_text, css_url, page_url):
+def inline_css_url_assets(css_text, css_url, page_url, captured_responses=None):
     def replace_url(match):
         raw_value = match.group(1).strip()
         asset_url = raw_value.strip("\"'")
@@ -691,7 +1964,12 @@ def inline_css_url_assets(css_text, css_url, page_url):
         ):
             return match.group(0)
 
-        data_uri = download_and_convert_to_base64(asset_url, css_url or page_url)
+        data_uri = download_and_convert_to_base64(
+            asset_url,
+            css_url or page_url,
+            use_asset_cache=True,
+            captured_responses=captured_responses
+        )
         if not data_uri:
             return match.group(0)
 
@@ -699,26 +1977,32 @@ def inline_css_url_assets(css_text, css_url, page_url):
 
     return re.sub(r"url\(([^)]+)\)", replace_url, css_text)
 
-def inline_stylesheets(soup, page_url):
+def inline_stylesheets(soup, page_url, captured_responses=None, links=None):
     print("🎨 CSS 인라인 처리 중...")
-    for link in list(soup.find_all("link")):
+    if links is None:
+        links = list(soup.find_all("link"))
+
+    for link in links:
         rel_values = [value.lower() for value in link.get("rel", [])]
         href = link.get("href")
 
         if "stylesheet" not in rel_values or not href:
             continue
 
-        css_text, css_url = download_text_resource(href, page_url)
+        css_text, css_url = download_text_resource(href, page_url, captured_responses)
         if not css_text:
             link["href"] = urljoin(page_url, href)
             continue
 
-        css_text = inline_css_url_assets(css_text, css_url, page_url)
+        css_text = inline_css_url_assets(css_text, css_url, page_url, captured_responses)
         style_tag = soup.new_tag("style")
         style_tag.string = css_text
         link.replace_with(style_tag)
         print(f"✅ CSS 인라인 완료: {href}")
 
+    stats = cache_stats(ASSET_CACHE)
+    print(f"ℹ️ CSS 자산 캐시: hit {stats['hits']}, miss {stats['misses']}, {stats['bytes'] // 1024}KB")
+
 def rewrite_dropbox_media_links(html):
     def replace_link(match):
         url = match.group(0)
@@ -746,6 +2030,196 @@ def rewrite_archive_media_origin_links(html):
         html
     )
 
+def stamp_archive_pipeline(soup):
+    meta = soup.new_tag("meta")
+    meta["name"] = ARCHIVE_PIPELINE_META_NAME
+    meta["content"] = str(ARCHIVE_PIPELINE_VERSION)
+    if soup.head:
+        soup.head.insert(0, meta)
+    else:
+        soup.insert(0, meta)
+
+def iter_archive_html(soup):
+    """
+    soup를 조각 단위로 직렬화합니다. 조각을 이어 붙이면 str(soup)와 같습니다.
+    자식 태그가 있는 요소는 ARCHIVE_STREAM_MAX_DEPTH 깊이까지 여는 태그, 자식, 닫는 태그로 나눠
+    큰 문서도 한 번에 하나의 문자열로 만들지 않습니다.
+    """
+    def render(node, depth):
+        if not isinstance(node, Tag):
+            yield node.output_ready()
+            return
+
+        if depth >= ARCHIVE_STREAM_MAX_DEPTH or node.prefix or not any(
+            isinstance(child, Tag) for child in node.contents
+        ):
+            yield node.decode()
+            return
+
+        # 자식 없는 복사본으로 여는 태그만 직렬화합니다 (속성 포맷은 원본과 같습니다).
+        shell = soup.new_tag(node.name, attrs=dict(node.attrs))
+        if shell.is_empty_element:
+            yield node.decode()
+            return
+
+        yield str(shell)[:-len(f"</{node.name}>")]
+        for child in node.contents:
+            yield from render(child, depth + 1)
+        yield f"</{node.name}>"
+
+    for child in soup.contents:
+        yield from render(child, 0)
+
+def get_archive_pipeline_version(html_bytes):
+    """뷰어용으로 변환된 아카이브면 파이프라인 버전을, 예전 아카이브면 None을 반환합니다."""
+    match = ARCHIVE_PIPELINE_STAMP_PATTERN.search(html_bytes, 0, ARCHIVE_PIPELINE_STAMP_WINDOW)
+    return int(match.group(1)) if match else None
+
+def is_current_archive_pipeline(body, encoding=None):
+    """저장본(압축본이면 앞부분만 풀어서)이 현재 ARCHIVE_PIPELINE_VERSION으로 변환되었는지 확인합니다."""
+    if encoding:
+        body = decompress_prefix(body, encoding, ARCHIVE_PIPELINE_STAMP_WINDOW)
+    version = get_archive_pipeline_version(body)
+    return version is not None and version >= ARCHIVE_PIPELINE_VERSION
+
+def render_legacy_archive(html_bytes):
+    """
+    표시가 없거나 예전 버전으로 변환된 아카이브에 현재 조회용 후처리를 적용하고 버전 표시를 붙입니다.
+    예전 버전 표시는 지워 버전 표시가 하나만 남게 합니다.
+    """
+    html = html_bytes.decode("utf-8", errors="replace")
+    html = rewrite_archive_media_origin_links(html)
+    soup = parse_html(html)
+    for stamp in soup.find_all("meta", attrs={"name": ARCHIVE_PIPELINE_META_NAME}):
+        stamp.decompose()
+    add_archive_media_fallbacks(soup)
+    stamp_archive_pipeline(soup)
+    return str(soup).encode("utf-8")
+
+def migrate_legacy_archive(dropbox_path, encoding, rev, body):
+    """
+    변환한 아카이브를 원래 저장 경로에 같은 압축 방식으로 덮어씁니다.
+    rev가 바뀌었으면(그 사이 다른 곳에서 수정) 덮어쓰지 않습니다.
+    """
+    storage_path = f"{dropbox_path}{ENCODING_SUFFIXES[encoding]}" if encoding else dropbox_path
+    try:
+        metadata = get_dropbox_client().files_upload(
+            body,
+            storage_path,
+            mode=dropbox.files.WriteMode.update(rev)
+        )
+        # 내용은 같으므로 캐시만 새 rev로 옮겨 다음 조회에서 다시 받지 않게 합니다.
+        cache_put(
+            ARCHIVE_CACHE,
+            dropbox_path,
+            body,
+            {
+                "rev": metadata.rev,
+                "checked_at": time.time(),
+                "encoding": encoding,
+                "pipeline": ARCHIVE_PIPELINE_VERSION,
+            }
+        )
+        print(f"✅ 예전 아카이브 변환 저장 완료: {storage_path}")
+    except Exception as e:
+        print(f"⚠️ 예전 아카이브 변환 저장 실패: {dropbox_path}, {e}")
+    finally:
+        with ARCHIVE_MIGRATIONS_LOCK:
+            ARCHIVE_MIGRATIONS_IN_PROGRESS.discard(dropbox_path)
+
+def schedule_legacy_archive_migration(dropbox_path, encoding, rev, body):
+    """조회 응답을 막지 않도록 백그라운드에서 한 번만 덮어씁니다."""
+    if not ARCHIVE_LAZY_MIGRATION:
+        return
+
+    with ARCHIVE_MIGRATIONS_LOCK:
+        if dropbox_path in ARCHIVE_MIGRATIONS_IN_PROGRESS:
+            return
+        ARCHIVE_MIGRATIONS_IN_PROGRESS.add(dropbox_path)
+
+    threading.Thread(
+        target=migrate_legacy_archive,
+        args=(dropbox_path, encoding, rev, body),
+        name="archive-migration",
+        daemon=True,
+    ).start()
+
+def get_archive_storage_paths(dropbox_path):
+    """아카이브가 저장되어 있을 수 있는 (경로, Content-Encoding) 후보를 현재 설정 우선으로 나열합니다."""
+    encodings = [ARCHIVE_STORAGE_ENCODING, None] + [
+        encoding for encoding in ENCODING_SUFFIXES if encoding != ARCHIVE_STORAGE_ENCODING
+    ]
+    return [
+        (f"{dropbox_path}{ENCODING_SUFFIXES[encoding]}" if encoding else dropbox_path, encoding)
+        for encoding in dict.fromkeys(encodings)
+    ]
+
+def is_dropbox_not_found(error):
+    return (
+        isinstance(error, dropbox.exceptions.ApiError)
+        and getattr(error.error, "is_path", lambda: False)()
+        and error.error.get_path().is_not_found()
+    )
+
+def download_archive_html(dbx, dropbox_path):
+    for storage_path, encoding in get_archive_storage_paths(dropbox_path):
+        try:
+            metadata, response = dbx.files_download(storage_path)
+            return metadata, response.content, encoding
+        except Exception as e:
+            if not is_dropbox_not_found(e):
+                raise
+    raise FileNotFoundError(f"아카이브를 찾을 수 없습니다: {dropbox_path}")
+
+def load_archive_html(dropbox_path):
+    """
+    조회용 아카이브 HTML을 캐시 또는 Dropbox에서 가져옵니다.
+    캐시 항목은 ARCHIVE_CACHE_REVALIDATE_SECONDS마다 Dropbox rev로 검증하고,
+    다른 파이프라인 버전으로 캐시된 항목(디스크 계층에 남은 이전 버전 등)은 쓰지 않습니다.
+    압축 저장된 아카이브는 압축된 그대로 캐시하고 반환합니다.
+
+    Returns:
+        (body, rev, encoding) 튜플. encoding은 body의 Content-Encoding 또는 None
+    """
+    now = time.time()
+    cached = cache_get(ARCHIVE_CACHE, dropbox_path)
+    if cached and cached[1].get("pipeline") == ARCHIVE_PIPELINE_VERSION:
+        body, meta = cached
+        encoding = meta.get("encoding")
+        if now - meta["checked_at"] < ARCHIVE_CACHE_REVALIDATE_SECONDS:
+            return body, meta["rev"], encoding
+
+        storage_path = f"{dropbox_path}{ENCODING_SUFFIXES[encoding]}" if encoding else dropbox_path
+        try:
+            metadata = get_dropbox_client().files_get_metadata(storage_path)
+        except Exception as e:
+            if not is_dropbox_not_found(e):
+                raise
+            metadata = None
+        if metadata is not None and metadata.rev == meta["rev"]:
+            cache_update_meta(ARCHIVE_CACHE, dropbox_path, dict(meta, checked_at=now))
+            return body, metadata.rev, encoding
+
+    metadata, body, encoding = download_archive_html(get_dropbox_client(), dropbox_path)
+
+    # 현재 버전으로 후처리된 아카이브는 그대로 내려보내고, 표시가 없거나 낮은 버전이면 다시 변환합니다.
+    if not is_current_archive_pipeline(body, encoding):
+        html_bytes = render_legacy_archive(decompress_bytes(body, encoding) if encoding else body)
+        body = compress_bytes(html_bytes, encoding) if encoding else html_bytes
+        schedule_legacy_archive_migration(dropbox_path, encoding, metadata.rev, body)
+
+    cache_put(
+        ARCHIVE_CACHE,
+        dropbox_path,
+        body,
+        {"rev": metadata.rev, "checked_at": now, "encoding": encoding, "pipeline": ARCHIVE_PIPELINE_VERSION}
+    )
+    return body, metadata.rev, encoding
+
+def get_archive_etag(rev, encoding=None):
+    etag = f"{rev}-p{ARCHIVE_PIPELINE_VERSION}"
+    return f"{etag}-{encoding}" if encoding else etag
+
 def strip_archive_scripts(soup):
     for script in soup.find_all("script"):
         script.decompose()
@@ -775,14 +2249,83 @@ def media_source_type(media_name, src):
         return "video/quicktime"
     return "video/mp4"
 
-def insert_native_media_blocks(soup):
+def iter_archive_tags(soup):
+    """
+    find_all(True)과 같은 문서 순서로 태그를 돌려주면서 조상 정보를 함께 넘깁니다.
+    조상마다 find_parent로 다시 거슬러 올라가지 않도록 순회하면서 전달합니다.
+
+    Yields:
+        (node, ancestors) 튜플. ancestors는 가장 가까운
+        (video/audio/picture, video/audio, .auto_media_wrapper, .mejs__container) 조상이며 없으면 None입니다.
+    """
+    root_ancestors = (None, None, None, None)
+    stack = [(child, root_ancestors) for child in reversed(soup.contents) if isinstance(child, Tag)]
+    while stack:
+        node, ancestors = stack.pop()
+        yield node, ancestors
+
+        children = [child for child in node.contents if isinstance(child, Tag)]
+        if not children:
+            continue
+
+        container, media, media_wrapper, player_wrapper = ancestors
+        if node.name in ["video", "audio"]:
+            container = media = node
+        elif node.name == "picture":
+            container = node
+        classes = node.get("class") or []
+        if "auto_media_wrapper" in classes:
+            media_wrapper = node
+        if "mejs__container" in classes:
+            player_wrapper = node
+
+        child_ancestors = (container, media, media_wrapper, player_wrapper)
+        for child in reversed(children):
+            stack.append((child, child_ancestors))
+
+def create_archive_media_index():
+    return {"entries": [], "by_node": {}, "unlinked": {}}
+
+def index_archive_media(media_index, node, ancestors):
+    """
+    iter_archive_tags가 돌려준 태그를 video/audio 항목 목록에 반영합니다.
+    항목에는 뷰어용 후처리에 필요한 하위 source, 숨길 원본 래퍼, 뒤따르는 원본 링크 여부를 모읍니다.
+    """
+    name = node.name
+    if name in ["video", "audio"]:
+        entry = {
+            "node": node,
+            "sources": [],
+            "target": ancestors[2] or ancestors[3] or node,
+            "has_link": False,
+        }
+        media_index["entries"].append(entry)
+        media_index["by_node"][id(node)] = entry
+        media_index["unlinked"].setdefault(id(node.parent), []).append(entry)
+    elif name == "source":
+        if ancestors[1] is not None:
+            media_index["by_node"][id(ancestors[1])]["sources"].append(node)
+    elif name == "a" and "archive-media-link" in (node.get("class") or []):
+        # 앞선 형제 미디어에는 이미 원본 링크가 뒤따르므로 새로 붙이지 않습니다.
+        for entry in media_index["unlinked"].pop(id(node.parent), []):
+            entry["has_link"] = True
+
+def collect_archive_media(soup):
+    media_index = create_archive_media_index()
+    for node, ancestors in iter_archive_tags(soup):
+        index_archive_media(media_index, node, ancestors)
+    return media_index["entries"]
+
+def insert_native_media_blocks(soup, media_entries):
+    """원본 플레이어 앞에 기본 video/audio 블록을 넣고 새로 만든 미디어 항목 목록을 반환합니다."""
     seen_sources = set()
+    native_media = []
 
-    for media in list(soup.find_all(["video", "audio"])):
+    for entry in media_entries:
+        media = entry["node"]
         media_src = media.get("src")
         if not media_src:
-            first_source = media.find("source")
-            media_src = first_source.get("src") if first_source else None
+            media_src = entry["sources"][0].get("src") if entry["sources"] else None
 
         if not media_src or media_src in seen_sources:
             continue
@@ -807,13 +2350,14 @@ def insert_native_media_blocks(soup):
         source["type"] = media_source_type(media.name, media_src)
         clean_media.append(source)
         wrapper.append(clean_media)
+        native_media.append({"node": clean_media, "sources": [source], "target": wrapper, "has_link": True})
 
         link = soup.new_tag("a", href=media_src, target="_blank", rel="noopener")
         link["class"] = "archive-media-link"
         link.string = "영상 파일 열기" if media.name == "video" else "오디오 파일 열기"
         wrapper.append(link)
 
-        target = media.find_parent(class_="auto_media_wrapper") or media.find_parent(class_="mejs__container") or media
+        target = entry["target"]
         target.insert_before(wrapper)
 
         if target is not media:
@@ -821,9 +2365,21 @@ def insert_native_media_blocks(soup):
         else:
             media["class"] = media.get("class", []) + ["archive-original-media-hidden"]
 
-def add_archive_media_fallbacks(soup):
-    strip_archive_scripts(soup)
-    insert_native_media_blocks(soup)
+    return native_media
+
+def add_archive_media_fallbacks(soup, media=None):
+    """
+    아카이브 뷰어용 미디어 대체 블록과 스타일을 추가합니다.
+
+    Args:
+        soup: 처리할 문서
+        media: scan_archive_document가 모은 video/audio 항목 목록.
+            주어지면 스크립트 제거와 미디어 탐색을 이미 끝낸 문서로 보고 트리를 다시 훑지 않습니다.
+    """
+    if media is None:
+        strip_archive_scripts(soup)
+        media = collect_archive_media(soup)
+    native_media = insert_native_media_blocks(soup, media)
 
     style = soup.new_tag("style")
     style.string = """
@@ -867,7 +2423,8 @@ def add_archive_media_fallbacks(soup):
     else:
         soup.insert(0, style)
 
-    for media in soup.find_all(["video", "audio"]):
+    for entry in media + native_media:
+        media = entry["node"]
         media["controls"] = ""
         media["preload"] = "metadata"
         media["playsinline"] = ""
@@ -875,12 +2432,13 @@ def add_archive_media_fallbacks(soup):
         media.attrs.pop("data-autoplay", None)
 
         media_src = media.get("src")
-        if media_src and not media.find("source"):
+        if media_src and not entry["sources"]:
             source = soup.new_tag("source", src=media_src)
             source["type"] = "video/mp4" if media.name == "video" else "audio/mpeg"
             media.append(source)
+            entry["sources"].append(source)
 
-        for source in media.find_all("source"):
+        for source in entry["sources"]:
             source_src = source.get("src", "")
             if source_src.endswith(".mp4") or ".mp4?" in source_src:
                 source["type"] = "video/mp4"
@@ -893,16 +2451,87 @@ def add_archive_media_fallbacks(soup):
 
         link_src = media.get("src")
         if not link_src:
-            first_source = media.find("source")
-            link_src = first_source.get("src") if first_source else None
+            link_src = entry["sources"][0].get("src") if entry["sources"] else None
 
-        if link_src and not media.find_next_sibling("a", class_="archive-media-link"):
+        if link_src and not entry["has_link"]:
             link = soup.new_tag("a", href=link_src, target="_blank", rel="noopener")
             link["class"] = "archive-media-link"
             link.string = "영상 파일 열기" if media.name == "video" else "오디오 파일 열기"
             media.insert_after(link)
+            entry["has_link"] = True
+
+def create_inline_budget(limit_bytes=None):
+    """아카이브 한 개의 base64 인라인 예산과 배치 결과 통계를 담는 dict를 만듭니다."""
+    return {
+        "limit": ARCHIVE_INLINE_BUDGET_BYTES if limit_bytes is None else limit_bytes,
+        "inline_bytes": 0,
+        "inline_count": 0,
+        "upload_bytes": 0,
+        "upload_count": 0,
+        "lock": threading.Lock(),
+    }
+
+def decide_media_placement(media_type, content_type, size, inline_budget):
+    """
+    미디어를 HTML에 인라인할지 스토리지에 업로드할지 결정합니다.
 
-def download_and_save_media(media_url, base_url, media_type="media", use_base64=True, storage_config=None):
+    Returns:
+        인라인할 수 있는 최대 바이트 수. 0이면 업로드해야 합니다.
+        반환한 바이트 수만큼 예산을 미리 차감하므로, 동시에 받는 미디어가 함께 한도를 넘지 않습니다.
+        실제 크기가 정해지면 record_media_placement로 남는 예약분을 돌려받고,
+        인라인하지 못하면 release_media_reservation으로 전부 돌려놓아야 합니다.
+    """
+    if media_type in ["videos", "audio"]:
+        return 0
+
+    main_type = (content_type or "").split("/", 1)[0].lower()
+    if main_type in ["video", "audio"]:
+        return 0
+
+    if size is not None and size > MEDIA_MAX_INLINE_BYTES:
+        return 0
+
+    if inline_budget is None:
+        return MEDIA_MAX_INLINE_BYTES
+
+    with inline_budget["lock"]:
+        remaining = inline_budget["limit"] - inline_budget["inline_bytes"]
+        # 크기를 모르면 파일 하나의 최대 인라인 크기만큼 예약합니다.
+        reservation = min(MEDIA_MAX_INLINE_BYTES, remaining) if size is None else size
+        if reservation <= 0 or reservation > remaining:
+            return 0
+        inline_budget["inline_bytes"] += reservation
+        inline_budget["inline_count"] += 1
+        return reservation
+
+def record_media_placement(inline_budget, placement, size, reserved=0):
+    """
+    미디어 배치 결과를 기록합니다.
+    reserved는 decide_media_placement가 예약한 바이트 수로, 실제 크기와의 차이를 예산에 돌려놓습니다.
+    """
+    if inline_budget is None:
+        return
+
+    with inline_budget["lock"]:
+        if placement == "inline":
+            if reserved:
+                inline_budget["inline_bytes"] -= reserved - size
+            else:
+                inline_budget["inline_bytes"] += size
+                inline_budget["inline_count"] += 1
+        else:
+            inline_budget["upload_bytes"] += size
+            inline_budget["upload_count"] += 1
+
+def release_media_reservation(inline_budget, size):
+    if inline_budget is None:
+        return
+
+    with inline_budget["lock"]:
+        inline_budget["inline_bytes"] -= size
+        inline_budget["inline_count"] -= 1
+
+def download_and_save_media(media_url, base_url, media_type="media", use_base64=True, storage_config=None, captured_responses=None, inline_budget=None):
     """
     미디어 파일을 다운로드하고 처리합니다.
     
@@ -910,48 +2539,331 @@ def download_and_save_media(media_url, base_url, media_type="media", use_base64=
         media_url: 미디어 파일의 URL (상대 또는 절대)
         base_url: 기본 URL (상대 URL을 절대 URL로 변환하기 위함)
         media_type: 미디어 타입 ("videos", "images", "audio" 등)
-        use_base64: True이면 base64로 인코딩하여 반환, False이면 사용자 저장소 링크 반환
+        use_base64: True이면 크기/타입/인라인 예산이 허용하는 한 base64로 인코딩하여 반환,
+            False이면 사용자 저장소 링크 반환
         storage_config: 사용자 스토리지 설정 딕셔너리
+        captured_responses: Playwright 캡처 응답 저장소. 있으면 원본 서버 대신 먼저 사용합니다.
+        inline_budget: create_inline_budget()으로 만든 아카이브 단위 인라인 예산 (선택)
     
     Returns:
         data URI 또는 저장소의 파일 링크 URL 또는 None (실패 시)
     """
-    if use_base64:
-        # base64로 인코딩하여 반환 (HTML에 직접 포함)
-        return download_and_convert_to_base64(media_url, base_url)
-    
-    if not storage_config:
-        print("⚠️ storage_config가 누락되어 미디어를 업로드할 수 없습니다.")
-        return None
-        
+    full_url = urljoin(base_url, media_url)
+    captured = get_captured_response(captured_responses, full_url)
+    response = None
+    # 인라인을 시도하다 한도를 넘은 경우 이미 받은 앞부분과 읽던 청크 이터레이터
+    prefetched = b""
+    remaining_chunks = None
+
     try:
-        full_url = urljoin(base_url, media_url)
-        parsed_url = urlparse(full_url)
+        if captured:
+            media_bytes, headers = captured
+            response_content_type = headers.get("content-type", "")
+            size = len(media_bytes)
+        else:
+            # 파일 다운로드
+            response = get_http_session().get(full_url, headers={"Referer": base_url}, timeout=30, stream=True)
+            response.raise_for_status()
+            response_content_type = response.headers.get("Content-Type", "")
+            content_length = response.headers.get("Content-Length", "")
+            size = int(content_length) if content_length.isdigit() else None
+
+        if use_base64:
+            # 인라인이 허용되면 base64로 인코딩하여 반환 (HTML에 직접 포함)
+            max_inline_bytes = decide_media_placement(media_type, response_content_type, size, inline_budget)
+            if max_inline_bytes:
+                reserved = max_inline_bytes if inline_budget is not None else 0
+                try:
+                    if captured:
+                        data_uri = build_data_uri(media_bytes, response_content_type, full_url, max_inline_bytes)
+                        inline_size = len(media_bytes)
+                    else:
+                        data_uri, inline_size = stream_response_to_data_uri(response, full_url, max_inline_bytes)
+                    record_media_placement(inline_budget, "inline", inline_size, reserved)
+                    return data_uri
+                except InlineSizeExceeded as e:
+                    # 너무 큰 파일은 HTML에 넣지 않고 스토리지 업로드로 전환합니다.
+                    if reserved:
+                        release_media_reservation(inline_budget, reserved)
+                    print(f"ℹ️ 인라인 크기 제한 초과, 스토리지에 업로드합니다: {media_url} ({e})")
+                    if not captured:
+                        prefetched = e.consumed
+                        remaining_chunks = e.remaining
+                except Exception:
+                    if reserved:
+                        release_media_reservation(inline_budget, reserved)
+                    raise
         
+        if not storage_config:
+            print("⚠️ storage_config가 누락되어 미디어를 업로드할 수 없습니다.")
+            return None
+
         # 파일명 추출
-        original_filename = os.path.basename(parsed_url.path)
-        
-        # 파일 다운로드
-        response = requests.get(full_url, headers={"Referer": base_url}, timeout=30, stream=True)
-        response.raise_for_status()
-        
-        media_bytes = b"".join(response.iter_content(chunk_size=8192))
+        original_filename = os.path.basename(urlparse(full_url).path)
+
+        if captured:
+            content_hash = hashlib.sha256(media_bytes).hexdigest() if MEDIA_CONTENT_ADDRESSED else None
+        else:
+            # 다운로드하면서 해시를 함께 계산합니다.
+            digest = hashlib.sha256(prefetched)
+            chunks = [prefetched] if prefetched else []
+            for chunk in remaining_chunks or response.iter_content(chunk_size=64 * 1024):
+                digest.update(chunk)
+                chunks.append(chunk)
+            media_bytes = b"".join(chunks)
+            content_hash = digest.hexdigest() if MEDIA_CONTENT_ADDRESSED else None
+
         filename = build_media_filename(
             media_type,
             source_url=full_url,
             original_filename=original_filename,
-            content_type=response.headers.get("Content-Type", "")
+            content_type=response_content_type,
+            content_hash=content_hash
         )
-        content_type = response.headers.get("Content-Type", "application/octet-stream")
-        
+        content_type = response_content_type or "application/octet-stream"
+        record_media_placement(inline_budget, "upload", len(media_bytes))
+
+        if content_hash:
+            return store_content_addressed_media(
+                media_bytes, content_hash, media_type, filename, content_type, storage_config
+            )
         return upload_file_to_user_storage(media_bytes, media_type, filename, content_type, storage_config)
     except Exception as e:
         print(f"❌ 미디어 다운로드 실패 ({media_type}): {media_url}, {e}")
         return None
+    finally:
+        if response is not None:
+            response.close()
+
+def get_media_host_semaphore(full_url):
+    host = urlparse(full_url).netloc.lower()
+    with MEDIA_HOST_SEMAPHORES_LOCK:
+        semaphore = MEDIA_HOST_SEMAPHORES.get(host)
+        if semaphore is None:
+            semaphore = threading.BoundedSemaphore(MEDIA_FETCH_PER_HOST_LIMIT)
+            MEDIA_HOST_SEMAPHORES[host] = semaphore
+    return semaphore
+
+def parse_srcset(srcset):
+    candidates = []
+    for part in srcset.split(","):
+        part = part.strip()
+        if not part:
+            continue
+        parts = part.split()
+        descriptor = " ".join(parts[1:]) if len(parts) > 1 else ""
+        candidates.append((part, parts[0], descriptor))
+    return candidates
+
+def normalize_media_url(media_url, base_url):
+    return urldefrag(urljoin(base_url, media_url.strip()))[0]
+
+def scan_archive_document(soup, base_url):
+    """
+    문서를 한 번만 순회하면서 저장에 필요한 재작성과 수집을 함께 처리합니다.
+    상대 URL 절대화, 스크립트/on* 속성/javascript: 링크 제거를 적용하고
+    스타일시트 link, 미디어 참조, 뷰어용 후처리에 쓸 video/audio 항목을 모읍니다.
+    조상 정보는 순회하면서 넘기므로 노드마다 find_parent/find_all로 트리를 다시 훑지 않습니다.
+    같은 URL이 src, data-src, srcset 등에 여러 번 등장해도 다운로드 작업은 한 번만 만듭니다.
+
+    Returns:
+        stylesheets: rel=stylesheet link 노드 목록
+        media_references: 문서 순서대로 정렬된 속성 단위 참조 목록 (재작성에 사용)
+        media_table: 아카이브 단위 URL 해석 테이블
+            jobs: (full_url, media_type, use_base64) 다운로드 작업 목록
+            index: 정규화된 작업 키 -> jobs 인덱스
+            hits: 중복으로 건너뛴 참조 수
+        media: 문서 순서대로 정렬된 video/audio 항목 목록 (add_archive_media_fallbacks에 넘깁니다)
+    """
+    references = []
+    media_table = {"jobs": [], "index": {}, "hits": 0}
+    stylesheets = []
+    media_index = create_archive_media_index()
+    scripts = []
+
+    def add_job(media_url, media_type, use_base64):
+        if media_url.strip().lower().startswith("data:"):
+            return None
+
+        key = (normalize_media_url(media_url, base_url), media_type, use_base64)
+        job = media_table["index"].get(key)
+        if job is not None:
+            media_table["hits"] += 1
+            return job
+
+        media_table["jobs"].append(key)
+        media_table["index"][key] = len(media_table["jobs"]) - 1
+        return media_table["index"][key]
+
+    def add_src(node, attr, media_type, use_base64, kind="src"):
+        value = node.get(attr)
+        if value:
+            references.append({
+                "node": node,
+                "attr": attr,
+                "kind": kind,
+                "media_type": media_type,
+                "source": value,
+                "job": add_job(value, media_type, use_base64),
+            })
+
+    def add_lazy(node, media_type, use_base64):
+        for lazy_attr in LAZY_MEDIA_ATTRS:
+            add_src(node, lazy_attr, media_type, use_base64, kind="lazy")
+
+    def add_srcset(node, media_type):
+        srcset = node.get("srcset")
+        if not srcset:
+            return
+        candidates = [
+            (part, image_url, descriptor, add_job(image_url, media_type, True))
+            for part, image_url, descriptor in parse_srcset(srcset)
+        ]
+        references.append({
+            "node": node,
+            "attr": "srcset",
+            "kind": "srcset",
+            "media_type": media_type,
+            "source": srcset,
+            "candidates": candidates,
+        })
+
+    for node, ancestors in iter_archive_tags(soup):
+        name = node.name
+        if name == "script":
+            scripts.append(node)
+            continue
 
-def log_save_phase(label, started_at):
+        for attr in list(node.attrs):
+            if attr.lower().startswith("on"):
+                del node.attrs[attr]
+
+        # 상대 URL을 절대 URL로 변환
+        url_attr = ABSOLUTE_URL_ATTRS.get(name)
+        if url_attr and node.has_attr(url_attr):
+            node[url_attr] = urljoin(base_url, node[url_attr])
+
+        index_archive_media(media_index, node, ancestors)
+
+        if name == "a":
+            if node.get("href", "").lower().startswith("javascript:"):
+                node["href"] = "#"
+        elif name == "link":
+            rel_values = [value.lower() for value in node.get("rel", [])]
+            if "stylesheet" in rel_values and node.get("href"):
+                stylesheets.append(node)
+        elif name == "img":
+            add_src(node, "src", "images", True)
+            add_lazy(node, "images", True)
+            add_srcset(node, "images")
+        elif name == "video":
+            add_src(node, "src", "videos", False)
+            add_lazy(node, "videos", False)
+            add_src(node, "poster", "images", True)
+        elif name == "audio":
+            add_src(node, "src", "audio", False)
+        elif name == "source":
+            container = ancestors[0]
+            if container is None:
+                continue
+            if container.name == "video":
+                add_src(node, "src", "videos", False)
+                add_lazy(node, "videos", False)
+            elif container.name == "audio":
+                add_src(node, "src", "audio", False)
+            else:
+                add_srcset(node, "images")
+
+    for script in scripts:
+        script.decompose()
+
+    return {
+        "stylesheets": stylesheets,
+        "media_references": references,
+        "media_table": media_table,
+        "media": media_index["entries"],
+    }
+
+def fetch_media_jobs(jobs, base_url, storage_config, captured_responses=None, on_progress=None, inline_budget=None):
+    """
+    수집된 미디어 작업을 호스트별 동시성 제한 안에서 병렬로 다운로드/업로드합니다.
+    on_progress(완료 수)는 작업이 하나 끝날 때마다 호출됩니다.
+    """
+    progress = {"done": 0}
+    progress_lock = threading.Lock()
+
+    def run_job(job):
+        try:
+            return fetch_media_job(job)
+        finally:
+            if on_progress:
+                with progress_lock:
+                    progress["done"] += 1
+                    done = progress["done"]
+                try:
+                    on_progress(done)
+                except Exception as e:
+                    print(f"⚠️ 진행 상황 보고 실패: {e}")
+
+    def fetch_media_job(job):
+        full_url, media_type, use_base64 = job
+        with get_media_host_semaphore(full_url):
+            return download_and_save_media(
+                full_url,
+                base_url,
+                media_type,
+                use_base64=use_base64,
+                storage_config=storage_config,
+                captured_responses=captured_responses,
+                inline_budget=inline_budget
+            )
+
+    if not jobs:
+        return []
+
+    with ThreadPoolExecutor(max_workers=min(MEDIA_FETCH_CONCURRENCY, len(jobs))) as executor:
+        return list(executor.map(run_job, jobs))
+
+def apply_media_rewrites(references, results):
+    """다운로드 결과를 문서 순서대로 한 번에 속성에 반영하고 타입별 저장 수를 반환합니다."""
+    saved_counts = {"images": 0, "videos": 0, "audio": 0}
+
+    for reference in references:
+        node = reference["node"]
+        attr = reference["attr"]
+        media_type = reference["media_type"]
+
+        if reference["kind"] == "srcset":
+            srcset_parts = []
+            for part, image_url, descriptor, job in reference["candidates"]:
+                shared_link = results[job] if job is not None else None
+                if shared_link:
+                    srcset_parts.append(f"{shared_link} {descriptor}" if descriptor else shared_link)
+                    saved_counts[media_type] += 1
+                else:
+                    srcset_parts.append(part)
+            if srcset_parts:
+                node["srcset"] = ", ".join(srcset_parts)
+            continue
+
+        job = reference["job"]
+        shared_link = results[job] if job is not None else None
+        if not shared_link:
+            continue
+
+        node[attr] = shared_link
+        if reference["kind"] == "lazy" and not node.get("src"):
+            node["src"] = shared_link
+        saved_counts[media_type] += 1
+
+    return saved_counts
+
+def log_save_phase(label, started_at, detail=None):
     elapsed = time.perf_counter() - started_at
-    print(f"⏱️ {label}: {elapsed:.2f}s")
+    if detail:
+        print(f"⏱️ {label}: {elapsed:.2f}s ({detail})")
+    else:
+        print(f"⏱️ {label}: {elapsed:.2f}s")
 
 
 def storage_connection_success_response(provider):
@@ -1077,7 +2989,7 @@ def dropbox_callback():
         "redirect_uri": redirect_uri
     }
     
-    res = requests.post(token_url, data=data, timeout=15)
+    res = get_http_session().post(token_url, data=data, timeout=15)
     if res.status_code != 200:
         return f"Dropbox 토큰 갱신 실패: {res.text}", 400
         
@@ -1147,7 +3059,7 @@ def google_callback():
         "grant_type": "authorization_code"
     }
     
-    res = requests.post(token_url, data=data, timeout=15)
+    res = get_http_session().post(token_url, data=data, timeout=15)
     if res.status_code != 200:
         return f"Google 토큰 갱신 실패: {res.text}", 400
         
@@ -1253,6 +3165,8 @@ def upload_media_direct():
             content_type=content_type
         )
         archive_url = upload_media_stream(uploaded_file.stream, media_type, filename)
+        # 콘텐츠 주소 모드에서는 저장 파일명이 해시로 바뀝니다.
+        filename = unquote(archive_url.rsplit("/", 1)[-1])
 
         return jsonify({
             "message": "업로드 완료",
@@ -1264,12 +3178,33 @@ def upload_media_direct():
         return jsonify({"error": str(e)}), 500
 
 
-@app.route("/api/save-html", methods=["POST"])
-def save_html_direct():
+class SavePipelineError(Exception):
+    """저장 파이프라인이 특정 HTTP 상태로 응답해야 하는 실패."""
+
+    def __init__(self, message, status_code):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+def run_save_pipeline(data, origin, report=None, on_saved=None):
+    """
+    캡처 → 인라인 → 업로드 → Raindrop 저장 파이프라인을 실행합니다.
+    동기 요청과 백그라운드 저장 작업이 함께 사용합니다.
+
+    Args:
+        data: /api/save-html 요청 본문
+        origin: 아카이브 URL을 만들 때 사용할 서버 origin
+        report: report(phase, progress_dict) 형태의 진행 상황 콜백 (선택)
+        on_saved: Raindrop 저장 직후 on_saved(result)로 호출되는 콜백 (선택)
+
+    Returns:
+        {"message": ..., "archiveUrl": ...}
+    """
+    report = report or (lambda phase, progress=None: None)
+    captured_responses = None
+    captured_html = None
     try:
-        print("=== /api/save-html 호출됨 ===")
         request_started_at = time.perf_counter()
-        data = request.json
         url = data.get("url")
         html = data.get("html")
         collection_id = data.get("collectionId")
@@ -1278,46 +3213,54 @@ def save_html_direct():
         lightweight_capture_mode = client_capture_mode == "android-webview"
 
         if not url:
-            return jsonify({"error": "Missing URL"}), 400
+            raise SavePipelineError("Missing URL", 400)
 
         if not collection_id:
             collection_id = find_collection_id_by_title(collection_title)
             print(f"ℹ️ 컬렉션 조회 완료: {collection_title} -> {collection_id}")
 
         if not collection_id:
-            return jsonify({"error": f"'{collection_title}' 컬렉션을 찾지 못했습니다."}), 400
+            raise SavePipelineError(f"'{collection_title}' 컬렉션을 찾지 못했습니다.", 400)
 
         # 기존 Android 앱은 서버에 설정된 Dropbox 계정으로 저장합니다.
         provider = "dropbox"
         storage_config = {
             "provider": provider,
             "dbx_client": get_dropbox_client(),
+            "account_key": "dropbox:server",
         }
+        if DROPBOX_BATCH_UPLOAD:
+            storage_config["upload_batch"] = create_dropbox_upload_batch(
+                storage_config["dbx_client"], storage_config["account_key"]
+            )
 
         provided_html = html
         html = provided_html
 
         if client_capture_mode and not html:
-            return jsonify({
-                "error": (
-                    "앱에서 페이지 HTML을 캡처하지 못했습니다. "
-                    "서버 재시도는 FMKorea 보안 페이지로 이어질 수 있어 중단했습니다."
-                )
-            }), 422
+            raise SavePipelineError(
+                "앱에서 페이지 HTML을 캡처하지 못했습니다. "
+                "서버 재시도는 FMKorea 보안 페이지로 이어질 수 있어 중단했습니다.",
+                422
+            )
 
+        report("capture")
         if not html and USE_PLAYWRIGHT_CAPTURE:
             try:
                 playwright_started_at = time.perf_counter()
-                captured_html = render_page_html_with_playwright(url)
+                captured_html, captured_responses = render_page_html_with_playwright(url)
                 log_save_phase("Playwright 캡처", playwright_started_at)
                 if is_security_challenge_html(captured_html):
                     print("⚠️ Playwright 캡처에서 사이트 보안 확인 페이지를 감지했습니다.")
-                    return security_challenge_response()
+                    raise SavePipelineError(SECURITY_CHALLENGE_ERROR, 409)
                 else:
                     html = captured_html
+            except SavePipelineError:
+                raise
             except Exception as e:
                 print(f"⚠️ Playwright 캡처 실패, 기존 HTML/fetch 방식으로 저장합니다: {e}")
                 html = provided_html
+                captured_responses = None
 
         if not html:
             print("HTML 본문 없음, 서버에서 페이지를 가져옵니다.")
@@ -1325,231 +3268,92 @@ def save_html_direct():
             html = fetch_page_html(url)
             log_save_phase("서버 HTML fetch", fetch_started_at)
 
-        if is_security_challenge_html(html):
+        # Playwright 캡처 HTML은 위에서 이미 검사했습니다.
+        if html is not captured_html and is_security_challenge_html(html):
             print("⚠️ 사이트 보안 확인 페이지 감지: 저장을 중단합니다.")
-            return security_challenge_response()
+            raise SavePipelineError(SECURITY_CHALLENGE_ERROR, 409)
 
         archive_id = str(uuid4())
         filename = f"{archive_id}.html"
-        filepath = f"/tmp/{filename}"
         parsed = urlparse(url)
+        inline_budget = create_inline_budget()
 
-        soup = BeautifulSoup(html, "html.parser")
+        report("parse")
         html_parse_started_at = time.perf_counter()
+        soup = parse_html(html)
+        log_save_phase("HTML 파싱", html_parse_started_at)
 
-        # 상대 URL을 절대 URL로 변환
-        for tag, attr in {
-            "img": "src",
-            "script": "src",
-            "link": "href",
-            "source": "src",
-            "video": "src",
-            "audio": "src",
-            "iframe": "src"
-        }.items():
-            for node in soup.find_all(tag):
-                if node.has_attr(attr):
-                    node[attr] = urljoin(url, node[attr])
-        log_save_phase("상대 URL 절대화", html_parse_started_at)
+        rewrite_started_at = time.perf_counter()
+        document = scan_archive_document(soup, url)
+        log_save_phase("문서 재작성/수집", rewrite_started_at)
 
         if lightweight_capture_mode:
             print("⚡ android-webview 경량 모드: CSS/이미지/비디오/오디오 다운로드를 건너뜁니다.")
         else:
+            report("stylesheets")
             stylesheet_started_at = time.perf_counter()
-            inline_stylesheets(soup, url)
+            inline_stylesheets(soup, url, captured_responses, document["stylesheets"])
             log_save_phase("스타일시트 인라인", stylesheet_started_at)
 
-            # 모든 이미지 다운로드 및 저장 (GIF 포함)
-            print("🖼️ 이미지 처리 중...")
-            image_started_at = time.perf_counter()
-            image_saved_count = 0
-            for img in soup.find_all("img"):
-                img_src = img.get("src")
-                if img_src:
-                    shared_link = download_and_save_media(img_src, url, "images", storage_config=storage_config)
-                    if shared_link:
-                        img["src"] = shared_link
-                        image_saved_count += 1
-                        print(f"✅ 이미지 저장 완료: {img_src}")
-                
-                for lazy_attr in ["data-src", "data-lazy-src", "data-original", "data-url"]:
-                    lazy_src = img.get(lazy_attr)
-                    if lazy_src:
-                        shared_link = download_and_save_media(lazy_src, url, "images", storage_config=storage_config)
-                        if shared_link:
-                            img[lazy_attr] = shared_link
-                            if not img.get("src"):
-                                img["src"] = shared_link
-                            image_saved_count += 1
-                            print(f"✅ 지연 로딩 이미지 저장 완료 ({lazy_attr}): {lazy_src}")
-                
-                img_srcset = img.get("srcset")
-                if img_srcset:
-                    srcset_parts = []
-                    for part in img_srcset.split(","):
-                        part = part.strip()
-                        if not part:
-                            continue
-                        parts = part.split()
-                        if parts:
-                            image_url = parts[0]
-                            descriptor = " ".join(parts[1:]) if len(parts) > 1 else ""
-                            
-                            shared_link = download_and_save_media(image_url, url, "images", storage_config=storage_config)
-                            if shared_link:
-                                if descriptor:
-                                    srcset_parts.append(f"{shared_link} {descriptor}")
-                                else:
-                                    srcset_parts.append(shared_link)
-                                image_saved_count += 1
-                                print(f"✅ img srcset 이미지 저장 완료: {image_url}")
-                            else:
-                                srcset_parts.append(part)
-                    
-                    if srcset_parts:
-                        img["srcset"] = ", ".join(srcset_parts)
-            print(f"ℹ️ 이미지 저장 수: {image_saved_count}")
-            log_save_phase("이미지 처리", image_started_at)
-
-            video_started_at = time.perf_counter()
-            video_saved_count = 0
-            audio_saved_count = 0
-
-            # video 태그의 src 속성 처리
-            print("🎥 video 태그 처리 중...")
-            for video in soup.find_all("video"):
-                video_src = video.get("src")
-                if video_src:
-                    shared_link = download_and_save_media(video_src, url, "videos", use_base64=False, storage_config=storage_config)
-                    if shared_link:
-                        video["src"] = shared_link
-                        video_saved_count += 1
-                        print(f"✅ 비디오 저장 완료: {video_src}")
-                
-                for lazy_attr in ["data-src", "data-lazy-src", "data-original", "data-url"]:
-                    lazy_src = video.get(lazy_attr)
-                    if lazy_src:
-                        shared_link = download_and_save_media(lazy_src, url, "videos", use_base64=False, storage_config=storage_config)
-                        if shared_link:
-                            video[lazy_attr] = shared_link
-                            if not video.get("src"):
-                                video["src"] = shared_link
-                            video_saved_count += 1
-                            print(f"✅ 지연 로딩 비디오 저장 완료 ({lazy_attr}): {lazy_src}")
-                
-                poster_src = video.get("poster")
-                if poster_src:
-                    shared_link = download_and_save_media(poster_src, url, "images", use_base64=True, storage_config=storage_config)
-                    if shared_link:
-                        video["poster"] = shared_link
-                        image_saved_count += 1
-                        print(f"✅ 비디오 포스터 저장 완료: {poster_src}")
-
-            print("🎬 video > source 태그 처리 중...")
-            for video in soup.find_all("video"):
-                for source in video.find_all("source"):
-                    source_src = source.get("src")
-                    if source_src:
-                        shared_link = download_and_save_media(source_src, url, "videos", use_base64=False, storage_config=storage_config)
-                        if shared_link:
-                            source["src"] = shared_link
-                            video_saved_count += 1
-                            print(f"✅ 비디오 소스 저장 완료: {source_src}")
-                    
-                    for lazy_attr in ["data-src", "data-lazy-src", "data-original", "data-url"]:
-                        lazy_src = source.get(lazy_attr)
-                        if lazy_src:
-                            shared_link = download_and_save_media(lazy_src, url, "videos", use_base64=False, storage_config=storage_config)
-                            if shared_link:
-                                source[lazy_attr] = shared_link
-                                if not source.get("src"):
-                                    source["src"] = shared_link
-                                video_saved_count += 1
-                                print(f"✅ 지연 로딩 비디오 소스 저장 완료 ({lazy_attr}): {lazy_src}")
-
-            print("🔊 audio 태그 처리 중...")
-            for audio in soup.find_all("audio"):
-                audio_src = audio.get("src")
-                if audio_src:
-                    shared_link = download_and_save_media(audio_src, url, "audio", use_base64=False, storage_config=storage_config)
-                    if shared_link:
-                        audio["src"] = shared_link
-                        audio_saved_count += 1
-                        print(f"✅ 오디오 저장 완료: {audio_src}")
-
-            for audio in soup.find_all("audio"):
-                for source in audio.find_all("source"):
-                    source_src = source.get("src")
-                    if source_src:
-                        shared_link = download_and_save_media(source_src, url, "audio", use_base64=False, storage_config=storage_config)
-                        if shared_link:
-                            source["src"] = shared_link
-                            audio_saved_count += 1
-                            print(f"✅ 오디오 소스 저장 완료: {source_src}")
-
-            print(f"ℹ️ 비디오 저장 수: {video_saved_count}, 오디오 저장 수: {audio_saved_count}")
-            log_save_phase("비디오/오디오 처리", video_started_at)
-
-        if not lightweight_capture_mode:
-            print("🖼️ picture > source 태그 처리 중...")
-            picture_started_at = time.perf_counter()
-            for picture in soup.find_all("picture"):
-                for source in picture.find_all("source"):
-                    source_srcset = source.get("srcset")
-                    if source_srcset:
-                        srcset_parts = []
-                        for part in source_srcset.split(","):
-                            part = part.strip()
-                            if not part:
-                                continue
-                            parts = part.split()
-                            if parts:
-                                image_url = parts[0]
-                                descriptor = " ".join(parts[1:]) if len(parts) > 1 else ""
-                                
-                                shared_link = download_and_save_media(image_url, url, "images", storage_config=storage_config)
-                                if shared_link:
-                                    if descriptor:
-                                        srcset_parts.append(f"{shared_link} {descriptor}")
-                                    else:
-                                        srcset_parts.append(shared_link)
-                                    print(f"✅ picture 소스 저장 완료: {image_url}")
-                                else:
-                                    srcset_parts.append(part)
-                        
-                        if srcset_parts:
-                            source["srcset"] = ", ".join(srcset_parts)
-            log_save_phase("picture/source 처리", picture_started_at)
+            print("🖼️ 이미지/비디오/오디오 처리 중...")
+            media_started_at = time.perf_counter()
+            media_references = document["media_references"]
+            media_table = document["media_table"]
+            media_jobs = media_table["jobs"]
+            report("media", {"mediaTotal": len(media_jobs), "mediaDone": 0})
+            media_results = fetch_media_jobs(
+                media_jobs,
+                url,
+                storage_config,
+                captured_responses,
+                on_progress=lambda done: report("media", {"mediaTotal": len(media_jobs), "mediaDone": done}),
+                inline_budget=inline_budget
+            )
+            if storage_config.get("upload_batch"):
+                batch_links = finalize_dropbox_upload_batch(storage_config["upload_batch"])
+                media_results = [
+                    batch_links.get(get_pending_batch_path(result)) if get_pending_batch_path(result) else result
+                    for result in media_results
+                ]
+            saved_counts = apply_media_rewrites(media_references, media_results)
+            print(
+                f"ℹ️ 이미지 저장 수: {saved_counts['images']}, "
+                f"비디오 저장 수: {saved_counts['videos']}, "
+                f"오디오 저장 수: {saved_counts['audio']}"
+            )
+            log_save_phase(
+                "미디어 처리",
+                media_started_at,
+                f"고유 URL {len(media_jobs)}개, 중복 참조 재사용 {media_table['hits']}회"
+            )
 
         fallback_started_at = time.perf_counter()
-        add_archive_media_fallbacks(soup)
+        add_archive_media_fallbacks(soup, document["media"])
+        stamp_archive_pipeline(soup)
         log_save_phase("아카이브 미디어 후처리", fallback_started_at)
 
-        write_started_at = time.perf_counter()
-        with open(filepath, "w", encoding="utf-8") as f:
-            f.write(str(soup))
-        log_save_phase("임시 HTML 쓰기", write_started_at)
-
-        # HTML 업로드 처리
+        # HTML 업로드 처리: 임시 파일 없이 직렬화 조각을 바로 업로드 세션으로 보냅니다.
+        report("upload")
         upload_started_at = time.perf_counter()
-        with open(filepath, "rb") as f:
-            html_bytes = f.read()
+        html_size = {"bytes": 0}
+
+        def iter_archive_bytes():
+            for piece in iter_archive_html(soup):
+                encoded = rewrite_archive_media_origin_links(piece).encode("utf-8")
+                html_size["bytes"] += len(encoded)
+                yield encoded
 
+        stored_size = None
         if provider == "dropbox":
             dbx = storage_config["dbx_client"]
             dropbox_path = f"/web-archives/{filename}"
-            dbx.files_upload(
-                html_bytes,
-                dropbox_path,
-                mode=dropbox.files.WriteMode.overwrite
-            )
-            # 공유 링크 생성
-            links = dbx.sharing_list_shared_links(path=dropbox_path).links
-            if links:
-                shared_url = links[0].url.split("?")[0]
-            else:
-                settings = dropbox.sharing.SharedLinkSettings(requested_visibility=dropbox.sharing.RequestedVisibility.public)
-                shared_url = dbx.sharing_create_shared_link_with_settings(dropbox_path, settings).url.split("?")[0]
+            chunks = iter_archive_bytes()
+            if ARCHIVE_STORAGE_ENCODING:
+                chunks = iter_compressed_chunks(chunks, ARCHIVE_STORAGE_ENCODING)
+                dropbox_path += ENCODING_SUFFIXES[ARCHIVE_STORAGE_ENCODING]
+            stored_size = upload_chunks_to_dropbox(dbx, chunks, dropbox_path).size
+            # 새 경로이므로 목록 조회 없이 공유 링크를 바로 만듭니다.
+            shared_url = resolve_dropbox_shared_link(dbx, dropbox_path, storage_config["account_key"], fresh=True)
             storage_file_id = dropbox_path
             
         elif provider == "google":
@@ -1558,14 +3362,24 @@ def save_html_direct():
                 access_token=storage_config["access_token"],
                 folder_id=storage_config["root_folder_id"],
                 filename=filename,
-                file_bytes=html_bytes,
+                file_bytes=b"".join(iter_archive_bytes()),
                 content_type="text/html"
             )
             storage_file_id = file_id
 
         log_save_phase("스토리지 HTML 업로드", upload_started_at)
+        stored_detail = (
+            f" (저장 {stored_size // 1024}KB {ARCHIVE_STORAGE_ENCODING})"
+            if ARCHIVE_STORAGE_ENCODING and stored_size is not None else ""
+        )
+        print(
+            f"ℹ️ 아카이브 HTML {html_size['bytes'] // 1024}KB{stored_detail}, "
+            f"인라인 미디어 {inline_budget['inline_count']}개 {inline_budget['inline_bytes'] // 1024}KB"
+            f"/{inline_budget['limit'] // 1024}KB, "
+            f"업로드 미디어 {inline_budget['upload_count']}개 {inline_budget['upload_bytes'] // 1024}KB"
+        )
 
-        archive_url = get_archive_url(filename)
+        archive_url = get_archive_url(filename, origin)
         title = soup.title.string.strip() if soup.title else "Untitled"
         domain_tag = parsed.netloc
         cover_image_url = extract_cover_image(soup, url)
@@ -1585,8 +3399,9 @@ def save_html_direct():
         if cover_image_url:
             payload["cover"] = cover_image_url
 
+        report("raindrop")
         raindrop_started_at = time.perf_counter()
-        raindrop_response = requests.post(
+        raindrop_response = get_http_session().post(
             "https://api.raindrop.io/rest/v1/raindrop",
             headers=raindrop_headers,
             json=payload,
@@ -1594,21 +3409,105 @@ def save_html_direct():
         )
         log_save_phase("Raindrop 저장", raindrop_started_at)
         if raindrop_response.status_code not in (200, 201):
-            return jsonify({
-                "error": f"Raindrop 저장 실패: {raindrop_response.status_code}"
-            }), 502
+            raise SavePipelineError(f"Raindrop 저장 실패: {raindrop_response.status_code}", 502)
 
-        log_save_phase("전체 저장 요청 완료", request_started_at)
-        return jsonify({
+        result = {
             "message": "저장 완료!",
             "archiveUrl": archive_url
-        })
+        }
+        if on_saved:
+            on_saved(result)
+        log_save_phase("전체 저장 요청 완료", request_started_at, format_http_pool_stats())
+        return result
+    finally:
+        close_capture_store(captured_responses)
+
+
+def handle_save_job(job):
+    job_id = job["id"]
+    print(f"=== 저장 작업 시작: {job_id} (시도 {job['attempts']}) ===")
+    payload = job["payload"]
+
+    def report(phase, progress=None):
+        update_save_job_progress(job_id, phase, progress)
+
+    # Raindrop 저장은 멱등하지 않으므로, 이미 저장까지 끝난 작업을 다시 잡으면 기록된 결과로 완료 처리합니다.
+    result = get_save_job_checkpoint(job_id)
+    if result is not None:
+        print(f"ℹ️ 이미 Raindrop에 저장된 작업이라 다시 실행하지 않습니다: {job_id}")
+        finish_save_job(job_id, result)
+        return
+
+    def on_saved(result):
+        record_save_job_checkpoint(job_id, result)
 
+    try:
+        result = run_save_pipeline(payload["data"], payload["origin"], report, on_saved)
+        finish_save_job(job_id, result)
+    except SavePipelineError as e:
+        fail_save_job(job_id, str(e), e.status_code)
+    except Exception as e:
+        print("예외 발생:", str(e))
+        fail_save_job(job_id, str(e), 500)
+
+
+def start_save_job_workers():
+    """
+    현재 프로세스에서 백그라운드 저장 작업 스레드를 시작합니다 (SAVE_JOB_WORKERS=0이면 시작하지 않습니다).
+    import만으로는 시작하지 않으며, gunicorn.conf.py의 post_worker_init 훅과 직접 실행 경로에서 호출합니다.
+    재시작 전에 쌓여 있던 작업도 새 요청을 기다리지 않고 바로 처리됩니다.
+    """
+    ensure_save_job_workers(handle_save_job)
+
+
+@app.route("/api/save-html", methods=["POST"])
+def save_html_direct():
+    try:
+        print("=== /api/save-html 호출됨 ===")
+        data = request.json or {}
+
+        # 작업 모드: 즉시 job id를 돌려주고 백그라운드 워커가 저장합니다.
+        if data.get("async") or request.args.get("async") == "1":
+            if not data.get("url"):
+                return jsonify({"error": "Missing URL"}), 400
+
+            job_id = enqueue_save_job({"data": data, "origin": get_request_origin()})
+            print(f"ℹ️ 저장 작업 등록: {job_id}")
+            return jsonify({
+                "message": "저장 작업이 등록되었습니다.",
+                "jobId": job_id,
+                "statusUrl": f"/api/save-jobs/{job_id}",
+            }), 202
+
+        return jsonify(run_save_pipeline(data, get_request_origin()))
+    except SavePipelineError as e:
+        return jsonify({"error": str(e)}), e.status_code
     except Exception as e:
         print("예외 발생:", str(e))
         return jsonify({"error": str(e)}), 500
 
 
+@app.route("/api/save-jobs/<job_id>", methods=["GET"])
+def get_save_job_status(job_id):
+    job = get_save_job(job_id)
+    if not job:
+        return jsonify({"error": "저장 작업을 찾을 수 없습니다."}), 404
+
+    response = {
+        "jobId": job["id"],
+        "status": job["status"],
+        "phase": job["phase"],
+        "progress": job["progress"],
+        "attempts": job["attempts"],
+    }
+    if job["result"]:
+        response.update(job["result"])
+    if job["error"]:
+        response["error"] = job["error"]
+        response["statusCode"] = job["status_code"]
+    return jsonify(response)
+
+
 @app.route("/api/save-screenshot", methods=["POST"])
 @login_required
 def save_screenshot_direct():
@@ -1652,18 +3551,25 @@ def save_screenshot_direct():
             )
         elif provider == "google":
             access_token = get_google_access_token(refresh_token)
-            root_folder_id = get_or_create_google_folder(access_token, "ArchiveSaver")
-            screenshot_folder_id = get_google_subfolder_id(
-                access_token, root_folder_id, "screenshots"
-            )
-            storage_file_id, _ = upload_to_google_drive(
-                access_token=access_token,
-                folder_id=screenshot_folder_id,
-                filename=filename,
-                file_bytes=screenshot_bytes,
-                content_type="image/png",
-                make_public=False,
-            )
+            account_key = f"google:{user_id}"
+            for attempt in range(2):
+                root_folder_id = get_or_create_google_folder(access_token, "ArchiveSaver", account_key=account_key)
+                try:
+                    storage_file_id, _ = upload_to_google_subfolder(
+                        access_token=access_token,
+                        parent_id=root_folder_id,
+                        subfolder_name="screenshots",
+                        filename=filename,
+                        file_bytes=screenshot_bytes,
+                        content_type="image/png",
+                        make_public=False,
+                    )
+                    break
+                except Exception as e:
+                    # 캐시된 ArchiveSaver 폴더 자체가 지워진 경우
+                    if attempt or not is_http_not_found(e):
+                        raise
+                    invalidate_google_folder("ArchiveSaver", account_key=account_key)
         else:
             return jsonify({"error": "지원하지 않는 스토리지입니다."}), 400
 
@@ -1743,7 +3649,7 @@ def download_archive_file(archive_id):
 def get_collections():
     try:
         headers = {"Authorization": f"Bearer {RAINDROP_ACCESS_TOKEN}"}
-        res = requests.get("https://api.raindrop.io/rest/v1/collections", headers=headers, timeout=15)
+        res = get_http_session().get("https://api.raindrop.io/rest/v1/collections", headers=headers, timeout=15)
         res.raise_for_status()
         return jsonify(res.json().get("items", []))
     except Exception as e:
@@ -1773,7 +3679,7 @@ def get_raindrop_bookmarks():
 
         while True:
             url = f"https://api.raindrop.io/rest/v1/raindrops/{collection_id}?page={current_page}&perpage=50&sort=-created"
-            res = requests.get(url, headers=headers, timeout=20)
+            res = get_http_session().get(url, headers=headers, timeout=20)
             res.raise_for_status()
             data = res.json()
             total_count = data.get("count", 0)
@@ -1862,15 +3768,15 @@ def view_archive(archive_id):
     try:
         filename = normalize_archive_filename(archive_id)
         dropbox_path = f"/web-archives/{filename}"
-        _, response = get_dropbox_client().files_download(dropbox_path)
-        html = response.content.decode("utf-8", errors="replace")
-        html = rewrite_archive_media_origin_links(html)
-        soup = BeautifulSoup(html, "html.parser")
-        add_archive_media_fallbacks(soup)
-        html = str(soup)
+        html_bytes, rev, encoding = load_archive_html(dropbox_path)
 
-        return Response(
-            html,
+        # 압축 저장본은 클라이언트가 받을 수 있으면 그대로, 아니면 풀어서 보냅니다.
+        if encoding and request.accept_encodings[encoding] <= 0:
+            html_bytes = decompress_bytes(html_bytes, encoding)
+            encoding = None
+
+        response = Response(
+            html_bytes,
             content_type="text/html; charset=utf-8",
             headers={
                 "Cache-Control": "private, max-age=300",
@@ -1888,8 +3794,16 @@ def view_archive(archive_id):
                 "X-Robots-Tag": "noindex, nofollow"
             }
         )
+        response.vary.add("Accept-Encoding")
+        if encoding:
+            response.headers["Content-Encoding"] = encoding
+        # If-None-Match가 일치하면 본문 없이 304를 돌려줍니다.
+        response.set_etag(get_archive_etag(rev, encoding))
+        return response.make_conditional(request)
     except ValueError as e:
         return Response(str(e), status=400, mimetype="text/plain")
+    except FileNotFoundError as e:
+        return Response(str(e), status=404, mimetype="text/plain")
     except Exception as e:
         print(f"아카이브 로드 실패: {archive_id}, {e}")
         return Response("Archive load failed", status=500, mimetype="text/plain")
@@ -1902,22 +3816,28 @@ def view_archive_media(media_type, filename):
 
         safe_filename = normalize_media_filename(filename)
         dropbox_path = f"/web-archives/{media_type}/{safe_filename}"
-        temporary_link = get_dropbox_temporary_link(dropbox_path)
 
         if media_type in ["videos", "audio", "media"] and request.args.get("proxy") != "1":
-            response = redirect(temporary_link, code=302)
+            response = redirect(get_dropbox_temporary_link(dropbox_path), code=302)
             response.headers["Cache-Control"] = "private, max-age=60"
             response.headers["Accept-Ranges"] = "bytes"
             return response
 
         content_type = mimetypes.guess_type(safe_filename)[0] or "application/octet-stream"
 
+        if MEDIA_EDGE_CACHE["dir"]:
+            cached_response = serve_cached_archive_media(dropbox_path, content_type)
+            if cached_response is not None:
+                return cached_response
+
+        # 캐시 적중이면 Dropbox에 묻지 않도록 임시 링크는 원본이 필요할 때만 받습니다.
+        temporary_link = get_dropbox_temporary_link(dropbox_path)
         upstream_headers = {}
         range_header = request.headers.get("Range")
         if range_header:
             upstream_headers["Range"] = range_header
 
-        upstream_response = requests.get(
+        upstream_response = get_http_session().get(
             temporary_link,
             headers=upstream_headers,
             stream=True,
@@ -1953,8 +3873,15 @@ def view_archive_media(media_type, filename):
         if upstream_content_type:
             content_type = upstream_content_type.split(";", 1)[0] or content_type
 
+        # 응답을 내보내면서 받은 구간을 디스크 캐시에 채웁니다 (Range 요청이면 그 구간만).
+        body = iter_upstream_content(upstream_response)
+        cache_fill = open_archive_media_cache_fill(dropbox_path, upstream_response, content_type)
+        if cache_fill is not None:
+            cache_meta, cache_offset = cache_fill
+            body = iter_media_cache_fill(MEDIA_EDGE_CACHE, dropbox_path, cache_meta, body, cache_offset)
+
         return Response(
-            stream_with_context(iter_upstream_content(upstream_response)),
+            stream_with_context(body),
             status=upstream_response.status_code,
             content_type=content_type,
             headers={
@@ -2094,4 +4021,7 @@ def serve_static(path):
     return send_from_directory(app.static_folder, "index.html")
 
 if __name__ == "__main__":
+    # debug 리로더는 감시용 부모 프로세스와 실제 서버 자식 프로세스로 나뉘므로 자식에서만 시작합니다.
+    if os.environ.get("WERKZEUG_RUN_MAIN") == "true":
+        start_save_job_workers()
     app.run(debug=True, host="0.0.0.0", port=5000)
@@ -0,0 +1,447 @@
+"""
+저장 파이프라인의 HTML 파싱/재작성 단계 벤치마크.
+
+fmkorea 대형 스레드와 비슷한 합성 문서를 만들어 단일 순회 엔진 직전 코드(legacy_*, 그대로 옮겨 둠)의
+다중 find_all 방식과 scan_archive_document 단일 순회 방식을 비교하고, 두 결과 HTML이 같은지 확인합니다.
+미디어 다운로드와 CSS 인라인은 제외하고 파싱, 재작성, 직렬화 단계를 따로 잽니다.
+단일 순회가 줄이는 것은 재작성 단계뿐이라 파싱이 대부분인 전체 시간의 차이는 작습니다.
+--parsers를 주면 html.parser/lxml 트리 빌더 속도를 비교하고, 합성 문서와 몇 가지 조각으로
+아카이브 결과를 대조하는 간이 점검을 합니다. 저장 페이지 단위 동등성은 tests/test_html_conformance.py에서 확인합니다.
+
+    cd backend && python bench_html_pipeline.py --comments 2000 --repeat 3 --parsers
+"""
+import argparse
+import time
+from urllib.parse import urljoin
+
+from bs4 import BeautifulSoup
+
+import app
+import html_parser_utils
+
+PAGE_URL = "https://www.fmkorea.com/best/1234567890"
+
+
+def build_synthetic_thread(comment_count):
+    parts = [
+        "<!doctype html><html><head><title>합성 스레드</title>",
+        '<link rel="stylesheet" href="/static/common.css">',
+        '<script src="/static/app.js"></script>',
+        "</head><body>",
+        '<div class="rd_body"><article>',
+        '<p>본문 <a href="javascript:void(0)" onclick="vote()">추천</a></p>',
+        '<div class="auto_media_wrapper"><video src="/files/clip.mp4" poster="/files/clip.jpg" autoplay>'
+        '<source src="/files/clip.mp4" type="video/mp4"></video></div>',
+        '<audio><source src="/files/sound.mp3"></audio>',
+        "</article></div><ul class=\"fdb_lst_ul\">",
+    ]
+    for index in range(comment_count):
+        parts.append(
+            f'<li id="comment_{index}" class="fdb_itm" onmouseover="hover({index})">'
+            f'<div class="meta"><a href="/member/{index % 97}" class="member">회원{index % 97}</a>'
+            f'<span class="date">2024.01.{index % 28 + 1:02d}</span></div>'
+            f'<div class="comment-content"><p>댓글 내용 {index} '
+            f'<a href="javascript:reply({index})">답글</a></p>'
+        )
+        if index % 3 == 0:
+            parts.append(
+                f'<img src="/img/lazy.gif" data-original="/files/attach/{index % 50}.jpg" '
+                f'srcset="/files/attach/{index % 50}.jpg 1x, /files/attach/{index % 50}@2x.jpg 2x" '
+                f'onerror="this.remove()">'
+            )
+        if index % 10 == 0:
+            parts.append(
+                f'<picture><source srcset="/files/attach/{index % 50}.webp" type="image/webp">'
+                f'<img src="/files/attach/{index % 50}.jpg"></picture>'
+            )
+        if index % 25 == 0:
+            parts.append(f'<script>window.comment_{index} = true;</script>')
+        parts.append("</div></li>")
+    parts.append("</ul></body></html>")
+    return "".join(parts)
+
+
+# 아래 legacy_* 함수와 rewrite_legacy는 단일 순회 엔진([user-013]) 직전 app.py의 코드를 그대로 옮긴 것입니다.
+# 이후 app.py가 바뀌어도 비교 기준이 따라 바뀌지 않도록 app의 헬퍼를 재사용하지 않습니다.
+# 예외: apply_media_rewrites, parse_srcset, normalize_media_url, media_source_type은 그 뒤로 바뀌지 않아 app의 것을 씁니다.
+LEGACY_ABSOLUTE_URL_ATTRS = {
+    "img": "src",
+    "script": "src",
+    "link": "href",
+    "source": "src",
+    "video": "src",
+    "audio": "src",
+    "iframe": "src"
+}
+
+
+def legacy_find_stylesheet_links(soup):
+    """예전 inline_stylesheets에서 CSS를 받기 전까지의 link 탐색 부분."""
+    links = []
+    for link in list(soup.find_all("link")):
+        rel_values = [value.lower() for value in link.get("rel", [])]
+        href = link.get("href")
+
+        if "stylesheet" not in rel_values or not href:
+            continue
+        links.append(link)
+    return links
+
+
+def legacy_collect_media_references(soup, base_url):
+    """단일 순회 엔진 이전의 태그별 find_all 수집 방식."""
+    references = []
+    media_table = {"jobs": [], "index": {}, "hits": 0}
+
+    def add_job(media_url, media_type, use_base64):
+        if media_url.strip().lower().startswith("data:"):
+            return None
+        key = (app.normalize_media_url(media_url, base_url), media_type, use_base64)
+        job = media_table["index"].get(key)
+        if job is not None:
+            media_table["hits"] += 1
+            return job
+        media_table["jobs"].append(key)
+        media_table["index"][key] = len(media_table["jobs"]) - 1
+        return media_table["index"][key]
+
+    def add_src(node, attr, media_type, use_base64, kind="src"):
+        value = node.get(attr)
+        if value:
+            references.append({
+                "node": node,
+                "attr": attr,
+                "kind": kind,
+                "media_type": media_type,
+                "source": value,
+                "job": add_job(value, media_type, use_base64),
+            })
+
+    def add_lazy(node, media_type, use_base64):
+        for lazy_attr in app.LAZY_MEDIA_ATTRS:
+            add_src(node, lazy_attr, media_type, use_base64, kind="lazy")
+
+    def add_srcset(node, media_type):
+        srcset = node.get("srcset")
+        if not srcset:
+            return
+        candidates = [
+            (part, image_url, descriptor, add_job(image_url, media_type, True))
+            for part, image_url, descriptor in app.parse_srcset(srcset)
+        ]
+        references.append({
+            "node": node,
+            "attr": "srcset",
+            "kind": "srcset",
+            "media_type": media_type,
+            "source": srcset,
+            "candidates": candidates,
+        })
+
+    for img in soup.find_all("img"):
+        add_src(img, "src", "images", True)
+        add_lazy(img, "images", True)
+        add_srcset(img, "images")
+
+    for video in soup.find_all("video"):
+        add_src(video, "src", "videos", False)
+        add_lazy(video, "videos", False)
+        add_src(video, "poster", "images", True)
+        for source in video.find_all("source"):
+            add_src(source, "src", "videos", False)
+            add_lazy(source, "videos", False)
+
+    for audio in soup.find_all("audio"):
+        add_src(audio, "src", "audio", False)
+        for source in audio.find_all("source"):
+            add_src(source, "src", "audio", False)
+
+    for picture in soup.find_all("picture"):
+        for source in picture.find_all("source"):
+            add_srcset(source, "images")
+
+    return references, media_table
+
+
+def legacy_strip_archive_scripts(soup):
+    for script in soup.find_all("script"):
+        script.decompose()
+
+    for tag in soup.find_all(True):
+        for attr in list(tag.attrs):
+            if attr.lower().startswith("on"):
+                del tag.attrs[attr]
+
+    for anchor in soup.find_all("a"):
+        href = anchor.get("href", "")
+        if href.lower().startswith("javascript:"):
+            anchor["href"] = "#"
+
+
+def legacy_insert_native_media_blocks(soup):
+    seen_sources = set()
+
+    for media in list(soup.find_all(["video", "audio"])):
+        media_src = media.get("src")
+        if not media_src:
+            first_source = media.find("source")
+            media_src = first_source.get("src") if first_source else None
+
+        if not media_src or media_src in seen_sources:
+            continue
+
+        seen_sources.add(media_src)
+
+        wrapper = soup.new_tag("div")
+        wrapper["class"] = "archive-native-media"
+
+        clean_media = soup.new_tag(media.name)
+        clean_media["controls"] = ""
+        clean_media["preload"] = "metadata"
+        clean_media["playsinline"] = ""
+        clean_media["src"] = media_src
+        clean_media["style"] = "width:100%;height:auto;background:#000;"
+
+        poster = media.get("poster")
+        if poster:
+            clean_media["poster"] = poster
+
+        source = soup.new_tag("source", src=media_src)
+        source["type"] = app.media_source_type(media.name, media_src)
+        clean_media.append(source)
+        wrapper.append(clean_media)
+
+        link = soup.new_tag("a", href=media_src, target="_blank", rel="noopener")
+        link["class"] = "archive-media-link"
+        link.string = "영상 파일 열기" if media.name == "video" else "오디오 파일 열기"
+        wrapper.append(link)
+
+        target = media.find_parent(class_="auto_media_wrapper") or media.find_parent(class_="mejs__container") or media
+        target.insert_before(wrapper)
+
+        if target is not media:
+            target["class"] = target.get("class", []) + ["archive-original-media-hidden"]
+        else:
+            media["class"] = media.get("class", []) + ["archive-original-media-hidden"]
+
+
+def legacy_add_archive_media_fallbacks(soup):
+    legacy_strip_archive_scripts(soup)
+    legacy_insert_native_media_blocks(soup)
+
+    style = soup.new_tag("style")
+    style.string = """
+      .archive-original-media-hidden,
+      .mejs__container,
+      .mejs__controls,
+      .mejs__mediaelement,
+      .mejs__overlay,
+      .mejs__poster,
+      .video-poster {
+        display: none !important;
+      }
+
+      video,
+      audio {
+        max-width: 100% !important;
+        height: auto !important;
+        position: relative !important;
+        z-index: 2 !important;
+        background: #000 !important;
+      }
+
+      .archive-media-link {
+        display: inline-block;
+        margin: 8px 0 16px;
+        padding: 8px 10px;
+        border-radius: 6px;
+        background: #111827;
+        color: #fff !important;
+        font-size: 14px;
+        text-decoration: none;
+      }
+
+      .archive-native-media {
+        margin: 0 0 16px;
+      }
+    """
+
+    if soup.head:
+        soup.head.append(style)
+    else:
+        soup.insert(0, style)
+
+    for media in soup.find_all(["video", "audio"]):
+        media["controls"] = ""
+        media["preload"] = "metadata"
+        media["playsinline"] = ""
+        media.attrs.pop("autoplay", None)
+        media.attrs.pop("data-autoplay", None)
+
+        media_src = media.get("src")
+        if media_src and not media.find("source"):
+            source = soup.new_tag("source", src=media_src)
+            source["type"] = "video/mp4" if media.name == "video" else "audio/mpeg"
+            media.append(source)
+
+        for source in media.find_all("source"):
+            source_src = source.get("src", "")
+            if source_src.endswith(".mp4") or ".mp4?" in source_src:
+                source["type"] = "video/mp4"
+            elif source_src.endswith(".webm") or ".webm?" in source_src:
+                source["type"] = "video/webm"
+            elif source_src.endswith(".mp3") or ".mp3?" in source_src:
+                source["type"] = "audio/mpeg"
+            elif source_src.endswith(".ogg") or ".ogg?" in source_src:
+                source["type"] = "audio/ogg"
+
+        link_src = media.get("src")
+        if not link_src:
+            first_source = media.find("source")
+            link_src = first_source.get("src") if first_source else None
+
+        if link_src and not media.find_next_sibling("a", class_="archive-media-link"):
+            link = soup.new_tag("a", href=link_src, target="_blank", rel="noopener")
+            link["class"] = "archive-media-link"
+            link.string = "영상 파일 열기" if media.name == "video" else "오디오 파일 열기"
+            media.insert_after(link)
+
+
+def fake_media_results(media_table):
+    return [f"/archive-media/{media_type}/{abs(hash(full_url))}" for full_url, media_type, _ in media_table["jobs"]]
+
+
+def rewrite_legacy(soup):
+    for tag, attr in LEGACY_ABSOLUTE_URL_ATTRS.items():
+        for node in soup.find_all(tag):
+            if node.has_attr(attr):
+                node[attr] = urljoin(PAGE_URL, node[attr])
+    legacy_find_stylesheet_links(soup)
+    references, media_table = legacy_collect_media_references(soup, PAGE_URL)
+    app.apply_media_rewrites(references, fake_media_results(media_table))
+    legacy_add_archive_media_fallbacks(soup)
+
+
+def rewrite_single_pass(soup):
+    document = app.scan_archive_document(soup, PAGE_URL)
+    app.apply_media_rewrites(document["media_references"], fake_media_results(document["media_table"]))
+    app.add_archive_media_fallbacks(soup, document["media"])
+
+
+def run_single_pass(html, parser="html.parser"):
+    soup = BeautifulSoup(html, parser)
+    rewrite_single_pass(soup)
+    return str(soup)
+
+
+# 파서마다 복구 방식이 갈리는 문서 조각 (간이 점검용 표본)
+PARSER_SPOT_CHECK_FIXTURES = [
+    '<p>문단 안의 <div>블록</div> 요소</p><img src="/a.jpg">',
+    '<table><tr><td><img data-src="/lazy.png"></td></tr></table>',
+    '<video poster="/p.jpg"><source src="/v.mp4"><source src="/v.webm"></video><audio src="/s.mp3"></audio>',
+    '<picture><source srcset="/a.webp 1x, /a@2x.webp 2x"><img src="/a.jpg" onload="x()"></picture>',
+    '<a href="JavaScript:alert(1)">링크</a><script>document.write("<img src=/x.gif>")</script>',
+    '<link rel="stylesheet preload" href="/s.css"><ul><li>하나<li>둘</ul>',
+    '<img src="data:image/gif;base64,R0lGODlhAQABAAAAACw=" alt="&lt;인라인&gt; &amp; 엔티티">',
+]
+
+
+def archive_signature(output_html):
+    """파서별 트리 복구 차이를 제외하고 아카이브 결과에서 의미 있는 부분만 뽑습니다."""
+    soup = BeautifulSoup(output_html, "html.parser")
+    tags = []
+    for node in soup.find_all(["img", "video", "audio", "source", "a", "link", "style", "picture", "script"]):
+        attrs = {
+            key: " ".join(value) if isinstance(value, list) else value
+            for key, value in node.attrs.items()
+        }
+        tags.append((node.name, tuple(sorted(attrs.items()))))
+    text = " ".join(soup.get_text(" ").split())
+    title = soup.title.get_text(strip=True) if soup.title else ""
+    return title, text, tags
+
+
+def spot_check_parsers(html):
+    documents = [html] + [f"<html><head><title>조각 {index}</title></head><body>{fixture}</body></html>"
+                          for index, fixture in enumerate(PARSER_SPOT_CHECK_FIXTURES)]
+    failures = 0
+    for index, document in enumerate(documents):
+        expected = archive_signature(run_single_pass(document, "html.parser"))
+        actual = archive_signature(run_single_pass(document, "lxml"))
+        if expected != actual:
+            failures += 1
+            print(f"❌ 문서 {index}: html.parser와 lxml 결과가 다릅니다.")
+            print(f"   html.parser: {expected}")
+            print(f"   lxml:        {actual}")
+
+        configured_text = html_parser_utils.extract_title_and_text(document)
+        html_parser_utils._resolved["extractor"] = "bs4"
+        bs4_text = html_parser_utils.extract_title_and_text(document)
+        html_parser_utils._resolved.pop("extractor", None)
+        if configured_text != bs4_text:
+            failures += 1
+            print(f"❌ 문서 {index}: 텍스트 추출 결과가 다릅니다: {configured_text} / {bs4_text}")
+
+    if failures:
+        raise SystemExit(f"❌ 파서 간이 점검 실패 {failures}건")
+    print(f"✅ 파서 간이 점검 통과 ({len(documents)}개 표본 문서, 텍스트 추출기 {html_parser_utils.get_text_extractor()})")
+
+
+def time_phases(label, rewrite_fn, html, repeat, parser="html.parser"):
+    """파싱, 재작성, 직렬화 단계를 따로 재고 단계별 최솟값을 반환합니다."""
+    timings = {"parse": [], "rewrite": [], "serialize": []}
+    output = None
+    for _ in range(repeat):
+        started_at = time.perf_counter()
+        soup = BeautifulSoup(html, parser)
+        parsed_at = time.perf_counter()
+        rewrite_fn(soup)
+        rewritten_at = time.perf_counter()
+        output = str(soup)
+        finished_at = time.perf_counter()
+        timings["parse"].append(parsed_at - started_at)
+        timings["rewrite"].append(rewritten_at - parsed_at)
+        timings["serialize"].append(finished_at - rewritten_at)
+
+    best = {phase: min(values) for phase, values in timings.items()}
+    best["total"] = min(
+        parse + rewrite + serialize
+        for parse, rewrite, serialize in zip(timings["parse"], timings["rewrite"], timings["serialize"])
+    )
+    print(
+        f"{label}: 파싱 {best['parse']:.3f}s, 재작성 {best['rewrite']:.3f}s, "
+        f"직렬화 {best['serialize']:.3f}s, 전체 {best['total']:.3f}s (각 최솟값)"
+    )
+    return output, best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--comments", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--parsers", action="store_true", help="html.parser/lxml 속도 비교와 간이 결과 점검")
+    args = parser.parse_args()
+
+    html = build_synthetic_thread(args.comments)
+    print(f"합성 문서: 댓글 {args.comments}개, {len(html) // 1024}KB")
+
+    legacy_output, legacy_time = time_phases("이전 코드 (다중 find_all)", rewrite_legacy, html, args.repeat)
+    single_output, single_time = time_phases("단일 순회", rewrite_single_pass, html, args.repeat)
+
+    # 파싱과 직렬화는 두 방식이 같으므로 차이는 재작성 단계에서만 납니다.
+    print(
+        f"재작성 단계 속도 향상: {legacy_time['rewrite'] / single_time['rewrite']:.2f}x, "
+        f"파싱/직렬화 포함 전체: {legacy_time['total'] / single_time['total']:.2f}x"
+    )
+    if legacy_output != single_output:
+        raise SystemExit("❌ 두 방식의 결과 HTML이 다릅니다.")
+    print("✅ 결과 HTML 동일")
+
+    if args.parsers:
+        _, lxml_time = time_phases("단일 순회 (lxml)", rewrite_single_pass, html, args.repeat, "lxml")
+        print(f"lxml 파싱 속도 향상: {single_time['parse'] / lxml_time['parse']:.2f}x")
+        spot_check_parsers(html)
+
+
+if __name__ == "__main__":
+    main()
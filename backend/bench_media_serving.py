@@ -0,0 +1,184 @@
+"""
+로컬 파일 응답 방식 벤치마크.
+
+iter_upstream_content로 256KB씩 파이썬을 거쳐 내보내는 기존 프록시 방식과
+serve_local_file(file_wrapper, gunicorn에서는 os.sendfile)의 처리량을 전체/구간 요청으로 비교합니다.
+gunicorn이 설치되어 있으면 gunicorn으로, 없으면 werkzeug 개발 서버로 띄웁니다 (이 경우 sendfile 없음).
+클라이언트는 curl이 있으면 curl을 사용합니다.
+
+    cd backend && python bench_media_serving.py --size-mb 256 --repeat 5
+"""
+import argparse
+import multiprocessing
+import os
+import shutil
+import socket
+import subprocess
+import tempfile
+import time
+
+import requests
+from flask import Flask, Response, stream_with_context
+
+import app
+
+bench_app = Flask(__name__)
+BENCH_FILE = {"path": None}
+
+
+class FileUpstream:
+    """requests 응답처럼 iter_content/close를 제공하는 로컬 파일 래퍼 (네트워크 비용 제외)."""
+
+    def __init__(self, path, start, end):
+        self.file = open(path, "rb")
+        self.file.seek(start)
+        self.remaining = end - start
+
+    def iter_content(self, chunk_size):
+        while self.remaining > 0:
+            chunk = self.file.read(min(chunk_size, self.remaining))
+            if not chunk:
+                break
+            self.remaining -= len(chunk)
+            yield chunk
+
+    def close(self):
+        self.file.close()
+
+
+@bench_app.route("/generator")
+def serve_with_generator():
+    size = os.path.getsize(BENCH_FILE["path"])
+    start, end, status = app.resolve_request_range(size)
+    headers = {"Content-Length": str(end - start)}
+    if status == 206:
+        headers["Content-Range"] = f"bytes {start}-{end - 1}/{size}"
+    return Response(
+        stream_with_context(app.iter_upstream_content(FileUpstream(BENCH_FILE["path"], start, end))),
+        status=status,
+        content_type="application/octet-stream",
+        headers=headers
+    )
+
+
+@bench_app.route("/sendfile")
+def serve_with_sendfile():
+    return app.serve_local_file(BENCH_FILE["path"], "application/octet-stream", etag="bench")
+
+
+def get_free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def run_server(path, port):
+    BENCH_FILE["path"] = path
+    try:
+        from gunicorn.app.base import BaseApplication
+    except ImportError:
+        from werkzeug.serving import run_simple
+        print("⚠️ gunicorn이 없어 werkzeug 개발 서버로 실행합니다 (sendfile 미사용).")
+        run_simple("127.0.0.1", port, bench_app, threaded=True)
+        return
+
+    class BenchServer(BaseApplication):
+        def load_config(self):
+            self.cfg.set("bind", f"127.0.0.1:{port}")
+            self.cfg.set("workers", 1)
+            self.cfg.set("loglevel", "warning")
+
+        def load(self):
+            return bench_app
+
+    BenchServer().run()
+
+
+def wait_for_server(base_url, timeout=15):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            requests.get(f"{base_url}/sendfile", headers={"Range": "bytes=0-0"}, timeout=1)
+            return
+        except requests.RequestException:
+            time.sleep(0.1)
+    raise SystemExit("❌ 벤치마크 서버가 시작되지 않았습니다.")
+
+
+def fetch_with_curl(url, headers):
+    """파이썬 클라이언트가 병목이 되지 않도록 curl로 받고 받은 바이트 수를 반환합니다."""
+    command = ["curl", "-s", "-o", os.devnull, "-w", "%{http_code} %{size_download}", url]
+    for name, value in (headers or {}).items():
+        command += ["-H", f"{name}: {value}"]
+    status, received = subprocess.run(command, capture_output=True, text=True, check=True).stdout.split()
+    if status not in ["200", "206"]:
+        raise SystemExit(f"❌ 응답 오류: {url} {status}")
+    return int(received)
+
+
+def fetch_with_requests(session, url, headers):
+    received = 0
+    with session.get(url, headers=headers, stream=True, timeout=60) as response:
+        response.raise_for_status()
+        for chunk in response.iter_content(chunk_size=1024 * 1024):
+            received += len(chunk)
+    return received
+
+
+def measure(session, url, repeat, headers=None, expected=None):
+    timings = []
+    for _ in range(repeat):
+        started_at = time.perf_counter()
+        if shutil.which("curl"):
+            received = fetch_with_curl(url, headers)
+        else:
+            received = fetch_with_requests(session, url, headers)
+        timings.append(time.perf_counter() - started_at)
+        if expected is not None and received != expected:
+            raise SystemExit(f"❌ 응답 크기가 다릅니다: {url} {received} != {expected}")
+    best = min(timings)
+    return expected / best / (1024 * 1024), best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--size-mb", type=int, default=256)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    size = args.size_mb * 1024 * 1024
+    with tempfile.NamedTemporaryFile(prefix="bench-media-", delete=False) as f:
+        block = os.urandom(1024 * 1024)
+        for _ in range(args.size_mb):
+            f.write(block)
+        path = f.name
+
+    port = get_free_port()
+    server = multiprocessing.Process(target=run_server, args=(path, port), daemon=True)
+    server.start()
+    base_url = f"http://127.0.0.1:{port}"
+    try:
+        wait_for_server(base_url)
+        session = requests.Session()
+        range_start, range_end = size // 4, size // 2
+        cases = [
+            ("전체", None, size),
+            ("중간 구간", {"Range": f"bytes={range_start}-{range_end - 1}"}, range_end - range_start),
+            ("끝 구간", {"Range": f"bytes={range_end}-"}, size - range_end),
+        ]
+        print(f"파일: {args.size_mb}MB, 반복 {args.repeat}회")
+        for label, headers, expected in cases:
+            generator_rate, _ = measure(session, f"{base_url}/generator", args.repeat, headers, expected)
+            sendfile_rate, _ = measure(session, f"{base_url}/sendfile", args.repeat, headers, expected)
+            print(
+                f"{label}: 제너레이터 {generator_rate:.0f}MB/s, serve_local_file {sendfile_rate:.0f}MB/s "
+                f"({sendfile_rate / generator_rate:.2f}x)"
+            )
+    finally:
+        server.terminate()
+        server.join()
+        os.remove(path)
+
+
+if __name__ == "__main__":
+    main()
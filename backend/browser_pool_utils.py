@@ -0,0 +1,139 @@
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+
+# 워커 프로세스당 Chromium 수 (= 동시에 실행되는 최대 렌더링 수)
+PLAYWRIGHT_POOL_SIZE = max(1, int(os.getenv("PLAYWRIGHT_POOL_SIZE", "1")))
+# 브라우저 하나가 처리한 페이지 수가 이 값을 넘으면 메모리 회수를 위해 재시작합니다.
+PLAYWRIGHT_PAGES_PER_BROWSER = max(1, int(os.getenv("PLAYWRIGHT_PAGES_PER_BROWSER", "50")))
+# 실행 대기 중인 렌더링 요청 수 상한. 넘치면 즉시 실패시켜 fetch 방식으로 넘어갑니다.
+PLAYWRIGHT_MAX_QUEUED_RENDERS = max(1, int(os.getenv("PLAYWRIGHT_MAX_QUEUED_RENDERS", "8")))
+PLAYWRIGHT_RENDER_TIMEOUT_SECONDS = int(os.getenv("PLAYWRIGHT_RENDER_TIMEOUT_SECONDS", "120"))
+
+_pool = {"pid": None, "queue": None, "threads": []}
+_pool_lock = threading.Lock()
+
+def launch_browser(playwright):
+    return playwright.chromium.launch(
+        headless=True,
+        args=["--no-sandbox", "--disable-dev-shm-usage"]
+    )
+
+def close_browser(browser):
+    try:
+        browser.close()
+    except Exception as e:
+        print(f"⚠️ Playwright 브라우저 종료 실패: {e}")
+
+def stop_playwright(playwright):
+    try:
+        playwright.stop()
+    except Exception as e:
+        print(f"⚠️ Playwright 종료 실패: {e}")
+
+def run_browser_worker(index, render_queue):
+    """
+    브라우저 하나를 소유하는 전용 스레드입니다.
+    Playwright sync API 객체는 만든 스레드에서만 사용할 수 있으므로 렌더링도 이 스레드에서 실행합니다.
+    """
+    playwright = None
+    browser = None
+    rendered_pages = 0
+
+    try:
+        while True:
+            future, render_fn, args, deadline = render_queue.get()
+            if not future.set_running_or_notify_cancel():
+                continue
+            if time.monotonic() >= deadline:
+                # 대기열에서 기다리는 사이 호출자가 이미 포기한 요청입니다.
+                future.set_exception(TimeoutError("Playwright 렌더링 대기 시간이 초과되었습니다."))
+                continue
+
+            try:
+                if browser is None or not browser.is_connected():
+                    if playwright is None:
+                        from playwright.sync_api import sync_playwright
+                        playwright = sync_playwright().start()
+                    try:
+                        browser = launch_browser(playwright)
+                    except Exception:
+                        # 드라이버가 죽은 경우 다음 요청에서 Playwright부터 다시 시작합니다.
+                        stop_playwright(playwright)
+                        playwright = None
+                        raise
+                    rendered_pages = 0
+                    print(f"🎭 Playwright 브라우저 #{index} 시작")
+                future.set_result(render_fn(browser, *args, deadline=deadline))
+            except Exception as e:
+                future.set_exception(e)
+            finally:
+                rendered_pages += 1
+                if browser is not None and (
+                    not browser.is_connected() or rendered_pages >= PLAYWRIGHT_PAGES_PER_BROWSER
+                ):
+                    print(f"♻️ Playwright 브라우저 #{index} 재시작 ({rendered_pages}페이지 처리)")
+                    close_browser(browser)
+                    browser = None
+    finally:
+        if browser is not None:
+            close_browser(browser)
+        if playwright is not None:
+            stop_playwright(playwright)
+
+def ensure_browser_pool():
+    pid = os.getpid()
+    if _pool["pid"] == pid:
+        return _pool["queue"]
+
+    with _pool_lock:
+        # gunicorn 워커마다 별도 풀을 만듭니다 (fork 이전 스레드는 복제되지 않음).
+        if _pool["pid"] != pid:
+            render_queue = queue.Queue(maxsize=PLAYWRIGHT_MAX_QUEUED_RENDERS)
+            threads = [
+                threading.Thread(
+                    target=run_browser_worker,
+                    args=(index, render_queue),
+                    name=f"playwright-browser-{index}",
+                    daemon=True,
+                )
+                for index in range(PLAYWRIGHT_POOL_SIZE)
+            ]
+            for thread in threads:
+                thread.start()
+            _pool.update(pid=pid, queue=render_queue, threads=threads)
+    return _pool["queue"]
+
+def submit_render(render_fn, *args, timeout=PLAYWRIGHT_RENDER_TIMEOUT_SECONDS, discard_result=None):
+    """
+    render_fn(browser, *args, deadline=...)를 풀의 브라우저 스레드에서 실행하고 결과를 기다립니다.
+    render_fn은 요청마다 새 context를 만들고 끝나면 닫아야 하며,
+    deadline(time.monotonic 기준)이 지나면 작업을 멈추고 예외를 던져야 합니다.
+
+    Args:
+        discard_result: 시간 초과 뒤에 늦게 끝난 결과를 정리할 함수 (임시 파일 등)
+    """
+    future = Future()
+    deadline = time.monotonic() + timeout
+    try:
+        ensure_browser_pool().put_nowait((future, render_fn, args, deadline))
+    except queue.Full:
+        raise RuntimeError("Playwright 렌더링 대기열이 가득 찼습니다.")
+
+    try:
+        return future.result(timeout=timeout)
+    except FutureTimeoutError:
+        # 이미 실행 중인 렌더링은 취소할 수 없으므로 끝난 뒤 결과를 정리합니다.
+        if not future.cancel() and discard_result is not None:
+            future.add_done_callback(lambda done: discard_late_result(done, discard_result))
+        raise
+
+def discard_late_result(future, discard_result):
+    if future.cancelled() or future.exception() is not None:
+        return
+    try:
+        discard_result(future.result())
+    except Exception as e:
+        print(f"⚠️ 시간 초과된 렌더링 결과 정리 실패: {e}")
@@ -0,0 +1,192 @@
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+
+def create_lru_cache(max_bytes, disk_dir=None, disk_max_bytes=0):
+    """
+    크기 제한이 있는 바이트 LRU 캐시를 만듭니다.
+    disk_dir을 지정하면 메모리에서 밀려난 항목도 디스크 계층에서 다시 찾을 수 있습니다.
+    """
+    if disk_dir:
+        os.makedirs(disk_dir, exist_ok=True)
+
+    return {
+        "entries": OrderedDict(),
+        "bytes": 0,
+        "max_bytes": max_bytes,
+        "disk_dir": disk_dir or None,
+        "disk_max_bytes": disk_max_bytes,
+        # 디스크 계층 총량은 시작 시 한 번만 스캔하고 이후에는 메모리에서 추적합니다.
+        "disk_bytes": _disk_scan(disk_dir)[1] if disk_dir else 0,
+        "lock": threading.Lock(),
+        "hits": 0,
+        "misses": 0,
+    }
+
+def _disk_paths(cache, key):
+    digest = hashlib.sha256(key.encode("utf-8")).hexdigest()
+    base_path = os.path.join(cache["disk_dir"], digest)
+    return f"{base_path}.body", f"{base_path}.json"
+
+def _memory_put(cache, key, body, meta):
+    entries = cache["entries"]
+    previous = entries.pop(key, None)
+    if previous:
+        cache["bytes"] -= len(previous[0])
+
+    # 한 항목이 메모리 계층을 독점하지 않도록 큰 항목은 디스크에만 둡니다.
+    if len(body) > cache["max_bytes"] // 4:
+        return
+
+    entries[key] = (body, meta)
+    cache["bytes"] += len(body)
+    while cache["bytes"] > cache["max_bytes"] and entries:
+        _, (evicted_body, _) = entries.popitem(last=False)
+        cache["bytes"] -= len(evicted_body)
+
+def _disk_get(cache, key):
+    body_path, meta_path = _disk_paths(cache, key)
+    try:
+        with open(meta_path, "r", encoding="utf-8") as f:
+            meta = json.load(f)
+        with open(body_path, "rb") as f:
+            body = f.read()
+        os.utime(body_path)
+        return body, meta
+    except (OSError, ValueError):
+        return None
+
+def _disk_scan(disk_dir):
+    """디스크 계층의 본문 파일 목록 [(mtime, size, path)]과 총 바이트 수를 반환합니다."""
+    bodies = []
+    total_bytes = 0
+    for entry in os.scandir(disk_dir):
+        if entry.name.endswith(".body"):
+            try:
+                stat = entry.stat()
+            except OSError:
+                continue
+            bodies.append((stat.st_mtime, stat.st_size, entry.path))
+            total_bytes += stat.st_size
+    return bodies, total_bytes
+
+def _disk_put(cache, key, body, meta):
+    body_path, meta_path = _disk_paths(cache, key)
+    try:
+        try:
+            previous_size = os.path.getsize(body_path)
+        except OSError:
+            previous_size = 0
+
+        for path, data, mode in [(body_path, body, "wb"), (meta_path, json.dumps(meta), "w")]:
+            tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp_path, mode) as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+
+        with cache["lock"]:
+            cache["disk_bytes"] += len(body) - previous_size
+            over_limit = cache["disk_max_bytes"] and cache["disk_bytes"] > cache["disk_max_bytes"]
+        if over_limit:
+            _disk_evict(cache)
+    except OSError as e:
+        print(f"⚠️ 디스크 캐시 저장 실패: {e}")
+
+def _disk_evict(cache):
+    """
+    추적 중인 총량이 한도를 넘었을 때만 호출됩니다.
+    다른 워커 프로세스가 쓴 파일도 반영되도록 디렉터리를 다시 스캔하고,
+    한도의 90%까지 비워 직후의 put마다 스캔이 반복되지 않게 합니다.
+    """
+    bodies, total_bytes = _disk_scan(cache["disk_dir"])
+    target_bytes = cache["disk_max_bytes"] * 9 // 10
+
+    if total_bytes > cache["disk_max_bytes"]:
+        for _, size, body_path in sorted(bodies):
+            for path in [body_path, body_path[:-len(".body")] + ".json"]:
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+            total_bytes -= size
+            if total_bytes <= target_bytes:
+                break
+
+    with cache["lock"]:
+        cache["disk_bytes"] = total_bytes
+
+def cache_get(cache, key):
+    """(body, meta) 튜플을 반환하거나 없으면 None을 반환합니다."""
+    with cache["lock"]:
+        entry = cache["entries"].get(key)
+        if entry:
+            cache["entries"].move_to_end(key)
+            cache["hits"] += 1
+            return entry
+
+    if cache["disk_dir"]:
+        entry = _disk_get(cache, key)
+        if entry:
+            with cache["lock"]:
+                _memory_put(cache, key, *entry)
+                cache["hits"] += 1
+            return entry
+
+    with cache["lock"]:
+        cache["misses"] += 1
+    return None
+
+def cache_peek_meta(cache, key):
+    """
+    본문을 읽거나 LRU 순서·적중 통계를 바꾸지 않고 메타데이터만 확인합니다.
+    같은 본문을 다시 저장할 필요가 있는지 판단할 때 사용합니다.
+    """
+    with cache["lock"]:
+        entry = cache["entries"].get(key)
+        if entry:
+            return entry[1]
+
+    if cache["disk_dir"]:
+        _, meta_path = _disk_paths(cache, key)
+        try:
+            with open(meta_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            pass
+    return None
+
+def cache_put(cache, key, body, meta):
+    with cache["lock"]:
+        _memory_put(cache, key, body, meta)
+    if cache["disk_dir"]:
+        _disk_put(cache, key, body, meta)
+
+def cache_update_meta(cache, key, meta):
+    """본문은 그대로 두고 메타데이터만 갱신합니다 (예: 304 재검증 후 만료 시각 연장)."""
+    with cache["lock"]:
+        entry = cache["entries"].get(key)
+        if entry:
+            cache["entries"][key] = (entry[0], meta)
+
+    if cache["disk_dir"]:
+        _, meta_path = _disk_paths(cache, key)
+        if os.path.exists(meta_path):
+            try:
+                tmp_path = f"{meta_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+                with open(tmp_path, "w") as f:
+                    f.write(json.dumps(meta))
+                os.replace(tmp_path, meta_path)
+            except OSError as e:
+                print(f"⚠️ 디스크 캐시 메타데이터 갱신 실패: {e}")
+
+def cache_stats(cache):
+    with cache["lock"]:
+        return {
+            "entries": len(cache["entries"]),
+            "bytes": cache["bytes"],
+            "hits": cache["hits"],
+            "misses": cache["misses"],
+            "disk_bytes": cache["disk_bytes"],
+        }
@@ -0,0 +1,64 @@
+import os
+import shutil
+import tempfile
+from urllib.parse import urldefrag
+
+# 캡처 응답 본문을 메모리에 둘 최대 크기. 넘치는 본문은 임시 디렉터리에 기록합니다.
+CAPTURE_STORE_MEMORY_BYTES = int(os.getenv("PLAYWRIGHT_CAPTURE_MEMORY_BYTES", str(32 * 1024 * 1024)))
+CAPTURE_STORE_SPILL_DIR = os.getenv("PLAYWRIGHT_CAPTURE_SPILL_DIR") or tempfile.gettempdir()
+
+def create_capture_store():
+    """
+    Playwright 캡처 중 브라우저가 받은 응답을 URL 기준으로 보관하는 저장소를 만듭니다.
+    사용이 끝나면 close_capture_store로 임시 파일을 정리해야 합니다.
+    """
+    return {
+        "entries": {},
+        "memory_bytes": 0,
+        "total_bytes": 0,
+        "spill_dir": None,
+    }
+
+def put_captured_response(store, url, body, headers):
+    key = urldefrag(url)[0]
+    if key in store["entries"]:
+        return
+
+    entry = {"headers": headers, "size": len(body)}
+    if store["memory_bytes"] + len(body) <= CAPTURE_STORE_MEMORY_BYTES:
+        entry["body"] = body
+        store["memory_bytes"] += len(body)
+    else:
+        if store["spill_dir"] is None:
+            store["spill_dir"] = tempfile.mkdtemp(prefix="archive-capture-", dir=CAPTURE_STORE_SPILL_DIR)
+        entry["path"] = os.path.join(store["spill_dir"], f"{len(store['entries'])}.bin")
+        with open(entry["path"], "wb") as f:
+            f.write(body)
+
+    store["entries"][key] = entry
+    store["total_bytes"] += len(body)
+
+def get_captured_response(store, url):
+    """(body, headers) 튜플을 반환하거나 기록된 응답이 없으면 None을 반환합니다."""
+    if not store:
+        return None
+
+    entry = store["entries"].get(urldefrag(url)[0])
+    if not entry:
+        return None
+
+    if "body" in entry:
+        return entry["body"], entry["headers"]
+
+    try:
+        with open(entry["path"], "rb") as f:
+            return f.read(), entry["headers"]
+    except OSError:
+        return None
+
+def close_capture_store(store):
+    if store and store["spill_dir"]:
+        shutil.rmtree(store["spill_dir"], ignore_errors=True)
+        store["spill_dir"] = None
+    if store:
+        store["entries"].clear()
@@ -0,0 +1,99 @@
+import gzip
+import io
+import os
+import zlib
+
+# 아카이브 HTML 저장 압축 방식: none, gzip, br, zstd
+ARCHIVE_STORAGE_COMPRESSION = os.getenv("ARCHIVE_STORAGE_COMPRESSION", "none").strip().lower()
+
+# Content-Encoding 이름 -> 저장 파일 접미사
+ENCODING_SUFFIXES = {
+    "gzip": ".gz",
+    "br": ".br",
+    "zstd": ".zst",
+}
+
+def _load_codec(encoding):
+    """선택 의존성(brotli, zstandard)을 불러옵니다. 설치되어 있지 않으면 None을 반환합니다."""
+    try:
+        if encoding == "br":
+            import brotli
+            return brotli
+        if encoding == "zstd":
+            import zstandard
+            return zstandard
+    except ImportError:
+        return None
+    return gzip
+
+def resolve_storage_compression(name=None):
+    """
+    설정된 압축 방식을 실제로 쓸 수 있는 Content-Encoding 이름으로 바꿉니다.
+
+    Returns:
+        "gzip", "br", "zstd" 또는 압축하지 않으면 None
+    """
+    name = (name or ARCHIVE_STORAGE_COMPRESSION).strip().lower()
+    if name in ["", "none", "identity"]:
+        return None
+    if name not in ENCODING_SUFFIXES:
+        print(f"⚠️ 알 수 없는 압축 방식입니다: {name}, 압축하지 않습니다.")
+        return None
+    if _load_codec(name) is None:
+        print(f"⚠️ {name} 압축 모듈이 없어 gzip으로 저장합니다.")
+        return "gzip"
+    return name
+
+def decompress_bytes(data, encoding):
+    if encoding == "gzip":
+        return gzip.decompress(data)
+    if encoding == "br":
+        return _load_codec("br").decompress(data)
+    if encoding == "zstd":
+        # 스트리밍 압축본은 프레임 헤더에 원본 크기가 없으므로 decompressobj로 풉니다.
+        return _load_codec("zstd").ZstdDecompressor().decompressobj().decompress(data)
+    return data
+
+def decompress_prefix(data, encoding, max_bytes):
+    """압축본에서 앞부분 최대 max_bytes만 풀어 반환합니다 (전체를 풀지 않고 표시만 확인할 때 사용)."""
+    if encoding == "gzip":
+        return zlib.decompressobj(16 + zlib.MAX_WBITS).decompress(data, max_bytes)
+    if encoding == "zstd":
+        reader = _load_codec("zstd").ZstdDecompressor().stream_reader(io.BytesIO(data))
+        pieces = []
+        remaining = max_bytes
+        while remaining > 0:
+            piece = reader.read(remaining)
+            if not piece:
+                break
+            pieces.append(piece)
+            remaining -= len(piece)
+        return b"".join(pieces)
+    # brotli 모듈은 버전에 따라 출력 크기 제한을 지원하지 않아 전체를 풉니다.
+    return decompress_bytes(data, encoding)[:max_bytes]
+
+def compress_bytes(data, encoding):
+    return b"".join(iter_compressed_chunks([data], encoding))
+
+def iter_compressed_chunks(chunks, encoding):
+    """바이트 조각 이터레이터를 전체를 메모리에 모으지 않고 압축합니다."""
+    if encoding == "gzip":
+        compressor = zlib.compressobj(6, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+        process, finish = compressor.compress, compressor.flush
+    elif encoding == "br":
+        compressor = _load_codec("br").Compressor(quality=5)
+        process, finish = compressor.process, compressor.finish
+    elif encoding == "zstd":
+        compressor = _load_codec("zstd").ZstdCompressor(level=9).compressobj()
+        process, finish = compressor.compress, compressor.flush
+    else:
+        yield from chunks
+        return
+
+    for chunk in chunks:
+        compressed = process(chunk)
+        if compressed:
+            yield compressed
+    compressed = finish()
+    if compressed:
+        yield compressed
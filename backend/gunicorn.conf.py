@@ -0,0 +1,8 @@
+# gunicorn은 실행 디렉터리의 gunicorn.conf.py를 자동으로 읽습니다 (Dockerfile은 백엔드 디렉터리에서 실행합니다).
+
+
+def post_worker_init(worker):
+    """워커 프로세스가 앱을 불러온 뒤 그 프로세스의 백그라운드 저장 작업 스레드를 시작합니다."""
+    from app import start_save_job_workers
+
+    start_save_job_workers()
@@ -0,0 +1,104 @@
+import os
+import re
+
+from bs4 import BeautifulSoup, FeatureNotFound
+
+# BeautifulSoup 트리 빌더: html.parser(기본), lxml, auto(lxml이 있으면 lxml)
+# lxml은 실제 저장 페이지로 결과 동등성을 검증하기 전까지 명시적으로 켠 경우에만 사용합니다.
+HTML_PARSER = os.getenv("HTML_PARSER", "html.parser").strip().lower()
+# 보안 페이지 감지처럼 텍스트만 읽는 경로의 추출기: bs4(기본), selectolax(lexbor), auto(selectolax가 있으면 selectolax)
+# selectolax도 lxml과 마찬가지로 명시적으로 켠 경우에만 사용합니다. 동등성은 tests/test_html_conformance.py로 확인합니다.
+HTML_TEXT_EXTRACTOR = os.getenv("HTML_TEXT_EXTRACTOR", "bs4").strip().lower()
+# BeautifulSoup get_text가 본문 텍스트에서 빼는 태그 (noscript 내용은 텍스트로 남깁니다)
+TEXT_EXCLUDED_TAGS = ["script", "style", "template"]
+
+# libxml2는 이 길이를 넘는 속성 값을 오류 없이 빈 값으로 만듭니다 (큰 base64 data URI 등).
+LXML_MAX_ATTRIBUTE_CHARS = 10_000_000
+DATA_URI_PATTERN = re.compile(r"data:[^\"'>\s]*")
+
+_resolved = {}
+
+def get_html_parser():
+    """설정과 설치된 패키지를 보고 BeautifulSoup 트리 빌더 이름을 정합니다."""
+    parser = _resolved.get("parser")
+    if parser:
+        return parser
+
+    parser = "html.parser"
+    if HTML_PARSER in ["auto", "lxml"]:
+        try:
+            BeautifulSoup("", "lxml")
+            parser = "lxml"
+        except FeatureNotFound:
+            if HTML_PARSER == "lxml":
+                print("⚠️ HTML_PARSER=lxml 이지만 lxml이 설치되어 있지 않아 html.parser를 사용합니다.")
+    elif HTML_PARSER != "html.parser":
+        print(f"⚠️ 알 수 없는 HTML_PARSER 값입니다: {HTML_PARSER}, html.parser를 사용합니다.")
+
+    _resolved["parser"] = parser
+    print(f"ℹ️ HTML 파서: {parser}")
+    return parser
+
+def has_oversized_data_uri(html):
+    """lxml이 잘라낼 만큼 긴 data: 속성 값이 있는지 선형 탐색으로 확인합니다."""
+    if len(html) <= LXML_MAX_ATTRIBUTE_CHARS:
+        return False
+
+    return any(
+        match.end() - match.start() > LXML_MAX_ATTRIBUTE_CHARS
+        for match in DATA_URI_PATTERN.finditer(html)
+    )
+
+def parse_html(html, parser=None):
+    """
+    설정된 파서로 BeautifulSoup 트리를 만듭니다.
+    lxml로는 보존할 수 없는 문서는 html.parser로 파싱합니다.
+    """
+    parser = parser or get_html_parser()
+    if parser == "lxml" and isinstance(html, str) and has_oversized_data_uri(html):
+        parser = "html.parser"
+    return BeautifulSoup(html, parser)
+
+def get_text_extractor():
+    extractor = _resolved.get("extractor")
+    if extractor:
+        return extractor
+
+    extractor = "bs4"
+    if HTML_TEXT_EXTRACTOR in ["auto", "selectolax"]:
+        try:
+            from selectolax.lexbor import LexborHTMLParser  # noqa: F401
+            extractor = "selectolax"
+        except ImportError:
+            if HTML_TEXT_EXTRACTOR == "selectolax":
+                print("⚠️ selectolax가 설치되어 있지 않아 BeautifulSoup으로 텍스트를 추출합니다.")
+    elif HTML_TEXT_EXTRACTOR != "bs4":
+        print(f"⚠️ 알 수 없는 HTML_TEXT_EXTRACTOR 값입니다: {HTML_TEXT_EXTRACTOR}, BeautifulSoup을 사용합니다.")
+
+    _resolved["extractor"] = extractor
+    return extractor
+
+def extract_title_and_text(html):
+    """
+    문서의 제목과 본문 텍스트를 공백 하나로 이어 붙여 반환합니다.
+    HTML_TEXT_EXTRACTOR로 selectolax를 켜면 트리를 수정하지 않는 이 경로만 selectolax로 읽습니다.
+    어느 쪽이든 BeautifulSoup get_text처럼 script/style/template 내용은 빼고 noscript 내용은 남깁니다.
+
+    Returns:
+        (title_text, body_text) 튜플
+    """
+    if get_text_extractor() == "selectolax":
+        from selectolax.lexbor import LexborHTMLParser
+
+        tree = LexborHTMLParser(html)
+        title = tree.css_first("title")
+        title_text = title.text(separator=" ", strip=True) if title else ""
+        tree.strip_tags(TEXT_EXCLUDED_TAGS)
+        root = tree.body or tree.root
+        body_text = root.text(separator=" ", strip=True) if root else ""
+        return title_text, body_text
+
+    soup = parse_html(html)
+    title_text = soup.title.get_text(" ", strip=True) if soup.title else ""
+    body_text = soup.body.get_text(" ", strip=True) if soup.body else soup.get_text(" ", strip=True)
+    return title_text, body_text
@@ -0,0 +1,92 @@
+import os
+import threading
+from http.cookiejar import DefaultCookiePolicy
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# 호스트별 커넥션 풀 수와 풀당 최대 커넥션 수
+HTTP_POOL_CONNECTIONS = int(os.getenv("HTTP_POOL_CONNECTIONS", "32"))
+HTTP_POOL_MAXSIZE = int(os.getenv("HTTP_POOL_MAXSIZE", "16"))
+HTTP_RETRY_TOTAL = int(os.getenv("HTTP_RETRY_TOTAL", "3"))
+HTTP_RETRY_BACKOFF = float(os.getenv("HTTP_RETRY_BACKOFF", "0.5"))
+HTTP_RETRY_STATUSES = (429, 500, 502, 503, 504)
+# 서버가 보낸 Retry-After를 따르되 저장 작업이 오래 묶이지 않도록 대기 시간을 제한합니다.
+HTTP_RETRY_AFTER_MAX_SECONDS = float(os.getenv("HTTP_RETRY_AFTER_MAX_SECONDS", "10"))
+
+_session = None
+_session_lock = threading.Lock()
+
+class BoundedRetry(Retry):
+    """Retry-After 대기 시간을 HTTP_RETRY_AFTER_MAX_SECONDS로 제한하는 Retry."""
+
+    def get_retry_after(self, response):
+        retry_after = super().get_retry_after(response)
+        if retry_after is None:
+            return None
+        return min(retry_after, HTTP_RETRY_AFTER_MAX_SECONDS)
+
+def create_http_session():
+    retry = BoundedRetry(
+        total=HTTP_RETRY_TOTAL,
+        backoff_factor=HTTP_RETRY_BACKOFF,
+        status_forcelist=HTTP_RETRY_STATUSES,
+        # POST(Raindrop 저장, 업로드 등)는 중복 실행 위험이 있어 재시도하지 않습니다.
+        allowed_methods=frozenset(["GET", "HEAD", "OPTIONS"]),
+        respect_retry_after_header=True,
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(
+        pool_connections=HTTP_POOL_CONNECTIONS,
+        pool_maxsize=HTTP_POOL_MAXSIZE,
+        max_retries=retry,
+    )
+
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    # 여러 사용자의 요청이 같은 세션을 공유하므로 사이트 쿠키를 저장하지 않습니다.
+    session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+    return session
+
+def get_http_session():
+    """프로세스 공용 keep-alive 세션을 반환합니다."""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                _session = create_http_session()
+    return _session
+
+def get_http_pool_stats():
+    """
+    호스트별 요청 수와 새로 연 커넥션 수를 집계합니다.
+    requests - connections 가 커넥션 재사용 횟수입니다.
+    """
+    stats = {"hosts": 0, "requests": 0, "connections": 0}
+    if _session is None:
+        return stats
+
+    seen_adapters = set()
+    for adapter in _session.adapters.values():
+        if id(adapter) in seen_adapters:
+            continue
+        seen_adapters.add(id(adapter))
+
+        pools = adapter.poolmanager.pools
+        with pools.lock:
+            pool_list = list(pools._container.values())
+        for pool in pool_list:
+            stats["hosts"] += 1
+            stats["requests"] += pool.num_requests
+            stats["connections"] += pool.num_connections
+    return stats
+
+def format_http_pool_stats():
+    stats = get_http_pool_stats()
+    reused = max(0, stats["requests"] - stats["connections"])
+    return (
+        f"HTTP 요청 {stats['requests']}회, 새 커넥션 {stats['connections']}개, "
+        f"재사용 {reused}회, 호스트 {stats['hosts']}개"
+    )
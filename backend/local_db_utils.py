@@ -0,0 +1,31 @@
+import os
+import sqlite3
+import threading
+
+# 워커 프로세스 간에 공유되는 로컬 SQLite 파일 위치
+LOCAL_DB_DIR = os.getenv("LOCAL_DB_DIR", "/tmp/archive-saver")
+
+_thread_local = threading.local()
+
+def get_local_db_path(filename):
+    os.makedirs(LOCAL_DB_DIR, exist_ok=True)
+    return os.path.join(LOCAL_DB_DIR, filename)
+
+def get_local_db(filename, schema_sql):
+    """
+    스레드별 SQLite 연결을 반환합니다.
+    연결은 autocommit 모드이며, 스키마는 연결을 처음 만들 때 한 번 적용합니다.
+    """
+    connections = getattr(_thread_local, "connections", None)
+    if connections is None:
+        connections = _thread_local.connections = {}
+
+    conn = connections.get(filename)
+    if conn is None:
+        conn = sqlite3.connect(get_local_db_path(filename), timeout=30, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.executescript(schema_sql)
+        connections[filename] = conn
+    return conn
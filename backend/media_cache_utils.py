@@ -0,0 +1,299 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from uuid import uuid4
+
+from local_db_utils import get_local_db
+
+# /archive-media 프록시 응답을 보관할 로컬 디스크 캐시. 디렉터리를 지정하지 않으면 사용하지 않습니다.
+MEDIA_EDGE_CACHE_DIR = os.getenv("MEDIA_EDGE_CACHE_DIR", "")
+MEDIA_EDGE_CACHE_MAX_BYTES = int(os.getenv("MEDIA_EDGE_CACHE_MAX_BYTES", str(2 * 1024 * 1024 * 1024)))
+# 조회마다 DB에 쓰지 않도록 마지막 사용 시각은 이 간격보다 자주 갱신하지 않습니다.
+MEDIA_EDGE_CACHE_TOUCH_SECONDS = 60
+
+# 항목별 채움 구간과 전체 사용량을 워커 프로세스 간에 공유합니다.
+MEDIA_EDGE_CACHE_DB = "media_edge_cache.sqlite3"
+MEDIA_EDGE_CACHE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS media_cache_entries (
+    key TEXT PRIMARY KEY,
+    data_file TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    content_type TEXT,
+    etag TEXT,
+    filled TEXT NOT NULL,
+    filled_bytes INTEGER NOT NULL,
+    accessed_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS media_cache_entries_accessed_at ON media_cache_entries (accessed_at);
+CREATE TABLE IF NOT EXISTS media_cache_usage (
+    id INTEGER PRIMARY KEY CHECK (id = 1),
+    used_bytes INTEGER NOT NULL
+);
+INSERT OR IGNORE INTO media_cache_usage (id, used_bytes) VALUES (1, 0);
+"""
+
+def create_media_cache(cache_dir=None, max_bytes=None):
+    """
+    미디어 원본을 파일 단위로 보관하는 디스크 LRU 캐시를 만듭니다.
+    본문은 원본 크기의 희소 파일에 받은 구간만 채우고, 채운 구간과 전체 사용량은 SQLite에 기록합니다.
+    """
+    cache_dir = MEDIA_EDGE_CACHE_DIR if cache_dir is None else cache_dir
+    if cache_dir:
+        os.makedirs(cache_dir, exist_ok=True)
+
+    return {
+        "dir": cache_dir or None,
+        "max_bytes": MEDIA_EDGE_CACHE_MAX_BYTES if max_bytes is None else max_bytes,
+        "lock": threading.Lock(),
+        "hits": 0,
+        "partial_hits": 0,
+        "misses": 0,
+    }
+
+def _get_db():
+    return get_local_db(MEDIA_EDGE_CACHE_DB, MEDIA_EDGE_CACHE_SCHEMA)
+
+def _entry_key(key):
+    return hashlib.sha256(key.encode("utf-8")).hexdigest()
+
+def _row_to_meta(row):
+    return {
+        "data_file": row["data_file"],
+        "size": row["size"],
+        "content_type": row["content_type"],
+        "etag": row["etag"],
+        "filled": json.loads(row["filled"]),
+        "accessed_at": row["accessed_at"],
+    }
+
+def _remove_data_file(cache, data_file):
+    # 이미 이 파일을 열어 응답 중인 요청은 지워진 뒤에도 끝까지 읽을 수 있습니다.
+    try:
+        os.remove(os.path.join(cache["dir"], data_file))
+    except OSError:
+        pass
+
+def get_media_cache_data_path(cache, meta):
+    return os.path.join(cache["dir"], meta["data_file"])
+
+def merge_filled_ranges(ranges, start, end):
+    """[start, end) 구간을 정렬된 채움 구간 목록에 합칩니다."""
+    merged = []
+    for range_start, range_end in sorted(list(ranges) + [[start, end]]):
+        if merged and range_start <= merged[-1][1]:
+            merged[-1][1] = max(merged[-1][1], range_end)
+        else:
+            merged.append([range_start, range_end])
+    return merged
+
+def is_range_filled(meta, start, end):
+    return any(range_start <= start and end <= range_end for range_start, range_end in meta["filled"])
+
+def is_fully_filled(meta):
+    return is_range_filled(meta, 0, meta["size"]) if meta["size"] else True
+
+def get_media_cache_entry(cache, key):
+    """캐시에 있는 항목의 메타데이터를 반환하거나 없으면 None을 반환합니다."""
+    if not cache["dir"]:
+        return None
+
+    row = _get_db().execute(
+        "SELECT data_file, size, content_type, etag, filled, accessed_at FROM media_cache_entries WHERE key = ?",
+        (_entry_key(key),)
+    ).fetchone()
+    return _row_to_meta(row) if row else None
+
+def record_media_cache_lookup(cache, stat):
+    with cache["lock"]:
+        cache[stat] += 1
+
+def touch_media_cache_entry(cache, key, meta):
+    now = time.time()
+    if now - meta["accessed_at"] < MEDIA_EDGE_CACHE_TOUCH_SECONDS:
+        return
+    _get_db().execute(
+        "UPDATE media_cache_entries SET accessed_at = ? WHERE key = ?",
+        (now, _entry_key(key))
+    )
+
+def open_media_cache_entry(cache, key, size, content_type=None, etag=None):
+    """
+    원본 크기만큼의 희소 파일을 준비하고 메타데이터를 반환합니다.
+    같은 키에 크기나 ETag가 다른 항목이 있으면 원본이 바뀐 것으로 보고 새 파일로 교체합니다.
+    기존 파일은 제자리에서 비우지 않으므로 그 파일로 응답 중인 요청은 영향을 받지 않습니다.
+
+    Returns:
+        메타데이터 딕셔너리, 캐시할 수 없는 크기면 None
+    """
+    if not cache["dir"] or size is None or size > cache["max_bytes"] // 4:
+        return None
+
+    meta = get_media_cache_entry(cache, key)
+    if meta and meta["size"] == size and meta["etag"] == etag:
+        return meta
+
+    entry_key = _entry_key(key)
+    data_file = f"{entry_key}.{uuid4().hex[:12]}.data"
+    try:
+        with open(os.path.join(cache["dir"], data_file), "wb") as f:
+            f.truncate(size)
+    except OSError as e:
+        print(f"⚠️ 미디어 캐시 항목 생성 실패: {e}")
+        return None
+
+    db = _get_db()
+    now = time.time()
+    db.execute("BEGIN IMMEDIATE")
+    try:
+        row = db.execute(
+            "SELECT data_file, size, content_type, etag, filled, filled_bytes, accessed_at "
+            "FROM media_cache_entries WHERE key = ?",
+            (entry_key,)
+        ).fetchone()
+        # 다른 워커가 같은 원본으로 먼저 만들었으면 그 항목을 씁니다.
+        if row and row["size"] == size and row["etag"] == etag:
+            db.execute("COMMIT")
+            _remove_data_file(cache, data_file)
+            return _row_to_meta(row)
+
+        db.execute(
+            "INSERT OR REPLACE INTO media_cache_entries "
+            "(key, data_file, size, content_type, etag, filled, filled_bytes, accessed_at) "
+            "VALUES (?, ?, ?, ?, ?, '[]', 0, ?)",
+            (entry_key, data_file, size, content_type, etag, now)
+        )
+        if row:
+            db.execute("UPDATE media_cache_usage SET used_bytes = used_bytes - ? WHERE id = 1", (row["filled_bytes"],))
+        db.execute("COMMIT")
+    except Exception:
+        db.execute("ROLLBACK")
+        _remove_data_file(cache, data_file)
+        raise
+
+    if row:
+        _remove_data_file(cache, row["data_file"])
+    return {
+        "data_file": data_file,
+        "size": size,
+        "content_type": content_type,
+        "etag": etag,
+        "filled": [],
+        "accessed_at": now,
+    }
+
+def record_filled_range(cache, key, meta, start, end):
+    if end <= start:
+        return
+
+    entry_key = _entry_key(key)
+    db = _get_db()
+    db.execute("BEGIN IMMEDIATE")
+    try:
+        row = db.execute(
+            "SELECT data_file, size, filled, filled_bytes FROM media_cache_entries WHERE key = ?",
+            (entry_key,)
+        ).fetchone()
+        # 채우는 동안 항목이 밀려났거나 다른 원본으로 교체되었으면 기록하지 않습니다.
+        if row is None or row["data_file"] != meta["data_file"]:
+            db.execute("COMMIT")
+            return
+
+        filled = merge_filled_ranges(json.loads(row["filled"]), start, min(end, row["size"]))
+        filled_bytes = sum(range_end - range_start for range_start, range_end in filled)
+        db.execute(
+            "UPDATE media_cache_entries SET filled = ?, filled_bytes = ?, accessed_at = ? WHERE key = ?",
+            (json.dumps(filled), filled_bytes, time.time(), entry_key)
+        )
+        db.execute(
+            "UPDATE media_cache_usage SET used_bytes = used_bytes + ? WHERE id = 1",
+            (filled_bytes - row["filled_bytes"],)
+        )
+        db.execute("COMMIT")
+    except Exception as e:
+        db.execute("ROLLBACK")
+        print(f"⚠️ 미디어 캐시 메타데이터 갱신 실패: {e}")
+        return
+
+    _evict_media_cache(cache)
+
+def iter_media_cache_fill(cache, key, meta, chunks, offset):
+    """
+    원본 응답 조각을 그대로 흘려보내면서 희소 파일의 offset 위치부터 기록합니다.
+    클라이언트가 중간에 끊어도 그때까지 받은 구간은 채워진 것으로 남깁니다.
+    """
+    written = 0
+    try:
+        fd = os.open(get_media_cache_data_path(cache, meta), os.O_WRONLY)
+    except OSError:
+        yield from chunks
+        return
+
+    try:
+        for chunk in chunks:
+            if fd is not None:
+                try:
+                    os.pwrite(fd, chunk, offset + written)
+                except OSError as e:
+                    print(f"⚠️ 미디어 캐시 기록 실패: {e}")
+                    os.close(fd)
+                    fd = None
+            if fd is not None:
+                written += len(chunk)
+            yield chunk
+    finally:
+        if fd is not None:
+            os.close(fd)
+            record_filled_range(cache, key, meta, offset, offset + written)
+
+def iter_file_range(path, start, end, chunk_size=1024 * 256):
+    with open(path, "rb") as f:
+        f.seek(start)
+        remaining = end - start
+        while remaining > 0:
+            chunk = f.read(min(chunk_size, remaining))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+            yield chunk
+
+def _evict_media_cache(cache):
+    """DB의 누적 사용량(채운 바이트)이 한도를 넘으면 오래 쓰지 않은 항목부터 지웁니다."""
+    db = _get_db()
+    used_bytes = db.execute("SELECT used_bytes FROM media_cache_usage WHERE id = 1").fetchone()["used_bytes"]
+    if used_bytes <= cache["max_bytes"]:
+        return
+
+    evicted_files = []
+    db.execute("BEGIN IMMEDIATE")
+    try:
+        used_bytes = db.execute("SELECT used_bytes FROM media_cache_usage WHERE id = 1").fetchone()["used_bytes"]
+        while used_bytes > cache["max_bytes"]:
+            rows = db.execute(
+                "SELECT key, data_file, filled_bytes FROM media_cache_entries ORDER BY accessed_at LIMIT 32"
+            ).fetchall()
+            if not rows:
+                break
+            for row in rows:
+                db.execute("DELETE FROM media_cache_entries WHERE key = ?", (row["key"],))
+                used_bytes -= row["filled_bytes"]
+                evicted_files.append(row["data_file"])
+                if used_bytes <= cache["max_bytes"]:
+                    break
+        db.execute("UPDATE media_cache_usage SET used_bytes = ? WHERE id = 1", (max(used_bytes, 0),))
+        db.execute("COMMIT")
+    except Exception:
+        db.execute("ROLLBACK")
+        raise
+
+    for data_file in evicted_files:
+        _remove_data_file(cache, data_file)
+
+def media_cache_stats(cache):
+    with cache["lock"]:
+        return {
+            "hits": cache["hits"],
+            "partial_hits": cache["partial_hits"],
+            "misses": cache["misses"],
+        }
@@ -0,0 +1,212 @@
+import json
+import os
+import threading
+import time
+from uuid import uuid4
+
+from local_db_utils import get_local_db
+
+# 워커 프로세스당 백그라운드 저장 작업 스레드 수
+SAVE_JOB_WORKERS = max(0, int(os.getenv("SAVE_JOB_WORKERS", "1")))
+SAVE_JOB_POLL_SECONDS = float(os.getenv("SAVE_JOB_POLL_SECONDS", "2"))
+# 이 시간 동안 진행 상황 갱신이 없는 running 작업은 워커가 죽은 것으로 보고 다시 실행합니다.
+SAVE_JOB_STALE_SECONDS = int(os.getenv("SAVE_JOB_STALE_SECONDS", "900"))
+SAVE_JOB_MAX_ATTEMPTS = max(1, int(os.getenv("SAVE_JOB_MAX_ATTEMPTS", "2")))
+# 실행 중인 작업은 이 간격으로 updated_at을 갱신해 느린 작업이 멈춘 것으로 오인되지 않게 합니다.
+SAVE_JOB_HEARTBEAT_SECONDS = max(1, SAVE_JOB_STALE_SECONDS // 3)
+# 이 시간을 넘긴 작업은 더 이상 갱신하지 않아, 실제로 멈춘 작업은 결국 다시 실행되거나 실패 처리됩니다.
+SAVE_JOB_MAX_RUN_SECONDS = int(os.getenv("SAVE_JOB_MAX_RUN_SECONDS", "3600"))
+
+SAVE_JOBS_DB = "save_jobs.sqlite3"
+SAVE_JOBS_SCHEMA = """
+CREATE TABLE IF NOT EXISTS save_jobs (
+    id TEXT PRIMARY KEY,
+    status TEXT NOT NULL,
+    phase TEXT,
+    payload TEXT NOT NULL,
+    progress TEXT,
+    result TEXT,
+    error TEXT,
+    status_code INTEGER,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS save_jobs_status_created ON save_jobs (status, created_at);
+CREATE TABLE IF NOT EXISTS save_job_checkpoints (
+    job_id TEXT PRIMARY KEY,
+    result TEXT NOT NULL,
+    created_at REAL NOT NULL
+);
+"""
+
+_workers = {"pid": None, "threads": []}
+_workers_lock = threading.Lock()
+_job_available = threading.Event()
+
+def get_save_jobs_db():
+    return get_local_db(SAVE_JOBS_DB, SAVE_JOBS_SCHEMA)
+
+def enqueue_save_job(payload):
+    job_id = str(uuid4())
+    now = time.time()
+    get_save_jobs_db().execute(
+        "INSERT INTO save_jobs (id, status, phase, payload, progress, created_at, updated_at) "
+        "VALUES (?, 'queued', 'queued', ?, '{}', ?, ?)",
+        (job_id, json.dumps(payload), now, now)
+    )
+    _job_available.set()
+    return job_id
+
+def claim_save_job():
+    """
+    가장 오래된 대기 작업(또는 멈춘 작업)을 running으로 바꾸고 반환합니다.
+    여러 gunicorn 워커가 같은 DB를 공유하므로 BEGIN IMMEDIATE로 선점합니다.
+    """
+    db = get_save_jobs_db()
+    now = time.time()
+    db.execute("BEGIN IMMEDIATE")
+    try:
+        db.execute(
+            "UPDATE save_jobs SET status = 'failed', error = ?, status_code = 500, payload = '{}', updated_at = ? "
+            "WHERE status = 'running' AND updated_at < ? AND attempts >= ?",
+            ("저장 작업이 응답 없이 중단되었습니다.", now, now - SAVE_JOB_STALE_SECONDS, SAVE_JOB_MAX_ATTEMPTS)
+        )
+        row = db.execute(
+            "SELECT id, payload, attempts FROM save_jobs "
+            "WHERE status = 'queued' OR (status = 'running' AND updated_at < ?) "
+            "ORDER BY created_at LIMIT 1",
+            (now - SAVE_JOB_STALE_SECONDS,)
+        ).fetchone()
+        if row:
+            db.execute(
+                "UPDATE save_jobs SET status = 'running', phase = 'started', attempts = attempts + 1, updated_at = ? "
+                "WHERE id = ?",
+                (now, row["id"])
+            )
+        db.execute("COMMIT")
+    except Exception:
+        db.execute("ROLLBACK")
+        raise
+
+    if not row:
+        return None
+    return {"id": row["id"], "payload": json.loads(row["payload"]), "attempts": row["attempts"] + 1}
+
+def update_save_job_progress(job_id, phase, progress=None):
+    get_save_jobs_db().execute(
+        "UPDATE save_jobs SET phase = ?, progress = ?, updated_at = ? WHERE id = ? AND status = 'running'",
+        (phase, json.dumps(progress or {}), time.time(), job_id)
+    )
+
+def extend_save_job_lease(job_id):
+    get_save_jobs_db().execute(
+        "UPDATE save_jobs SET updated_at = ? WHERE id = ? AND status = 'running'",
+        (time.time(), job_id)
+    )
+
+def record_save_job_checkpoint(job_id, result):
+    """
+    되돌릴 수 없는 외부 저장(Raindrop 등)이 끝났음을 기록합니다.
+    작업이 다시 실행되면 handle_job이 이 결과로 바로 완료 처리해 중복 저장을 막습니다.
+    """
+    get_save_jobs_db().execute(
+        "INSERT OR REPLACE INTO save_job_checkpoints (job_id, result, created_at) VALUES (?, ?, ?)",
+        (job_id, json.dumps(result), time.time())
+    )
+
+def get_save_job_checkpoint(job_id):
+    row = get_save_jobs_db().execute(
+        "SELECT result FROM save_job_checkpoints WHERE job_id = ?",
+        (job_id,)
+    ).fetchone()
+    return json.loads(row["result"]) if row else None
+
+def finish_save_job(job_id, result):
+    get_save_jobs_db().execute(
+        "UPDATE save_jobs SET status = 'succeeded', phase = 'done', result = ?, payload = '{}', updated_at = ? "
+        "WHERE id = ?",
+        (json.dumps(result), time.time(), job_id)
+    )
+
+def fail_save_job(job_id, error, status_code=500):
+    get_save_jobs_db().execute(
+        "UPDATE save_jobs SET status = 'failed', error = ?, status_code = ?, payload = '{}', updated_at = ? "
+        "WHERE id = ?",
+        (error, status_code, time.time(), job_id)
+    )
+
+def get_save_job(job_id):
+    row = get_save_jobs_db().execute(
+        "SELECT id, status, phase, progress, result, error, status_code, attempts, created_at, updated_at "
+        "FROM save_jobs WHERE id = ?",
+        (job_id,)
+    ).fetchone()
+    if not row:
+        return None
+
+    job = dict(row)
+    job["progress"] = json.loads(job["progress"] or "{}")
+    job["result"] = json.loads(job["result"]) if job["result"] else None
+    return job
+
+def run_save_job_worker(handle_job):
+    while True:
+        try:
+            job = claim_save_job()
+        except Exception as e:
+            print(f"⚠️ 저장 작업 조회 실패: {e}")
+            job = None
+
+        if not job:
+            _job_available.wait(SAVE_JOB_POLL_SECONDS)
+            _job_available.clear()
+            continue
+
+        lease_done = threading.Event()
+        threading.Thread(
+            target=run_save_job_heartbeat,
+            args=(job["id"], lease_done),
+            name=f"save-job-heartbeat-{job['id'][:8]}",
+            daemon=True,
+        ).start()
+        try:
+            handle_job(job)
+        except Exception as e:
+            print(f"❌ 저장 작업 실패: {job['id']}, {e}")
+            fail_save_job(job["id"], str(e))
+        finally:
+            lease_done.set()
+
+def run_save_job_heartbeat(job_id, lease_done):
+    """작업이 실행되는 동안 주기적으로 점유 시간을 연장합니다."""
+    started_at = time.time()
+    while not lease_done.wait(SAVE_JOB_HEARTBEAT_SECONDS):
+        if time.time() - started_at > SAVE_JOB_MAX_RUN_SECONDS:
+            print(f"⚠️ 저장 작업이 {SAVE_JOB_MAX_RUN_SECONDS}초를 넘겨 점유 연장을 멈춥니다: {job_id}")
+            return
+        try:
+            extend_save_job_lease(job_id)
+        except Exception as e:
+            print(f"⚠️ 저장 작업 점유 연장 실패: {job_id}, {e}")
+
+def ensure_save_job_workers(handle_job):
+    """현재 프로세스에 백그라운드 작업 스레드가 없으면 시작합니다."""
+    pid = os.getpid()
+    if _workers["pid"] == pid or not SAVE_JOB_WORKERS:
+        return
+
+    with _workers_lock:
+        if _workers["pid"] != pid:
+            threads = [
+                threading.Thread(
+                    target=run_save_job_worker,
+                    args=(handle_job,),
+                    name=f"save-job-worker-{index}",
+                    daemon=True,
+                )
+                for index in range(SAVE_JOB_WORKERS)
+            ]
+            for thread in threads:
+                thread.start()
+            _workers.update(pid=pid, threads=threads)
@@ -0,0 +1,175 @@
+import os
+import sys
+import tempfile
+import threading
+import time
+from types import SimpleNamespace
+
+import dropbox
+import pytest
+from requests.structures import CaseInsensitiveDict
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if BACKEND_DIR not in sys.path:
+    sys.path.insert(0, BACKEND_DIR)
+
+# app을 import하기 전에 로컬 SQLite 위치를 테스트 전용 디렉터리로 돌립니다.
+os.environ.setdefault("LOCAL_DB_DIR", tempfile.mkdtemp(prefix="archive-saver-tests-"))
+
+
+class FakeResponse:
+    """requests.Response처럼 동작하는 응답. 본문은 지정한 조각 단위로 흘려보냅니다."""
+
+    def __init__(self, body=b"", status_code=200, headers=None, chunks=None):
+        self.status_code = status_code
+        self.headers = CaseInsensitiveDict(headers or {})
+        self.encoding = "utf-8"
+        self._chunks = list(chunks) if chunks is not None else [body]
+        self.reads = 0
+        self.closed = False
+
+    @property
+    def content(self):
+        return b"".join(self._chunks)
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise RuntimeError(f"HTTP {self.status_code}")
+
+    def iter_content(self, chunk_size=1):
+        # urllib3처럼 같은 스트림은 한 번만 읽을 수 있습니다.
+        if self.reads:
+            raise RuntimeError("The content for this response was already consumed")
+        self.reads += 1
+        for chunk in self._chunks:
+            if self.closed:
+                raise RuntimeError("read from closed response")
+            # 조각 자리에 예외를 넣어 두면 스트림 도중 끊긴 연결을 흉내 냅니다.
+            if isinstance(chunk, Exception):
+                raise chunk
+            yield chunk
+
+    def close(self):
+        self.closed = True
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class FakeHttpSession:
+    """URL별로 응답을 만들어 주고 요청 기록을 남기는 requests.Session 대용품."""
+
+    def __init__(self):
+        self.routes = {}
+        self.requests = []
+        self.responses = []
+
+    def route(self, url, handler):
+        """handler(headers) -> FakeResponse"""
+        self.routes[url] = handler
+
+    def serve(self, url, body=b"", headers=None, chunks=None, status_code=200):
+        """요청마다 같은 내용의 새 응답을 돌려줍니다."""
+        self.route(url, lambda request_headers: FakeResponse(body, status_code, headers, chunks))
+
+    def get(self, url, headers=None, timeout=None, stream=False):
+        headers = dict(headers or {})
+        self.requests.append((url, headers))
+        handler = self.routes.get(url)
+        response = handler(headers) if handler else FakeResponse(b"not found", status_code=404)
+        self.responses.append(response)
+        return response
+
+
+class FakeDropbox:
+    """테스트에 쓰는 Dropbox API만 흉내 내는 인메모리 클라이언트."""
+
+    def __init__(self):
+        self.files = {}
+        self.sessions = {}
+        self.calls = []
+        self.lock = threading.Lock()
+        self.fail_session_start = set()
+        self.finish_batch_error = None
+        self.finish_batch_failures = set()
+        self.temporary_link_delay = 0
+
+    def _record(self, name, *args):
+        with self.lock:
+            self.calls.append((name,) + args)
+
+    def count(self, name):
+        return sum(1 for call in self.calls if call[0] == name)
+
+    def files_upload(self, data, path, mode=None):
+        self._record("files_upload", path)
+        self.files[path.lower()] = bytes(data)
+        return SimpleNamespace(path_display=path)
+
+    def files_upload_session_start(self, data, close=False):
+        self._record("files_upload_session_start", len(data))
+        if any(data.startswith(prefix) for prefix in self.fail_session_start):
+            raise RuntimeError("session start failed")
+        with self.lock:
+            session_id = f"session-{len(self.sessions)}"
+            self.sessions[session_id] = bytes(data)
+        return SimpleNamespace(session_id=session_id)
+
+    def _commit_session(self, cursor, commit):
+        self.files[commit.path.lower()] = self.sessions[cursor.session_id]
+
+    def files_upload_session_finish_batch_v2(self, entries):
+        self._record("files_upload_session_finish_batch_v2", len(entries))
+        if self.finish_batch_error:
+            raise self.finish_batch_error
+        results = []
+        for entry in entries:
+            success = entry.commit.path not in self.finish_batch_failures
+            if success:
+                self._commit_session(entry.cursor, entry.commit)
+            results.append(SimpleNamespace(is_success=lambda success=success: success))
+        return SimpleNamespace(entries=results)
+
+    def files_upload_session_finish(self, data, cursor, commit):
+        self._record("files_upload_session_finish", commit.path)
+        self._commit_session(cursor, commit)
+        return SimpleNamespace(path_display=commit.path)
+
+    def files_get_metadata(self, path):
+        self._record("files_get_metadata", path)
+        if path.lower() not in self.files:
+            raise dropbox.exceptions.ApiError("request-id", "not_found", None, None)
+        return SimpleNamespace(path_display=path, size=len(self.files[path.lower()]))
+
+    def sharing_create_shared_link_with_settings(self, path, settings=None):
+        self._record("sharing_create_shared_link_with_settings", path)
+        return SimpleNamespace(url=f"https://www.dropbox.com/s/fake{path}?dl=0")
+
+    def sharing_list_shared_links(self, path=None, direct_only=False):
+        self._record("sharing_list_shared_links", path)
+        return SimpleNamespace(links=[])
+
+    def files_get_temporary_link(self, path):
+        self._record("files_get_temporary_link", path)
+        if self.temporary_link_delay:
+            time.sleep(self.temporary_link_delay)
+        return SimpleNamespace(link=f"https://dl.dropboxusercontent.com/fake{path}?n={self.count('files_get_temporary_link')}")
+
+
+@pytest.fixture
+def fake_http(monkeypatch):
+    import app
+    session = FakeHttpSession()
+    monkeypatch.setattr(app, "get_http_session", lambda: session)
+    return session
+
+
+@pytest.fixture
+def fake_dropbox(monkeypatch):
+    import app
+    dbx = FakeDropbox()
+    monkeypatch.setattr(app, "get_dropbox_client", lambda: dbx)
+    return dbx
@@ -0,0 +1,117 @@
+"""
+공용 자산 캐시의 신선도 계산, 디스크 계층 총량 추적, 캡처 응답 중복 저장 생략을 확인합니다.
+"""
+import os
+import time
+
+import pytest
+
+import app
+import cache_utils
+
+
+@pytest.mark.parametrize("headers, expected", [
+    ({"Cache-Control": "no-store"}, (False, 0)),
+    ({"Cache-Control": "private, max-age=600"}, (False, 0)),
+    ({"cache-control": 'private="set-cookie"'}, (False, 0)),
+    ({"Cache-Control": "no-cache"}, (True, 0)),
+    ({"Cache-Control": "public, max-age=120"}, (True, 120)),
+    ({"Cache-Control": "max-age=120, s-maxage=30"}, (True, 30)),
+    ({"Cache-Control": "max-age=abc"}, (True, 0)),
+    ({"Cache-Control": "max-age=60", "Expires": "Thu, 01 Jan 2099 00:00:00 GMT"}, (True, 60)),
+    ({"Date": "Thu, 01 Jan 2026 00:00:00 GMT", "Expires": "Thu, 01 Jan 2026 01:00:00 GMT"}, (True, 3600)),
+    ({"expires": "Thu, 01 Jan 2026 00:00:00 GMT"}, (True, 0)),
+    ({"Expires": "0"}, (True, 0)),
+    ({}, (True, app.ASSET_CACHE_DEFAULT_TTL_SECONDS)),
+])
+def test_asset_cache_ttl(headers, expected):
+    assert app.get_asset_cache_ttl(headers) == expected
+
+
+def disk_files(disk_dir):
+    return sorted(name for name in os.listdir(disk_dir) if name.endswith(".body"))
+
+
+def test_disk_tier_tracks_total_and_evicts_only_over_limit(tmp_path, monkeypatch):
+    cache_utils.cache_put(cache_utils.create_lru_cache(0, str(tmp_path), 0), "seed", b"x" * 100, {})
+
+    cache = cache_utils.create_lru_cache(0, str(tmp_path), 1000)
+    assert cache["disk_bytes"] == 100
+
+    scans = []
+    original_scan = cache_utils._disk_scan
+    monkeypatch.setattr(cache_utils, "_disk_scan", lambda disk_dir: scans.append(disk_dir) or original_scan(disk_dir))
+
+    for index in range(8):
+        cache_utils.cache_put(cache, f"key-{index}", b"y" * 100, {})
+        os.utime(cache_utils._disk_paths(cache, f"key-{index}")[0], (index + 10, index + 10))
+    cache_utils.cache_put(cache, "key-0", b"z" * 50, {})
+    assert scans == []
+    assert cache["disk_bytes"] == 850
+
+    cache_utils.cache_put(cache, "big", b"w" * 300, {})
+    assert len(scans) == 1
+    assert cache["disk_bytes"] <= 900
+    assert cache["disk_bytes"] == sum(os.path.getsize(tmp_path / name) for name in disk_files(tmp_path))
+    assert cache_utils.cache_get(cache, "big")[0] == b"w" * 300
+
+
+@pytest.fixture
+def asset_cache(tmp_path, monkeypatch):
+    cache = cache_utils.create_lru_cache(1024 * 1024, str(tmp_path), 0)
+    monkeypatch.setattr(app, "ASSET_CACHE", cache)
+    puts = []
+    original_put = app.cache_put
+    monkeypatch.setattr(app, "cache_put", lambda *args: puts.append(args[1]) or original_put(*args))
+    return cache, puts
+
+
+def capture(body, headers):
+    store = app.create_capture_store()
+    app.put_captured_response(store, "https://cdn.example.com/site.css", body, headers)
+    return store
+
+
+def test_captured_asset_is_not_rewritten_when_unchanged(asset_cache):
+    cache, puts = asset_cache
+    url = "https://cdn.example.com/site.css"
+    headers = {"content-type": "text/css", "cache-control": "max-age=600"}
+
+    for _ in range(3):
+        store = capture(b"body{}", headers)
+        assert app.fetch_cached_asset(url, "https://example.com/", store)[0] == b"body{}"
+        app.close_capture_store(store)
+    assert puts == [url]
+
+    store = capture(b"body{color:red}", headers)
+    app.fetch_cached_asset(url, "https://example.com/", store)
+    app.close_capture_store(store)
+    assert puts == [url, url]
+    assert app.cache_get(cache, url)[0] == b"body{color:red}"
+
+
+def test_captured_asset_with_same_validator_only_extends_freshness(asset_cache):
+    cache, puts = asset_cache
+    url = "https://cdn.example.com/site.css"
+    headers = {"content-type": "text/css", "cache-control": "no-cache", "etag": '"v1"'}
+
+    store = capture(b"body{}", headers)
+    app.fetch_cached_asset(url, "https://example.com/", store)
+    app.close_capture_store(store)
+
+    store = capture(b"body{}", dict(headers, **{"cache-control": "max-age=600"}))
+    app.fetch_cached_asset(url, "https://example.com/", store)
+    app.close_capture_store(store)
+
+    assert puts == [url]
+    assert app.cache_get(cache, url)[1]["expires_at"] > time.time() + 500
+
+
+def test_private_captured_asset_is_not_cached(asset_cache):
+    cache, puts = asset_cache
+    url = "https://cdn.example.com/site.css"
+    store = capture(b"body{}", {"content-type": "text/css", "cache-control": "private, max-age=600"})
+    app.fetch_cached_asset(url, "https://example.com/", store)
+    app.close_capture_store(store)
+    assert puts == []
+    assert cache_utils.cache_peek_meta(cache, url) is None
@@ -0,0 +1,159 @@
+"""
+작은 미디어를 업로드 세션으로 올려 두었다가 한 번에 커밋하는 배치 업로드와,
+배치 커밋이 실패했을 때의 단일 커밋/단일 업로드 대체 경로를 확인합니다.
+"""
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+
+import pytest
+
+import app
+
+
+@pytest.fixture
+def batch_config(fake_dropbox):
+    return {
+        "provider": "dropbox",
+        "dbx_client": fake_dropbox,
+        "upload_batch": app.create_dropbox_upload_batch(fake_dropbox),
+    }
+
+
+def stage(storage_config, files):
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        return list(executor.map(
+            lambda item: app.upload_file_to_user_storage(item[1], "images", item[0], "image/png", storage_config),
+            files.items()
+        ))
+
+
+def test_media_are_staged_concurrently_and_committed_in_one_batch(fake_dropbox, batch_config):
+    files = {f"{index}.png": f"image-{index}".encode() for index in range(12)}
+
+    pending = stage(batch_config, files)
+
+    assert [app.get_pending_batch_path(link) for link in pending] == [f"/web-archives/images/{name}" for name in files]
+    assert fake_dropbox.files == {}
+    assert fake_dropbox.count("files_upload_session_start") == len(files)
+
+    links = app.finalize_dropbox_upload_batch(batch_config["upload_batch"])
+
+    assert fake_dropbox.count("files_upload_session_finish_batch_v2") == 1
+    assert fake_dropbox.count("files_upload_session_finish") == 0
+    assert fake_dropbox.count("files_upload") == 0
+    for name, body in files.items():
+        path = f"/web-archives/images/{name}"
+        assert fake_dropbox.files[path] == body
+        assert links[path] == f"https://www.dropbox.com/s/fake{path}?raw=1"
+    assert batch_config["upload_batch"]["entries"] == {}
+
+
+def test_same_path_is_staged_once(fake_dropbox, batch_config):
+    pending = stage(batch_config, {"same.png": b"same"})
+    pending += stage(batch_config, {"same.png": b"same"})
+
+    assert pending[0] == pending[1]
+    assert fake_dropbox.count("files_upload_session_start") == 1
+
+
+def test_failed_batch_commit_falls_back_to_single_commits(fake_dropbox, batch_config):
+    fake_dropbox.finish_batch_error = RuntimeError("too_many_write_operations")
+    stage(batch_config, {"a.png": b"a", "b.png": b"b"})
+
+    links = app.finalize_dropbox_upload_batch(batch_config["upload_batch"])
+
+    assert fake_dropbox.count("files_upload_session_finish") == 2
+    assert fake_dropbox.files == {"/web-archives/images/a.png": b"a", "/web-archives/images/b.png": b"b"}
+    assert all(link.endswith("?raw=1") for link in links.values())
+
+
+def test_only_failed_batch_entries_are_retried(fake_dropbox, batch_config):
+    fake_dropbox.finish_batch_failures = {"/web-archives/images/b.png"}
+    stage(batch_config, {"a.png": b"a", "b.png": b"b", "c.png": b"c"})
+
+    links = app.finalize_dropbox_upload_batch(batch_config["upload_batch"])
+
+    assert [call[1] for call in fake_dropbox.calls if call[0] == "files_upload_session_finish"] == ["/web-archives/images/b.png"]
+    assert sorted(links) == ["/web-archives/images/a.png", "/web-archives/images/b.png", "/web-archives/images/c.png"]
+
+
+def test_session_start_failure_falls_back_to_single_upload(fake_dropbox, batch_config):
+    fake_dropbox.fail_session_start = {b"broken"}
+
+    links = stage(batch_config, {"ok.png": b"ok", "broken.png": b"broken"})
+
+    assert app.get_pending_batch_path(links[0]) == "/web-archives/images/ok.png"
+    assert links[1] == "https://www.dropbox.com/s/fake/web-archives/images/broken.png?raw=1"
+    assert fake_dropbox.files == {"/web-archives/images/broken.png": b"broken"}
+    assert list(batch_config["upload_batch"]["entries"]) == ["/web-archives/images/ok.png"]
+
+
+def test_large_media_skip_the_batch(fake_dropbox, batch_config, monkeypatch):
+    monkeypatch.setattr(app, "DROPBOX_UPLOAD_CHUNK_SIZE", 4)
+
+    link = app.upload_file_to_user_storage(b"larger", "images", "large.png", "image/png", batch_config)
+
+    assert app.get_pending_batch_path(link) is None
+    assert fake_dropbox.files == {"/web-archives/images/large.png": b"larger"}
+
+
+def test_content_addressed_index_is_recorded_after_commit(fake_dropbox, batch_config):
+    batch_config["account_key"] = "dropbox:test-batch-index"
+    batch_config["upload_batch"]["account_key"] = batch_config["account_key"]
+
+    pending = app.store_content_addressed_media(b"cas", "d1" * 32, "images", "d1.png", "image/png", batch_config)
+    assert app.get_pending_batch_path(pending)
+    assert app.lookup_media_index(batch_config["account_key"], "images", "d1" * 32) is None
+
+    links = app.finalize_dropbox_upload_batch(batch_config["upload_batch"])
+
+    assert app.lookup_media_index(batch_config["account_key"], "images", "d1" * 32) == links["/web-archives/images/d1.png"]
+
+
+class FakeBatchJob:
+    def __init__(self, complete, entries=()):
+        self.complete = complete
+        self.entries = entries
+
+    def is_complete(self):
+        return self.complete
+
+    def get_complete(self):
+        return SimpleNamespace(entries=self.entries)
+
+    def get_async_job_id(self):
+        return "job-1"
+
+
+class FakeDropboxV1:
+    """finish_batch_v2가 없는 이전 SDK처럼 비동기 작업 ID를 돌려주는 클라이언트."""
+
+    def __init__(self, pending_checks):
+        self.pending_checks = pending_checks
+        self.checks = 0
+
+    def files_upload_session_finish_batch(self, finish_args):
+        return FakeBatchJob(False)
+
+    def files_upload_session_finish_batch_check(self, async_job_id):
+        self.checks += 1
+        if self.checks <= self.pending_checks:
+            return FakeBatchJob(False)
+        entries = [SimpleNamespace(is_success=lambda: True), SimpleNamespace(is_success=lambda: False)]
+        return FakeBatchJob(True, entries)
+
+
+def test_v1_batch_job_is_polled_until_complete(monkeypatch):
+    monkeypatch.setattr(app, "DROPBOX_BATCH_POLL_SECONDS", 0)
+    dbx = FakeDropboxV1(pending_checks=2)
+
+    assert app.finish_dropbox_upload_batch(dbx, ["a", "b"]) == [True, False]
+    assert dbx.checks == 3
+
+
+def test_v1_batch_job_times_out(monkeypatch):
+    monkeypatch.setattr(app, "DROPBOX_BATCH_POLL_SECONDS", 0)
+    monkeypatch.setattr(app, "DROPBOX_BATCH_POLL_TIMEOUT_SECONDS", 0)
+
+    with pytest.raises(TimeoutError):
+        app.finish_dropbox_upload_batch(FakeDropboxV1(pending_checks=10 ** 6), ["a"])
@@ -0,0 +1,144 @@
+"""
+Dropbox 임시 링크 캐시의 단일 호출(single-flight), 워커 간 공유, 만료 전 백그라운드 갱신, 크기 제한을 확인합니다.
+"""
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from uuid import uuid4
+
+import pytest
+
+import app
+
+
+@pytest.fixture(autouse=True)
+def fresh_temp_link_cache(monkeypatch, fake_dropbox):
+    monkeypatch.setattr(app, "DROPBOX_TEMP_LINK_CACHE", OrderedDict())
+    monkeypatch.setattr(app, "DROPBOX_TEMP_LINK_STATS", {"hits": 0, "shared_hits": 0, "misses": 0, "refreshes": 0})
+
+
+@pytest.fixture
+def path():
+    # 공유 캐시(SQLite)는 테스트 사이에 남으므로 경로를 매번 새로 만듭니다.
+    return f"/web-archives/videos/{uuid4().hex}.mp4"
+
+
+def forget_process_cache():
+    """같은 공유 캐시를 쓰는 다른 워커 프로세스를 흉내 냅니다."""
+    app.DROPBOX_TEMP_LINK_CACHE.clear()
+
+
+def age_entry(dropbox_path, remaining_seconds):
+    entry = app.get_dropbox_temp_link_entry(dropbox_path)
+    link, _ = entry["value"]
+    entry["value"] = (link, time.time() + remaining_seconds)
+    return entry
+
+
+def wait_for_refresh(entry, timeout=5):
+    deadline = time.time() + timeout
+    while entry["refreshing"] and time.time() < deadline:
+        time.sleep(0.01)
+    assert not entry["refreshing"]
+
+
+def stats():
+    return {key: value for key, value in app.get_dropbox_temp_link_stats().items() if key != "entries"}
+
+
+def test_link_is_fetched_once_then_served_from_cache(fake_dropbox, path):
+    first = app.get_dropbox_temporary_link(path)
+
+    assert app.get_dropbox_temporary_link(path) == first
+    assert fake_dropbox.count("files_get_temporary_link") == 1
+    assert stats() == {"hits": 1, "shared_hits": 0, "misses": 1, "refreshes": 0}
+
+
+def test_concurrent_requests_share_one_api_call(fake_dropbox, path):
+    fake_dropbox.temporary_link_delay = 0.05
+    start = threading.Barrier(16)
+
+    def request_link(_):
+        start.wait()
+        return app.get_dropbox_temporary_link(path)
+
+    with ThreadPoolExecutor(max_workers=16) as executor:
+        links = list(executor.map(request_link, range(16)))
+
+    assert len(set(links)) == 1
+    assert fake_dropbox.count("files_get_temporary_link") == 1
+    assert stats()["misses"] == 1 and stats()["hits"] == 15
+
+
+def test_other_workers_reuse_shared_link(fake_dropbox, path):
+    link = app.get_dropbox_temporary_link(path)
+    forget_process_cache()
+
+    assert app.get_dropbox_temporary_link(path) == link
+    assert fake_dropbox.count("files_get_temporary_link") == 1
+    assert stats()["shared_hits"] == 1
+
+
+def test_shared_cache_can_be_disabled(fake_dropbox, path, monkeypatch):
+    monkeypatch.setattr(app, "DROPBOX_TEMP_LINK_SHARED_CACHE", False)
+    app.get_dropbox_temporary_link(path)
+    forget_process_cache()
+
+    app.get_dropbox_temporary_link(path)
+    assert fake_dropbox.count("files_get_temporary_link") == 2
+    assert app.lookup_shared_dropbox_temp_link(path) is None
+
+
+def test_link_near_expiry_is_served_while_refreshing_in_background(fake_dropbox, path):
+    old_link = app.get_dropbox_temporary_link(path)
+    entry = age_entry(path, app.DROPBOX_TEMP_LINK_REFRESH_MARGIN_SECONDS - 10)
+    # 다른 워커가 공유 캐시에서 오래된 링크를 다시 가져가지 않도록 공유 캐시도 같이 늙힙니다.
+    app.record_shared_dropbox_temp_link(path, old_link, entry["value"][1])
+    fake_dropbox.temporary_link_delay = 0.2
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        links = list(executor.map(lambda _: app.get_dropbox_temporary_link(path), range(8)))
+    assert links == [old_link] * 8
+
+    wait_for_refresh(entry)
+    new_link = app.get_dropbox_temporary_link(path)
+    assert new_link != old_link
+    assert fake_dropbox.count("files_get_temporary_link") == 2
+    assert stats()["refreshes"] == 1
+    assert app.lookup_shared_dropbox_temp_link(path)[0] == new_link
+
+
+def test_background_refresh_adopts_link_refreshed_by_another_worker(fake_dropbox, path):
+    app.get_dropbox_temporary_link(path)
+    entry = age_entry(path, app.DROPBOX_TEMP_LINK_REFRESH_MARGIN_SECONDS - 10)
+    app.record_shared_dropbox_temp_link(path, "https://other-worker/link", time.time() + app.DROPBOX_TEMP_LINK_LIFETIME_SECONDS)
+
+    app.get_dropbox_temporary_link(path)
+    wait_for_refresh(entry)
+
+    assert app.get_dropbox_temporary_link(path) == "https://other-worker/link"
+    assert fake_dropbox.count("files_get_temporary_link") == 1
+    assert stats()["refreshes"] == 0
+
+
+def test_expired_link_is_fetched_synchronously(fake_dropbox, path):
+    old_link = app.get_dropbox_temporary_link(path)
+    age_entry(path, app.DROPBOX_TEMP_LINK_MIN_REMAINING_SECONDS - 1)
+    app.record_shared_dropbox_temp_link(path, old_link, time.time() + 1)
+
+    assert app.get_dropbox_temporary_link(path) != old_link
+    assert fake_dropbox.count("files_get_temporary_link") == 2
+    assert stats()["misses"] == 2
+
+
+def test_process_cache_is_bounded(fake_dropbox, monkeypatch):
+    monkeypatch.setattr(app, "DROPBOX_TEMP_LINK_CACHE_SIZE", 3)
+    paths = [f"/web-archives/audio/{uuid4().hex}.mp3" for _ in range(5)]
+
+    for dropbox_path in paths:
+        app.get_dropbox_temporary_link(dropbox_path)
+    app.get_dropbox_temporary_link(paths[2])
+
+    assert list(app.DROPBOX_TEMP_LINK_CACHE) == [paths[3], paths[4], paths[2]]
+    assert app.get_dropbox_temp_link_stats()["entries"] == 3
@@ -0,0 +1,140 @@
+"""
+html.parser/lxml 트리 빌더와 bs4/selectolax 텍스트 추출기가 같은 결과를 내는지 확인합니다.
+
+tests/fixtures/pages의 페이지에 더해 ARCHIVE_CONFORMANCE_PAGES_DIR에 있는 .html 파일도 검사하므로,
+실제로 저장한 아카이브를 내려받아 그 디렉터리에 두고 돌릴 수 있습니다.
+
+    cd backend && ARCHIVE_CONFORMANCE_PAGES_DIR=~/saved-archives python -m pytest tests/test_html_conformance.py
+"""
+import glob
+import os
+
+import pytest
+from bs4 import BeautifulSoup, NavigableString
+
+import app
+import html_parser_utils
+
+PAGE_URL = "https://www.fmkorea.com/best/1234567890"
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "pages")
+CHALLENGE_PAGES = {
+    "fmkorea_security_challenge.html",
+    "fmkorea_challenge_noscript.html",
+    "namuwiki_challenge.html",
+    "cloudflare_challenge.html",
+}
+
+
+def collect_pages():
+    paths = sorted(glob.glob(os.path.join(FIXTURE_DIR, "*.html")))
+    extra_dir = os.getenv("ARCHIVE_CONFORMANCE_PAGES_DIR")
+    if extra_dir:
+        paths += sorted(glob.glob(os.path.join(os.path.expanduser(extra_dir), "*.html")))
+    return paths
+
+
+PAGES = collect_pages()
+
+
+def read_page(path):
+    with open(path, "r", encoding="utf-8", errors="replace") as f:
+        return f.read()
+
+
+@pytest.fixture
+def use_backends(monkeypatch):
+    """설정값 대신 지정한 트리 빌더/텍스트 추출기를 쓰도록 해석 결과를 고정합니다."""
+    def select(parser="html.parser", extractor="bs4"):
+        if parser == "lxml":
+            pytest.importorskip("lxml")
+        if extractor == "selectolax":
+            pytest.importorskip("selectolax.lexbor")
+        monkeypatch.setitem(html_parser_utils._resolved, "parser", parser)
+        monkeypatch.setitem(html_parser_utils._resolved, "extractor", extractor)
+    return select
+
+
+def normalize_text(text):
+    return " ".join(text.split())
+
+
+def extract(html):
+    title_text, body_text = html_parser_utils.extract_title_and_text(html)
+    return normalize_text(title_text), normalize_text(body_text)
+
+
+def canonical_html(output):
+    """
+    저장된 결과를 브라우저처럼 다시 읽은 형태로 맞춥니다.
+    libxml2는 <source>를 빈 요소로 보지 않아 </source>를 붙이고 <html> 바깥 공백을 버리지만,
+    HTML5 파서는 둘 다 무시하므로 그 차이만 없앱니다.
+    """
+    if isinstance(output, bytes):
+        output = output.decode("utf-8")
+    soup = BeautifulSoup(output, "html.parser")
+    for node in list(soup.contents):
+        if isinstance(node, NavigableString) and not node.strip():
+            node.extract()
+    return str(soup)
+
+
+def rewrite(html, parser):
+    """저장 파이프라인과 같은 순서로 재작성하되 미디어는 내려받지 않고 고정 경로로 바꿉니다."""
+    soup = html_parser_utils.parse_html(html, parser)
+    document = app.scan_archive_document(soup, PAGE_URL)
+    results = [
+        f"/archive-media/{media_type}/{index}"
+        for index, (_, media_type, _) in enumerate(document["media_table"]["jobs"])
+    ]
+    app.apply_media_rewrites(document["media_references"], results)
+    app.add_archive_media_fallbacks(soup, document["media"])
+    app.stamp_archive_pipeline(soup)
+    return str(soup)
+
+
+@pytest.mark.parametrize("path", PAGES, ids=os.path.basename)
+@pytest.mark.parametrize("parser, extractor", [
+    ("lxml", "bs4"),
+    ("html.parser", "selectolax"),
+])
+def test_title_and_text_match_baseline(path, parser, extractor, use_backends):
+    html = read_page(path)
+    use_backends()
+    expected = extract(html)
+
+    use_backends(parser, extractor)
+    assert extract(html) == expected
+
+
+@pytest.mark.parametrize("path", PAGES, ids=os.path.basename)
+@pytest.mark.parametrize("parser, extractor", [
+    ("html.parser", "bs4"),
+    ("lxml", "bs4"),
+    ("html.parser", "selectolax"),
+])
+def test_security_challenge_verdict(path, parser, extractor, use_backends):
+    html = read_page(path)
+    use_backends()
+    expected = app.is_security_challenge_html(html)
+    if os.path.dirname(path) == FIXTURE_DIR:
+        assert expected == (os.path.basename(path) in CHALLENGE_PAGES)
+
+    use_backends(parser, extractor)
+    assert app.is_security_challenge_html(html) == expected
+
+
+@pytest.mark.parametrize("path", PAGES, ids=os.path.basename)
+def test_rewritten_html_matches_across_parsers(path):
+    pytest.importorskip("lxml")
+    html = read_page(path)
+    assert canonical_html(rewrite(html, "lxml")) == canonical_html(rewrite(html, "html.parser"))
+
+
+@pytest.mark.parametrize("path", PAGES, ids=os.path.basename)
+def test_legacy_archive_render_matches_across_parsers(path, use_backends):
+    html_bytes = read_page(path).encode("utf-8")
+    use_backends()
+    expected = canonical_html(app.render_legacy_archive(html_bytes))
+
+    use_backends("lxml")
+    assert canonical_html(app.render_legacy_archive(html_bytes)) == expected
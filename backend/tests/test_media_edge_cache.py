@@ -0,0 +1,190 @@
+"""
+/archive-media 프록시 앞의 디스크 캐시가 Range 요청으로 받은 구간만 희소 파일에 채우고,
+채워진 구간은 원본 없이 응답하며, 원본 ETag가 바뀌면 기존 구간을 버리는지 확인합니다.
+"""
+import os
+import re
+from uuid import uuid4
+
+import pytest
+
+import app
+import media_cache_utils
+from conftest import FakeResponse
+
+SIZE = 1000
+
+
+def make_body(seed):
+    return bytes((index * seed) % 251 for index in range(SIZE))
+
+
+class FakeOrigin:
+    """Range를 지원하는 Dropbox 임시 링크 원본. 본문과 ETag는 테스트 중에 바꿀 수 있습니다."""
+
+    def __init__(self, body, etag='"rev-1"', headers=None):
+        self.body = body
+        self.etag = etag
+        self.headers = headers or {}
+        self.ranges = []
+
+    def __call__(self, request_headers):
+        headers = {"Content-Type": "image/png", "ETag": self.etag, "Accept-Ranges": "bytes", **self.headers}
+        match = re.fullmatch(r"bytes=(\d+)-(\d*)", request_headers.get("Range", ""))
+        if not match:
+            self.ranges.append(None)
+            headers["Content-Length"] = str(len(self.body))
+            return FakeResponse(headers=headers, chunks=[self.body[:400], self.body[400:]])
+
+        start = int(match.group(1))
+        end = min(int(match.group(2)) + 1 if match.group(2) else len(self.body), len(self.body))
+        self.ranges.append((start, end))
+        headers["Content-Length"] = str(end - start)
+        headers["Content-Range"] = f"bytes {start}-{end - 1}/{len(self.body)}"
+        return FakeResponse(status_code=206, headers=headers, chunks=[self.body[start:end]])
+
+
+@pytest.fixture
+def edge_cache(tmp_path, monkeypatch):
+    cache = media_cache_utils.create_media_cache(str(tmp_path), 64 * 1024 * 1024)
+    monkeypatch.setattr(app, "MEDIA_EDGE_CACHE", cache)
+    return cache
+
+
+@pytest.fixture
+def media(fake_http, edge_cache, monkeypatch):
+    # 항목 키(Dropbox 경로)는 공유 SQLite에 남으므로 테스트마다 새 파일명을 씁니다.
+    filename = f"{uuid4().hex}.png"
+    dropbox_path = f"/web-archives/images/{filename}"
+    temporary_link = f"https://dl.dropboxusercontent.com/fake{dropbox_path}"
+    monkeypatch.setattr(app, "get_dropbox_temporary_link", lambda path: temporary_link)
+    origin = FakeOrigin(make_body(7))
+    fake_http.route(temporary_link, origin)
+    return {"url": f"/archive-media/images/{filename}", "path": dropbox_path, "origin": origin}
+
+
+@pytest.fixture
+def client():
+    return app.app.test_client()
+
+
+def get(client, media, byte_range=None, **headers):
+    if byte_range:
+        headers["Range"] = f"bytes={byte_range[0]}-{byte_range[1] - 1}"
+    response = client.get(media["url"], headers=headers)
+    body = response.get_data()
+    response.close()
+    return response, body
+
+
+def filled(edge_cache, media):
+    meta = media_cache_utils.get_media_cache_entry(edge_cache, media["path"])
+    return meta and meta["filled"]
+
+
+def test_full_response_is_cached_and_served_locally(client, media, edge_cache):
+    body = media["origin"].body
+
+    first, first_body = get(client, media)
+    second, second_body = get(client, media)
+
+    assert (first.status_code, first_body) == (200, body)
+    assert (second.status_code, second_body) == (200, body)
+    assert second.headers["ETag"] == '"rev-1"'
+    assert media["origin"].ranges == [None]
+    assert filled(edge_cache, media) == [[0, SIZE]]
+    assert media_cache_utils.media_cache_stats(edge_cache)["hits"] == 1
+
+
+def test_range_requests_fill_sparse_file(client, media, edge_cache):
+    body = media["origin"].body
+
+    response, data = get(client, media, (100, 200))
+    assert (response.status_code, data) == (206, body[100:200])
+    assert filled(edge_cache, media) == [[100, 200]]
+
+    # 채워진 구간 안쪽은 원본 없이 응답합니다.
+    response, data = get(client, media, (120, 180))
+    assert (response.status_code, data) == (206, body[120:180])
+    assert response.headers["Content-Range"] == f"bytes 120-179/{SIZE}"
+    assert media["origin"].ranges == [(100, 200)]
+    assert media_cache_utils.media_cache_stats(edge_cache)["partial_hits"] == 1
+
+    # 일부만 채워진 구간이나 전체 요청은 원본에서 받으면서 빈 곳을 채웁니다.
+    get(client, media, (150, 300))
+    assert filled(edge_cache, media) == [[100, 300]]
+    response, data = get(client, media)
+    assert (response.status_code, data) == (200, body)
+    assert media["origin"].ranges == [(100, 200), (150, 300), None]
+    assert filled(edge_cache, media) == [[0, SIZE]]
+
+    response, data = get(client, media, (900, 1000))
+    assert (response.status_code, data) == (206, body[900:])
+    assert len(media["origin"].ranges) == 3
+
+
+def test_adjacent_ranges_complete_the_entry(client, media, edge_cache):
+    body = media["origin"].body
+    for byte_range in [(500, 1000), (0, 250), (250, 500)]:
+        get(client, media, byte_range)
+    assert filled(edge_cache, media) == [[0, SIZE]]
+
+    response, data = get(client, media)
+    assert (response.status_code, data) == (200, body)
+    assert len(media["origin"].ranges) == 3
+    assert media_cache_utils.media_cache_stats(edge_cache)["hits"] == 1
+
+
+def test_changed_etag_replaces_cached_ranges(client, media, edge_cache):
+    origin = media["origin"]
+    get(client, media, (0, 100))
+    old_meta = media_cache_utils.get_media_cache_entry(edge_cache, media["path"])
+
+    # 같은 이름으로 다시 업로드되어 원본이 바뀌었습니다.
+    origin.body, origin.etag = make_body(11), '"rev-2"'
+    response, data = get(client, media, (200, 300))
+    assert data == origin.body[200:300]
+    meta = media_cache_utils.get_media_cache_entry(edge_cache, media["path"])
+    assert (meta["etag"], meta["filled"]) == ('"rev-2"', [[200, 300]])
+    assert meta["data_file"] != old_meta["data_file"]
+    assert not os.path.exists(media_cache_utils.get_media_cache_data_path(edge_cache, old_meta))
+
+    # 예전 ETag로 채운 구간은 더 이상 캐시에서 나가지 않습니다.
+    response, data = get(client, media, (0, 100))
+    assert data == origin.body[0:100]
+    assert origin.ranges[-1] == (0, 100)
+
+
+def test_conditional_requests_use_cached_etag(client, media):
+    get(client, media)
+
+    response, _ = get(client, media, **{"If-None-Match": '"rev-1"'})
+    assert response.status_code == 304
+
+    response, data = get(client, media, (0, 10), **{"If-Range": '"rev-0"'})
+    assert (response.status_code, data) == (200, media["origin"].body)
+    assert len(media["origin"].ranges) == 1
+
+
+def test_disconnected_client_keeps_streamed_prefix(client, media, edge_cache, fake_http):
+    response = client.get(media["url"], buffered=False)
+    assert next(iter(response.response)) == media["origin"].body[:400]
+    response.close()
+
+    assert filled(edge_cache, media) == [[0, 400]]
+    assert fake_http.responses[-1].closed
+
+    response, data = get(client, media, (0, 400))
+    assert (response.status_code, data) == (206, media["origin"].body[:400])
+    assert media["origin"].ranges == [None]
+
+
+def test_encoded_or_oversized_responses_are_not_cached(client, media, edge_cache, monkeypatch):
+    media["origin"].headers = {"Content-Encoding": "gzip"}
+    get(client, media)
+    assert filled(edge_cache, media) is None
+
+    media["origin"].headers = {}
+    monkeypatch.setitem(edge_cache, "max_bytes", SIZE * 4 - 1)
+    get(client, media)
+    assert filled(edge_cache, media) is None
@@ -0,0 +1,129 @@
+"""
+아카이브 단위 인라인 예산의 예약/반환과, 한도를 넘은 이미지가 같은 응답 스트림에서 업로드로 넘어가는지 확인합니다.
+"""
+import base64
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+import app
+from conftest import FakeResponse
+
+PAGE_URL = "https://example.com/post/1"
+IMAGE_URL = "https://cdn.example.com/image.png"
+
+
+@pytest.fixture(autouse=True)
+def small_inline_limit(monkeypatch):
+    monkeypatch.setattr(app, "MEDIA_MAX_INLINE_BYTES", 1000)
+
+
+@pytest.fixture
+def storage_config(fake_dropbox):
+    return {"provider": "dropbox", "dbx_client": fake_dropbox}
+
+
+def assert_budget(budget, inline_bytes, inline_count, upload_bytes=0, upload_count=0):
+    assert (budget["inline_bytes"], budget["inline_count"]) == (inline_bytes, inline_count)
+    assert (budget["upload_bytes"], budget["upload_count"]) == (upload_bytes, upload_count)
+
+
+def test_reservations_never_exceed_archive_budget():
+    budget = app.create_inline_budget(2500)
+
+    assert app.decide_media_placement("images", "image/png", None, budget) == 1000
+    assert app.decide_media_placement("images", "image/png", None, budget) == 1000
+    # 남은 예산이 파일 한도보다 작으면 남은 만큼만 예약합니다.
+    assert app.decide_media_placement("images", "image/png", None, budget) == 500
+    assert app.decide_media_placement("images", "image/png", None, budget) == 0
+    assert app.decide_media_placement("images", "image/png", 1, budget) == 0
+    assert_budget(budget, 2500, 3)
+
+    app.record_media_placement(budget, "inline", 300, reserved=1000)
+    assert_budget(budget, 1800, 3)
+    app.release_media_reservation(budget, 1000)
+    assert_budget(budget, 800, 2)
+    assert app.decide_media_placement("images", "image/png", 600, budget) == 600
+    assert app.decide_media_placement("videos", "video/mp4", 10, budget) == 0
+    assert app.decide_media_placement("images", "video/mp4", 10, budget) == 0
+    assert app.decide_media_placement("images", "image/png", 1001, app.create_inline_budget()) == 0
+
+
+def test_unknown_size_image_is_inlined_and_returns_unused_reservation(fake_http, storage_config):
+    body = b"\x89PNG" + bytes(range(256)) * 2 + b"tail"
+    fake_http.serve(IMAGE_URL, headers={"Content-Type": "image/png"}, chunks=[body[:7], body[7:300], body[300:]])
+    budget = app.create_inline_budget(2500)
+
+    result = app.download_and_save_media(IMAGE_URL, PAGE_URL, "images", True, storage_config, inline_budget=budget)
+
+    assert result == "data:image/png;base64," + base64.b64encode(body).decode("ascii")
+    assert_budget(budget, len(body), 1)
+    assert len(fake_http.requests) == 1
+    assert fake_http.responses[0].closed
+
+
+def test_oversized_stream_uploads_from_same_response_and_releases_reservation(fake_http, fake_dropbox, storage_config):
+    body = bytes(range(256)) * 10
+    # Content-Length가 없으므로 읽어 보기 전에는 한도를 넘는지 알 수 없습니다.
+    fake_http.serve(IMAGE_URL, headers={"Content-Type": "image/png"}, chunks=[body[i:i + 700] for i in range(0, len(body), 700)])
+    budget = app.create_inline_budget(2500)
+
+    result = app.download_and_save_media(IMAGE_URL, PAGE_URL, "images", True, storage_config, inline_budget=budget)
+
+    assert result.startswith("https://www.dropbox.com/s/fake/web-archives/images/image_") and result.endswith("?raw=1")
+    assert list(fake_dropbox.files.values()) == [body]
+    assert len(fake_http.requests) == 1
+    assert fake_http.responses[0].reads == 1
+    assert fake_http.responses[0].closed
+    assert_budget(budget, 0, 0, len(body), 1)
+
+
+def test_declared_oversized_image_is_uploaded_without_inlining(fake_http, fake_dropbox, storage_config):
+    body = b"x" * 1500
+    fake_http.serve(IMAGE_URL, headers={"Content-Type": "image/png", "Content-Length": str(len(body))}, chunks=[body])
+    budget = app.create_inline_budget(2500)
+
+    app.download_and_save_media(IMAGE_URL, PAGE_URL, "images", True, storage_config, inline_budget=budget)
+
+    assert list(fake_dropbox.files.values()) == [body]
+    assert_budget(budget, 0, 0, len(body), 1)
+
+
+def test_exhausted_budget_uploads_small_images(fake_http, fake_dropbox, storage_config):
+    fake_http.serve(IMAGE_URL, headers={"Content-Type": "image/png", "Content-Length": "3"}, chunks=[b"abc"])
+    budget = app.create_inline_budget(0)
+
+    result = app.download_and_save_media(IMAGE_URL, PAGE_URL, "images", True, storage_config, inline_budget=budget)
+
+    assert not result.startswith("data:")
+    assert_budget(budget, 0, 0, 3, 1)
+
+
+def test_interrupted_download_releases_reservation(fake_http, fake_dropbox, storage_config):
+    fake_http.serve(IMAGE_URL, headers={"Content-Type": "image/png"}, chunks=[b"abc", ConnectionError("reset")])
+    budget = app.create_inline_budget(2500)
+
+    assert app.download_and_save_media(IMAGE_URL, PAGE_URL, "images", True, storage_config, inline_budget=budget) is None
+    assert_budget(budget, 0, 0)
+    assert fake_dropbox.files == {}
+    assert fake_http.responses[0].closed
+
+
+def test_concurrent_downloads_share_budget(fake_http, storage_config):
+    sizes = [400, 900, 200, 1200, 700, 50, 999, 300]
+    for index, size in enumerate(sizes):
+        fake_http.serve(f"https://cdn.example.com/{index}.png", headers={"Content-Type": "image/png"}, chunks=[b"p" * size])
+    budget = app.create_inline_budget(1500)
+
+    def download(index):
+        return app.download_and_save_media(
+            f"https://cdn.example.com/{index}.png", PAGE_URL, "images", True, storage_config, inline_budget=budget
+        )
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        results = list(executor.map(download, range(len(sizes))))
+
+    inlined = [size for size, result in zip(sizes, results) if result.startswith("data:")]
+    uploaded = [size for size, result in zip(sizes, results) if not result.startswith("data:")]
+    assert sum(inlined) <= budget["limit"]
+    assert_budget(budget, sum(inlined), len(inlined), sum(uploaded), len(uploaded))
@@ -0,0 +1,101 @@
+"""
+응답을 조각 단위로 base64 인코딩해 만든 data URI가 한 번에 인코딩한 결과와 같은지,
+한도를 넘으면 읽은 바이트와 남은 스트림을 그대로 넘기는지 확인합니다.
+"""
+import base64
+
+import pytest
+
+import app
+from conftest import FakeResponse
+
+IMAGE_URL = "https://cdn.example.com/anim.gif"
+BODY = bytes(range(256)) * 40 + b"end"
+
+
+def split(body, sizes):
+    chunks, position = [], 0
+    for size in sizes:
+        chunks.append(body[position:position + size])
+        position += size
+    chunks.append(body[position:])
+    return chunks
+
+
+def expected_uri(body, content_type="image/gif"):
+    return f"data:{content_type};base64,{base64.b64encode(body).decode('ascii')}"
+
+
+@pytest.mark.parametrize("sizes", [
+    [],
+    [1, 1, 1, 1],
+    [2, 5, 7, 11],
+    [3, 3, 3],
+    [0, 4096, 0, 1],
+    [len(BODY) - 1],
+], ids=["single", "bytes", "unaligned", "aligned", "empty-chunks", "last-byte"])
+@pytest.mark.parametrize("declared", [True, False], ids=["content-length", "chunked"])
+def test_streamed_data_uri_matches_one_shot_encoding(sizes, declared):
+    headers = {"Content-Type": "image/gif"}
+    if declared:
+        headers["Content-Length"] = str(len(BODY))
+    response = FakeResponse(headers=headers, chunks=split(BODY, sizes))
+
+    data_uri, total_bytes = app.stream_response_to_data_uri(response, IMAGE_URL, max_bytes=len(BODY))
+
+    assert data_uri == expected_uri(BODY)
+    assert total_bytes == len(BODY)
+
+
+@pytest.mark.parametrize("declared", [0, 10, len(BODY) + 100], ids=["empty", "short", "long"])
+def test_wrong_content_length_still_encodes_actual_body(declared):
+    response = FakeResponse(headers={"Content-Length": str(declared)}, chunks=split(BODY, [100, 200]))
+
+    data_uri, total_bytes = app.stream_response_to_data_uri(response, IMAGE_URL, max_bytes=len(BODY) + 100)
+
+    assert data_uri == expected_uri(BODY)
+    assert total_bytes == len(BODY)
+
+
+def test_empty_body():
+    response = FakeResponse(headers={"Content-Type": "image/png", "Content-Length": "0"}, chunks=[])
+    assert app.stream_response_to_data_uri(response, IMAGE_URL) == ("data:image/png;base64,", 0)
+
+
+def test_declared_oversized_body_is_rejected_before_reading():
+    response = FakeResponse(headers={"Content-Length": str(len(BODY))}, chunks=[BODY])
+
+    with pytest.raises(app.InlineSizeExceeded) as error:
+        app.stream_response_to_data_uri(response, IMAGE_URL, max_bytes=100)
+
+    assert response.reads == 0
+    assert error.value.consumed == b"" and error.value.remaining is None
+
+
+@pytest.mark.parametrize("max_bytes", [1, 99, 100, 101, 1000])
+def test_overflow_hands_over_consumed_bytes_and_live_stream(max_bytes):
+    response = FakeResponse(chunks=split(BODY, [100, 7, 500, 1]))
+
+    with pytest.raises(app.InlineSizeExceeded) as error:
+        app.stream_response_to_data_uri(response, IMAGE_URL, max_bytes=max_bytes)
+
+    assert len(error.value.consumed) > max_bytes
+    assert error.value.consumed + b"".join(error.value.remaining) == BODY
+    assert response.reads == 1
+
+
+def test_content_type_falls_back_to_extension():
+    response = FakeResponse(chunks=[b"GIF89a"])
+    assert app.stream_response_to_data_uri(response, IMAGE_URL)[0] == expected_uri(b"GIF89a")
+
+
+def test_download_and_convert_keeps_original_link_when_too_large(fake_http, monkeypatch):
+    monkeypatch.setattr(app, "MEDIA_MAX_INLINE_BYTES", 1000)
+    fake_http.serve(IMAGE_URL, headers={"Content-Type": "image/gif"}, chunks=split(BODY, [600, 600]))
+
+    assert app.download_and_convert_to_base64(IMAGE_URL, "https://example.com/") is None
+    assert fake_http.responses[0].closed
+
+    small = BODY[:999]
+    fake_http.serve(IMAGE_URL, headers={"Content-Type": "image/gif"}, chunks=split(small, [500]))
+    assert app.download_and_convert_to_base64(IMAGE_URL, "https://example.com/") == expected_uri(small)